@@ -0,0 +1,615 @@
+"""Benchmark of the solver versions
+
+Replaces time_test.py, which timed a single random scramble per length once, so
+its results could neither be reproduced nor compared.
+
+Every depth has a fixed corpus of different random move scrambles with this
+number of moves (see scrambles.py of version_6), drawn from a random.Random
+seeded with the seed and the depth, so the same seed always gives the same
+scrambles. Every
+(version, depth, scramble) job is run a few times without measuring (warm-up:
+imports, tables, caches) and then measured several times with
+time.perf_counter_ns(). Only the search is measured, the cube is scrambled
+before. A run taking longer than the timeout is stopped (SIGALRM, not available
+on Windows) and recorded as a timeout, the remaining runs of the job are
+skipped.
+
+Every job runs in its own worker process (started with "spawn", so it imports
+its version into a fresh interpreter and no memory or state of one job affects
+the next), up to "workers" jobs in parallel. Besides the timeout of every run,
+a job has a time budget for all its runs and a memory budget (the address space
+of the worker, resource.setrlimit(), not available on Windows): a worker running
+longer than its budget is killed, a worker running out of memory stops, and the
+job is recorded with its status (see STATUSES) instead of blocking the others.
+Jobs finish in any order, the results keep the order depth, version, scramble.
+
+Versions: the snapshots in the folder "versions" (1.py - 7.py, see notes.txt)
+solve with recursive_solving(depth) of the cube from generate_cube(), "current"
+is version_6 solving optimally (solve(optimal=True) of CubeStep2).
+
+The results are appended to a store (JSON Lines, see results_store.py) as soon
+as a job is finished: every measured run keyed by version, depth, scramble and
+run, the status and counters of every job and metadata about the machine,
+Python and the commit of every session. A run with a store that already has
+results resumes: finished jobs are not run again (the settings that change the
+measurements have to be the same, see RESUME_SETTINGS). "summary" prints the
+median, the quartiles and the IQR of every (version, depth) over all scrambles
+of a store (by default results.jsonl next to this file). Two stores (e.g. of
+two commits, or two versions of the same store) are compared per version and
+depth: a median that got slower by more than the threshold while the quartiles
+do not overlap is flagged as a regression.
+
+With "count", every job is run once more with counters (nodes visited, solved
+checks, moves applied, cuts per rule, nodes per depth and the effective
+branching factor, see search_stats.py of version_6), which are saved with the
+job, so a difference in time can be traced to fewer or to faster nodes. The
+snapshots have no counters, their method calls are counted instead (see
+instrument()).
+
+Usage:
+    python benchmark.py run [versions separated by "," or "all"] [depths, e.g. "1-5" or "2,4"] [scrambles per depth] [runs] [timeout in seconds] [store] [seed] [warm-up runs] ["count" or "-"] [workers] [memory budget per job in MB, 0 for none] [time budget per job in seconds]
+    python benchmark.py summary [store] [versions separated by "," or "all"] [depths, e.g. "1-5" or "2,4"]
+    python benchmark.py compare [old store] [new store] [threshold in percent] [old version] [new version]
+"""
+
+
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import platform
+import datetime
+import importlib
+import statistics
+import traceback
+import subprocess
+import multiprocessing
+import multiprocessing.connection
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+VERSIONS_DIRECTORY = os.path.join(DIRECTORY, "versions")
+CURRENT_DIRECTORY = os.path.join(DIRECTORY, "..", "version_6")
+
+sys.path.append(VERSIONS_DIRECTORY)
+sys.path.append(CURRENT_DIRECTORY)
+
+import results_store
+from search_stats import SearchStats
+
+CURRENT = "current"
+
+SEED = 2023
+DEPTHS = list(range(1, 6))
+SCRAMBLES_PER_DEPTH = 5
+RUNS = 5
+WARMUP_RUNS = 1
+TIMEOUT = 60.0
+WORKERS = os.cpu_count()
+# address space of a worker in MB (None for no limit)
+MEMORY_LIMIT = 4096
+# seconds a job may take on top of the timeouts of its runs (starting the worker, imports, tables)
+JOB_OVERHEAD = 30.0
+# seconds between two checks of the time budgets of the running jobs
+POLL_INTERVAL = 0.1
+
+# status of a job
+OK = "ok"     # all runs finished
+TIMEOUT_STATUS = "timeout"     # a run took longer than the timeout
+KILLED = "killed"     # the worker took longer than the time budget of the job and was killed
+MEMORY = "memory"     # the worker ran out of its memory budget
+ERROR = "error"     # the worker raised an exception
+CRASHED = "crashed"     # the worker ended without a result (e.g. killed by the system)
+STATUSES = [OK, TIMEOUT_STATUS, KILLED, MEMORY, ERROR, CRASHED]
+
+STORE = os.path.join(DIRECTORY, "results.jsonl")
+# settings a run resuming a store must share with the runs before
+RESUME_SETTINGS = ["runs", "timeout", "warmup_runs", "count"]
+
+# a median more than THRESHOLD percent slower is a regression (if the quartiles do not overlap)
+THRESHOLD = 10.0
+
+
+class Timeout(Exception):
+    """Raised in a run that takes longer than its timeout."""
+
+
+def available_versions():
+    """Returns a list with the names of all versions (the snapshots in the folder "versions" and "current")."""
+    return sorted(name[:-3] for name in os.listdir(VERSIONS_DIRECTORY) if name.endswith(".py")) + [CURRENT]
+
+
+def scramble_corpus(depth, size=SCRAMBLES_PER_DEPTH, seed=SEED):
+    """Returns the fixed list of different random move scrambles with "depth" moves for a seed.
+
+    A scramble that is the same sequence as one drawn before (see canonical_scramble() of scrambles.py) is drawn again, so no scramble weighs more in the summary of a depth. "size" is reduced to the number of different scrambles of the depth.
+    """
+    # only imported here (in the main process), so a worker only loads the version it runs
+    import scrambles
+
+    rng = random.Random(f"{seed}:{depth}")
+    size = min(size, scrambles.count_canonical_scrambles(depth))
+    corpus = []
+    drawn = set()
+    while len(corpus) < size:
+        scramble = scrambles.random_move_scramble(depth, rng)
+        if scrambles.canonical_scramble(scramble) not in drawn:
+            drawn.add(scrambles.canonical_scramble(scramble))
+            corpus.append(scramble)
+    return corpus
+
+
+def instrument(cube_class, stats):
+    """Replaces the methods of a class of a snapshot with methods counting their calls in a SearchStats object.
+
+    The snapshots have no counters, so the calls of recursive_solving() (nodes, the depth is the number of calls it is nested in), of the turn methods (moves) and of check_solved() and check_step1() (solved checks) are counted instead. The cuts of the rules cannot be counted this way.
+
+    Returns:
+        A dictionary with the replaced methods (see restore())
+    """
+    originals = {name: getattr(cube_class, name) for name in dir(cube_class) if name.startswith("turn_") or name in ("recursive_solving", "check_solved", "check_step1")}
+    nested = [0]
+
+    def counting(name, method):
+        if name == "recursive_solving":
+            def counted(*arguments, **keywords):
+                stats.count_node(nested[0])
+                nested[0] += 1
+                try:
+                    return method(*arguments, **keywords)
+                finally:
+                    nested[0] -= 1
+        elif name.startswith("turn_"):
+            def counted(*arguments, **keywords):
+                stats.moves += 1
+                return method(*arguments, **keywords)
+        else:
+            def counted(*arguments, **keywords):
+                stats.solved_checks += 1
+                return method(*arguments, **keywords)
+        return counted
+
+    for name, method in originals.items():
+        setattr(cube_class, name, counting(name, method))
+    return originals
+
+
+def restore(cube_class, originals):
+    """Puts back the methods replaced by instrument()."""
+    for name, method in originals.items():
+        setattr(cube_class, name, method)
+
+
+def prepare(version, scramble, depth, stats=None):
+    """Scrambles a new cube of a version and returns the function solving it (the part that is measured).
+
+    Args:
+        version: A string with the name of the version (see available_versions())
+        scramble: A string with the moves of the scramble
+        depth: An integer with the maximal number of moves searched (only used by the snapshots)
+        stats: A SearchStats object the search is counted in (optional, the search runs without counters if None)
+
+    Returns:
+        A function without arguments returning the result of the search
+    """
+    if version == CURRENT:
+        import v6
+
+        cube = v6.generate_cube()
+        cube.turn(scramble)
+        return lambda: cube.solve(optimal=True, stats=stats)
+    cube = importlib.import_module(version).generate_cube()
+    cube.turn(scramble)
+    if stats is None:
+        return lambda: cube.recursive_solving(depth)
+
+    def counted_search():
+        originals = instrument(type(cube), stats)
+        try:
+            return cube.recursive_solving(depth)
+        finally:
+            restore(type(cube), originals)
+
+    return counted_search
+
+
+def raise_timeout(signum, frame):
+    """Signal handler of the timeout of time_run()."""
+    raise Timeout()
+
+
+def time_run(function, timeout=TIMEOUT):
+    """Measures one call of a function.
+
+    Args:
+        function: A function without arguments
+        timeout: A float with the number of seconds after which the call is stopped (None for no timeout)
+
+    Returns:
+        A tuple containing the result of the function (None after a timeout) and the number of nanoseconds it took (None after a timeout)
+    """
+    use_alarm = timeout is not None and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        starttime = time.perf_counter_ns()
+        result = function()
+        return result, time.perf_counter_ns() - starttime
+    except Timeout:
+        return None, None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def summarize(times):
+    """Returns a dictionary with the number, median, quartiles, IQR and minimum of a list of nanoseconds (None for an empty list)."""
+    if not times:
+        return {"n": 0, "median": None, "q1": None, "q3": None, "iqr": None, "min": None}
+    if len(times) > 1:
+        q1, median, q3 = statistics.quantiles(times, n=4, method="inclusive")
+    else:
+        q1 = median = q3 = times[0]
+    return {"n": len(times), "median": median, "q1": q1, "q3": q3, "iqr": q3-q1, "min": min(times)}
+
+
+def run_job(version, scramble, depth, runs=RUNS, warmup_runs=WARMUP_RUNS, timeout=TIMEOUT, count=False, scramble_index=0):
+    """Runs one (version, depth, scramble) job: warm-up runs and measured runs, each on a newly scrambled cube.
+
+    If "count" is set, one more run counts the search (see SearchStats of version_6), so the counters do not slow down the measured runs. "scramble_index" is the index of the scramble in its corpus (see scramble_corpus()), which identifies the job in a store.
+
+    Returns:
+        A dictionary with the version, depth, scramble, index of the scramble, status (see STATUSES), result of the search, the nanoseconds of every measured run, a boolean indicating a timeout (a run or the whole job), the summary (see summarize()), the counters (None if not counted or after a timeout) and the traceback of an error (None without error)
+    """
+    times = []
+    timed_out = False
+    result = None
+    for run in range(warmup_runs+runs):
+        result, nanoseconds = time_run(prepare(version, scramble, depth), timeout)
+        if nanoseconds is None:
+            timed_out = True
+            break
+        if run >= warmup_runs:
+            times.append(nanoseconds)
+    counters = None
+    if count and not timed_out:
+        stats = SearchStats()
+        if time_run(prepare(version, scramble, depth, stats), timeout)[1] is not None:
+            counters = stats.as_dict()
+    return job_result(version, depth, scramble, TIMEOUT_STATUS if timed_out else OK, times, repr(result), counters, scramble_index=scramble_index)
+
+
+def job_result(version, depth, scramble, status, times=(), result=None, counters=None, error=None, scramble_index=0):
+    """Returns the dictionary describing a job (see run_job()), also for a job whose worker did not return one."""
+    times = list(times)
+    return {"version": version, "depth": depth, "scramble": scramble, "scramble_index": scramble_index, "status": status, "result": result, "times_ns": times, "timeout": status in (TIMEOUT_STATUS, KILLED), "summary": summarize(times), "stats": counters, "error": error}
+
+
+def limit_memory(megabytes):
+    """Limits the address space of this process to a number of megabytes (nothing if None or not available)."""
+    if megabytes and resource is not None:
+        limit = int(megabytes * 2**20)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def failed_job(arguments, status, error=None):
+    """Returns the dictionary describing a job (see job_result()) that did not finish, from the tuple of its arguments of run_job()."""
+    version, scramble, depth = arguments[:3]
+    return job_result(version, depth, scramble, status, error=error, scramble_index=arguments[7] if len(arguments) > 7 else 0)
+
+
+def job_worker(connection, memory_limit, arguments):
+    """Runs one job (see run_job()) in a worker process and sends its dictionary through a connection.
+
+    Args:
+        connection: The sending end of a multiprocessing.Pipe
+        memory_limit: The memory budget in MB (see limit_memory())
+        arguments: A tuple with the arguments of run_job()
+    """
+    try:
+        limit_memory(memory_limit)
+        job = run_job(*arguments)
+    except MemoryError:
+        job = failed_job(arguments, MEMORY)
+    except Exception:
+        job = failed_job(arguments, ERROR, traceback.format_exc())
+    connection.send(job)
+    connection.close()
+
+
+def job_budget(runs, warmup_runs, timeout, count):
+    """Returns the time budget of a job in seconds: the timeouts of all its runs and JOB_OVERHEAD (None without a timeout)."""
+    if timeout is None:
+        return None
+    return timeout * (warmup_runs + runs + count) + JOB_OVERHEAD
+
+
+def run_jobs(jobs, workers=WORKERS, memory_limit=MEMORY_LIMIT, budget=None, report=None):
+    """Runs jobs in worker processes, every job in a new process, up to "workers" at the same time.
+
+    Args:
+        jobs: A list with a tuple of the arguments of run_job() for every job
+        workers: An integer with the number of jobs running in parallel
+        memory_limit: A float with the memory budget of a worker in MB (see limit_memory())
+        budget: A float with the number of seconds after which a worker is killed (None for no limit)
+        report: A function called with the dictionary of every finished job (optional)
+
+    Returns:
+        A list with the dictionaries of the jobs (see run_job()) in the order of "jobs"
+    """
+    context = multiprocessing.get_context("spawn")
+    results = [None] * len(jobs)
+    waiting = list(enumerate(jobs))
+    waiting.reverse()
+    running = {}     # receiving end of the pipe: (process, index, start time)
+
+    def finish(index, job):
+        results[index] = job
+        if report is not None:
+            report(job)
+
+    while waiting or running:
+        while waiting and len(running) < max(workers, 1):
+            index, arguments = waiting.pop()
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=job_worker, args=(sender, memory_limit, arguments), daemon=True)
+            process.start()
+            sender.close()
+            running[receiver] = (process, index, time.monotonic())
+
+        for receiver in multiprocessing.connection.wait(list(running), POLL_INTERVAL):
+            process, index, starttime = running.pop(receiver)
+            try:
+                job = receiver.recv()
+            except EOFError:
+                job = failed_job(jobs[index], CRASHED, f"exit code {process.exitcode}")
+            receiver.close()
+            process.join()
+            finish(index, job)
+
+        if budget is not None:
+            now = time.monotonic()
+            for receiver, (process, index, starttime) in list(running.items()):
+                if now - starttime > budget:
+                    process.kill()
+                    process.join()
+                    receiver.close()
+                    del running[receiver]
+                    finish(index, failed_job(jobs[index], KILLED))
+    return results
+
+
+def git_commit():
+    """Returns the hash of the checked out commit (None if git is not available)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=DIRECTORY, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(**settings):
+    """Returns a dictionary describing the machine, Python, the commit and the settings of a benchmark."""
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "python_implementation": platform.python_implementation(),
+        "settings": settings,
+    }
+
+
+def summarize_jobs(jobs, versions, depths):
+    """Returns a list with the summary (see summarize()) of every version and depth over the runs of all its jobs, with the number of timeouts and failures."""
+    summaries = []
+    for depth in depths:
+        for version in versions:
+            finished = [job for job in jobs if job["version"] == version and job["depth"] == depth]
+            if not finished:
+                continue
+            times = [nanoseconds for job in finished for nanoseconds in job["times_ns"]]
+            timeouts = sum(job["status"] in (TIMEOUT_STATUS, KILLED) for job in finished)
+            failures = sum(job["status"] in (MEMORY, ERROR, CRASHED) for job in finished)
+            summaries.append({"version": version, "depth": depth, "timeouts": timeouts, "failures": failures, **summarize(times)})
+    return summaries
+
+
+def jobs_from_records(records):
+    """Returns a dictionary with the dictionary (see run_job()) of every finished job of the records of a store, keyed like results_store.job_key()."""
+    return {key: job_result(job["version"], job["depth"], job["scramble"], job["status"], job["times_ns"], job["result"], job["stats"], job["error"], job["scramble_index"])
+            for key, job in results_store.stored_jobs(records).items()}
+
+
+class ResumeError(ValueError):
+    """Raised if a store cannot be resumed because its last session was run with other settings."""
+
+
+def check_resume(records, settings):
+    """Raises a ResumeError if the last session of a store was run with other settings (see RESUME_SETTINGS)."""
+    previous = results_store.sessions(records)
+    if not previous:
+        return
+    for name in RESUME_SETTINGS:
+        if previous[-1]["settings"].get(name) != settings[name]:
+            raise ResumeError(f"The store was run with {name}={previous[-1]['settings'].get(name)!r}, not {settings[name]!r}: use another store")
+
+
+def run_benchmark(versions, depths=DEPTHS, size=SCRAMBLES_PER_DEPTH, runs=RUNS, timeout=TIMEOUT, seed=SEED, warmup_runs=WARMUP_RUNS, count=False, report=None, workers=WORKERS, memory_limit=MEMORY_LIMIT, budget=None, store=None):
+    """Runs all jobs of the versions and depths, every job in its own worker process (see run_jobs()).
+
+    Args:
+        versions: A list with the names of the versions (see available_versions())
+        depths: A list with the depths (number of moves of the scrambles)
+        size: An integer with the number of scrambles per depth
+        runs: An integer with the number of measured runs per job
+        timeout: A float with the number of seconds after which a run is stopped
+        seed: The seed of the scramble corpora (see scramble_corpus())
+        warmup_runs: An integer with the number of runs per job that are not measured
+        count: A boolean indicating if every job is counted in one more run (see run_job())
+        report: A function called with the dictionary of every finished job (optional)
+        workers: An integer with the number of jobs running in parallel
+        memory_limit: A float with the memory budget of every job in MB (None for no limit)
+        budget: A float with the time budget of every job in seconds (optional, see job_budget())
+        store: A string with the path of a store every finished job is appended to (optional, see results_store.py), jobs already in the store are not run again
+
+    Returns:
+        A dictionary with the metadata, the results of all jobs (also the ones from the store) and the summary of every (version, depth) over all its scrambles
+    """
+    if budget is None:
+        budget = job_budget(runs, warmup_runs, timeout, count)
+    settings = {"versions": versions, "depths": depths, "size": size, "runs": runs, "timeout": timeout, "seed": seed, "warmup_runs": warmup_runs, "count": count, "workers": workers, "memory_limit": memory_limit, "budget": budget}
+    results = {"metadata": metadata(**settings), "jobs": [], "summary": []}
+    jobs = [(version, scramble, depth, runs, warmup_runs, timeout, count, scramble_index) for depth in depths for version in versions for scramble_index, scramble in enumerate(scramble_corpus(depth, size, seed))]
+
+    if store is None:
+        results["jobs"] = run_jobs(jobs, workers, memory_limit, budget, report)
+    else:
+        records = list(results_store.read_records(store))
+        check_resume(records, settings)
+        finished = jobs_from_records(records)
+        results_store.append_records(store, [results_store.session_record(results["metadata"])])
+
+        def store_job(job):
+            results_store.append_records(store, results_store.job_records(job))
+            finished[results_store.job_key(job)] = job
+            if report is not None:
+                report(job)
+
+        keys = [(version, depth, scramble_index, scramble) for version, scramble, depth, *_, scramble_index in jobs]
+        run_jobs([job for job, key in zip(jobs, keys) if key not in finished], workers, memory_limit, budget, store_job)
+        results["jobs"] = [finished[key] for key in keys if key in finished]
+    results["summary"] = summarize_jobs(results["jobs"], versions, depths)
+    return results
+
+
+def load_results(path, versions=None, depths=None):
+    """Reads the results of a store (see results_store.py) or of a JSON file (results of run_benchmark()).
+
+    Args:
+        path: A string with the path of the store or JSON file (ending with ".json")
+        versions: A list with the names of the versions summarized (optional, all versions of the store)
+        depths: A list with the depths summarized (optional, all depths of the store)
+
+    Returns:
+        A dictionary like the one of run_benchmark(), the metadata of a store is the list of the metadata of its sessions
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            return json.load(f)
+    records = list(results_store.read_records(path))
+    jobs = list(jobs_from_records(records).values())
+    if versions is None:
+        versions = sorted({job["version"] for job in jobs}, key=lambda version: (version == CURRENT, version))
+    if depths is None:
+        depths = sorted({job["depth"] for job in jobs})
+    return {"metadata": results_store.sessions(records), "jobs": jobs, "summary": summarize_jobs(jobs, versions, depths)}
+
+
+def compare(old, new, threshold=THRESHOLD, old_version=None, new_version=None):
+    """Compares the summaries of two benchmark results per version and depth.
+
+    Args:
+        old: A dictionary with the results of run_benchmark() used as reference
+        new: A dictionary with the results of run_benchmark() that is checked
+        threshold: A float with the percentage a median may be slower without being flagged
+        old_version: A string with the version of "old" compared with "new_version" of "new" (optional, the same versions are compared)
+        new_version: See old_version
+
+    Returns:
+        A list with a dictionary for every version and depth in both results: version, depth, old and new median, ratio new/old and a boolean indicating a regression
+    """
+    old_summaries = {(summary["version"], summary["depth"]): summary for summary in old["summary"]}
+    rows = []
+    for summary in new["summary"]:
+        if new_version is not None and summary["version"] != new_version:
+            continue
+        reference = old_summaries.get((summary["version"] if old_version is None else old_version, summary["depth"]))
+        if reference is None or reference["median"] is None or summary["median"] is None:
+            continue
+        ratio = summary["median"] / reference["median"]
+        regression = ratio > 1 + threshold/100 and summary["q1"] > reference["q3"]
+        rows.append({"version": summary["version"], "depth": summary["depth"], "old_median": reference["median"], "new_median": summary["median"], "ratio": ratio, "regression": regression})
+    return rows
+
+
+def report_job(job):
+    """Prints the summary of a finished job (a "report" function for run_benchmark())."""
+    summary = job["summary"]
+    median = job["status"] if summary["median"] is None else f"median {summary['median']/1e6:.3f} ms, IQR {summary['iqr']/1e6:.3f} ms"
+    status = f" ({job['status']})" if job["status"] != OK and summary["n"] else ""
+    print(f"version {job['version']}, depth {job['depth']}, {job['scramble']}: {median}{status}", flush=True)
+    if job["error"]:
+        print(job["error"], end="", flush=True)
+
+
+def parse_depths(text):
+    """Converts "1-5" or "2,4" to a list of depths."""
+    if "-" in text:
+        first, last = text.split("-")
+        return list(range(int(first), int(last)+1))
+    return [int(depth) for depth in text.split(",")]
+
+
+def report_summary(summaries):
+    """Prints the summary of every version and depth (see summarize_jobs())."""
+    for summary in summaries:
+        median = "no run finished" if summary["median"] is None else f"median {summary['median']/1e6:.3f} ms, IQR {summary['iqr']/1e6:.3f} ms"
+        print(f"version {summary['version']}, depth {summary['depth']}: {median}, {summary['timeouts']} timeouts, {summary['failures']} failures")
+
+
+def main(arguments):
+    if arguments and arguments[0] == "compare":
+        old = load_results(arguments[1])
+        new = load_results(arguments[2])
+        threshold = float(arguments[3]) if len(arguments) > 3 else THRESHOLD
+        old_version = arguments[4] if len(arguments) > 4 else None
+        new_version = arguments[5] if len(arguments) > 5 else None
+        rows = compare(old, new, threshold, old_version, new_version)
+        for row in rows:
+            print(f"version {row['version']}, depth {row['depth']}: {row['old_median']/1e6:.3f} ms -> {row['new_median']/1e6:.3f} ms ({row['ratio']:.2f}x){' REGRESSION' if row['regression'] else ''}")
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    if arguments and arguments[0] == "summary":
+        path = arguments[1] if len(arguments) > 1 else STORE
+        versions = None if len(arguments) < 3 or arguments[2] == "all" else arguments[2].split(",")
+        depths = parse_depths(arguments[3]) if len(arguments) > 3 else None
+        report_summary(load_results(path, versions, depths)["summary"])
+        return 0
+
+    if arguments and arguments[0] == "run":
+        arguments = arguments[1:]
+    versions = available_versions() if len(arguments) < 1 or arguments[0] == "all" else arguments[0].split(",")
+    depths = parse_depths(arguments[1]) if len(arguments) > 1 else DEPTHS
+    size = int(arguments[2]) if len(arguments) > 2 else SCRAMBLES_PER_DEPTH
+    runs = int(arguments[3]) if len(arguments) > 3 else RUNS
+    timeout = float(arguments[4]) if len(arguments) > 4 else TIMEOUT
+    store = arguments[5] if len(arguments) > 5 else STORE
+    seed = int(arguments[6]) if len(arguments) > 6 else SEED
+    warmup_runs = int(arguments[7]) if len(arguments) > 7 else WARMUP_RUNS
+    count = len(arguments) > 8 and arguments[8] == "count"
+    workers = int(arguments[9]) if len(arguments) > 9 else WORKERS
+    memory_limit = (float(arguments[10]) or None) if len(arguments) > 10 else MEMORY_LIMIT
+    budget = float(arguments[11]) if len(arguments) > 11 else None
+
+    try:
+        results = run_benchmark(versions, depths, size, runs, timeout, seed, warmup_runs, count, report_job, workers, memory_limit, budget, store)
+    except ResumeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    report_summary(results["summary"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,184 @@
+"""Microbenchmark of the primitives of every version
+
+benchmark.py times whole searches. This file measures the operations a search
+does at every node, in nanoseconds per operation, for version_1 to version_6:
+the 18 turn methods, the conversions of get_cube_state() in both directions,
+check_solved(), check_step1(), check_solvable() and n_of_swaps() (replaced by
+permutation_parity() of coordinates.py in version 6). So a change of the
+representation (nested lists, linear list, numpy, ...) can be judged per
+operation.
+
+The measurement works like pyperf, without needing it: the number of loops of
+a sample is calibrated until a sample takes at least MIN_TIME seconds, then
+WARMUP_SAMPLES samples are discarded and SAMPLES samples are measured with
+time.perf_counter_ns(). Every sample gives the nanoseconds per operation, the
+median and the standard deviation of the samples are reported. The operations
+run on a cube scrambled with SCRAMBLE (a turn method keeps turning the same
+cube). The conversions put back the notation they convert from before every
+call to force a conversion, which is included in the time.
+
+Version 6 has two classes: CubeStep2 is measured, except for check_step1()
+of CubeStep1.
+
+Usage: python microbenchmark.py [versions separated by "," or "all"] [primitives separated by "," or "all"] [samples] [output file]
+"""
+
+
+
+import os
+import sys
+import json
+import time
+import importlib
+import statistics
+
+import benchmark
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+VERSIONS = [str(version) for version in range(1, 7)]
+for version in VERSIONS:
+    sys.path.append(os.path.join(DIRECTORY, "..", f"version_{version}"))
+
+MOVE_METHODS = ["turn_U", "turn_U_prime", "turn_U2", "turn_D", "turn_D_prime", "turn_D2", "turn_F", "turn_F_prime", "turn_F2", "turn_B", "turn_B_prime", "turn_B2", "turn_R", "turn_R_prime", "turn_R2", "turn_L", "turn_L_prime", "turn_L2"]
+PRIMITIVES = MOVE_METHODS + ["cubies_to_stickers", "stickers_to_cubies", "check_solved", "check_step1", "check_solvable", "n_of_swaps", "permutation_parity"]
+
+SCRAMBLE = "R'U2F_D_L_U2R2B'"
+MIN_TIME = 0.02
+WARMUP_SAMPLES = 1
+SAMPLES = 10
+
+
+def edges_of(cube):
+    """Returns the list with the cubie in every edge position (nested cubie method of versions 1-3 or linear cubie method)."""
+    cubies = cube.get_cube_state()
+    if isinstance(cubies[0], list):
+        return [edge[0] for edge in cubies[1]]
+    return cubies[16::2]
+
+
+def operation(version, primitive):
+    """Prepares a scrambled cube of a version and returns the function executing one primitive on it.
+
+    Args:
+        version: A string with the number of the version ("1" to "6")
+        primitive: A string with the name of the primitive (see PRIMITIVES)
+
+    Returns:
+        A function without arguments / None if the version does not have the primitive
+    """
+    module = importlib.import_module(f"v{version}")
+    if primitive == "check_step1" and version == "6":
+        cube = module.generate_cube()
+        cube.turn(SCRAMBLE)
+        cube = module.CubeStep1(solved=False, scramble=cube.step1_cube())
+    else:
+        cube = module.generate_cube()
+        cube.turn(SCRAMBLE)
+    cube.get_cube_state()
+
+    if primitive in MOVE_METHODS or primitive in ("check_solved", "check_step1", "check_solvable"):
+        return getattr(cube, primitive, None)
+    # the conversions may drop the notation they convert from, so it is put back before every call
+    if primitive == "cubies_to_stickers":
+        cubies = cube.cube_cubies
+
+        def cubies_to_stickers():
+            cube.cube_cubies = cubies
+            cube.stickers_used = False
+            cube.cube_stickers = None
+            cube.get_cube_state(True)
+        return cubies_to_stickers
+    if primitive == "stickers_to_cubies":
+        stickers = cube.get_cube_state(True)
+
+        def stickers_to_cubies():
+            cube.cube_stickers = stickers
+            cube.stickers_used = True
+            cube.get_cube_state()
+        return stickers_to_cubies
+    if primitive == "n_of_swaps" and hasattr(module, "n_of_swaps"):
+        edges = edges_of(cube)
+        return lambda: module.n_of_swaps(edges)
+    if primitive == "permutation_parity" and version == "6":
+        import coordinates
+
+        edges = edges_of(cube)
+        return lambda: coordinates.permutation_parity(edges)
+    return None
+
+
+def sample(function, loops):
+    """Returns the nanoseconds per call of "loops" calls of a function."""
+    calls = range(loops)
+    starttime = time.perf_counter_ns()
+    for i in calls:
+        function()
+    return (time.perf_counter_ns() - starttime) / loops
+
+
+def calibrate(function, min_time=MIN_TIME):
+    """Returns the number of loops (a power of 10) a sample needs to take at least "min_time" seconds."""
+    loops = 1
+    while sample(function, loops) * loops < min_time * 1e9:
+        loops *= 10
+    return loops
+
+
+def measure(function, samples=SAMPLES, warmup_samples=WARMUP_SAMPLES, min_time=MIN_TIME):
+    """Measures a function like pyperf (see above).
+
+    Returns:
+        A dictionary with the number of loops per sample, the nanoseconds per call of every sample, their median and their standard deviation
+    """
+    loops = calibrate(function, min_time)
+    for i in range(warmup_samples):
+        sample(function, loops)
+    values = [sample(function, loops) for i in range(samples)]
+    return {"loops": loops, "ns_per_op": values, "median": statistics.median(values), "stdev": statistics.stdev(values) if len(values) > 1 else 0.0}
+
+
+def run_microbenchmark(versions=VERSIONS, primitives=PRIMITIVES, samples=SAMPLES, report=None):
+    """Measures every primitive of every version.
+
+    Args:
+        versions: A list with the numbers of the versions as strings
+        primitives: A list with the names of the primitives (see PRIMITIVES)
+        samples: An integer with the number of measured samples per primitive
+        report: A function called with the version, the primitive and the result of measure() (None if the version does not have the primitive) after every primitive (optional)
+
+    Returns:
+        A dictionary with the metadata (see metadata() of benchmark.py) and the results per version and primitive
+    """
+    results = {"metadata": benchmark.metadata(versions=versions, primitives=primitives, samples=samples, warmup_samples=WARMUP_SAMPLES, min_time=MIN_TIME, scramble=SCRAMBLE), "results": {}}
+    for version in versions:
+        results["results"][version] = {}
+        for primitive in primitives:
+            function = operation(version, primitive)
+            result = None if function is None else measure(function, samples)
+            results["results"][version][primitive] = result
+            if report is not None:
+                report(version, primitive, result)
+    return results
+
+
+def report_primitive(version, primitive, result):
+    """Prints the result of a primitive (a "report" function for run_microbenchmark())."""
+    if result is not None:
+        print(f"version {version}, {primitive}: {result['median']:.0f} ns +- {result['stdev']:.0f} ns", flush=True)
+
+
+if __name__ == "__main__":
+    versions = VERSIONS if len(sys.argv) < 2 or sys.argv[1] == "all" else sys.argv[1].split(",")
+    primitives = PRIMITIVES if len(sys.argv) < 3 or sys.argv[2] == "all" else sys.argv[2].split(",")
+    samples = int(sys.argv[3]) if len(sys.argv) > 3 else SAMPLES
+    path = sys.argv[4] if len(sys.argv) > 4 else "microbenchmark.json"
+
+    results = run_microbenchmark(versions, primitives, samples, report_primitive)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=1)
+
+    # table: one row per primitive, one column per version (ns per operation)
+    print("\nns/op".ljust(22) + "".join(f"version {version}".rjust(12) for version in versions))
+    for primitive in primitives:
+        cells = [results["results"][version][primitive] for version in versions]
+        print(primitive.ljust(21) + "".join(("-" if cell is None else f"{cell['median']:.0f}").rjust(12) for cell in cells))
@@ -0,0 +1,79 @@
+"""Script for comparing the turn methods with the generic move engine
+
+This script measures how many moves per second can be executed on a cube in
+the linear cubie method (CubeStep2) and on a cube storing only the orientation
+(CubeStep1), once with the 18 hand-written turn methods and once with the
+generic routine apply_move() driven by the precomputed move tables.
+Afterwards, recursive_solving() of version 6 before the move engine was
+introduced (versions/6.py for CubeStep1, versions/7.py for CubeStep2) is
+compared with the current one in version_6.
+
+The cubes are generated before the time measurement starts.
+"""
+
+
+
+import os
+import sys
+import time
+import importlib
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "versions"))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "version_6"))
+
+import v6
+
+n = 20000
+scramble = "D2F2U_L_"
+depth = 4
+
+
+def moves_per_second(function):
+    """Returns the number of moves per second "function" executes (it has to execute all 18 moves once per call)."""
+    starttime = time.perf_counter()
+    for i in range(n):
+        function()
+    return 18*n / (time.perf_counter()-starttime)
+
+
+def turn_methods(cube):
+    for method in v6.MOVE_METHODS:
+        getattr(cube, method)()
+
+
+def move_engine(cube, move_engine):
+    for move in range(18):
+        cube.cube_cubies = v6.apply_move(cube.cube_cubies, move, move_engine)
+
+
+def main():
+    cube = v6.generate_cube()
+    cube.get_cube_state()
+    cube_step1 = v6.CubeStep1(solved=False, scramble=cube.step1_cube())
+
+    print(f"Moves per second ({18*n} moves each):")
+    old = moves_per_second(lambda: turn_methods(cube))
+    new = moves_per_second(lambda: move_engine(cube, v6.MOVE_ENGINE))
+    print(f"CubeStep2: turn methods {old:.0f}, move engine {new:.0f} ({new/old:.2f}x)")
+    old = moves_per_second(lambda: turn_methods(cube_step1))
+    new = moves_per_second(lambda: move_engine(cube_step1, v6.STEP1_MOVE_ENGINE))
+    print(f"CubeStep1: turn methods {old:.0f}, move engine {new:.0f} ({new/old:.2f}x)")
+
+    print(f"\nrecursive_solving({depth}) after the scramble {scramble}:")
+    step1_state = v6.generate_cube()
+    step1_state.turn(scramble)
+    step1_state = step1_state.step1_cube()
+    for name, old_cube, new_cube in [("CubeStep1", importlib.import_module("6").generate_cube(False, step1_state.copy()), v6.CubeStep1(False, step1_state.copy())),
+                                     ("CubeStep2", importlib.import_module("7").generate_cube(), v6.generate_cube())]:
+        times = []
+        for cube in [old_cube, new_cube]:
+            if name == "CubeStep2":
+                cube.turn(scramble)
+            starttime = time.perf_counter()
+            result = cube.recursive_solving(depth)
+            times.append(time.perf_counter()-starttime)
+        print(f"{name}: {result}, turn methods {times[0]:.4f} seconds, move engine {times[1]:.4f} seconds ({times[0]/times[1]:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
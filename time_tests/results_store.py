@@ -0,0 +1,148 @@
+"""Append-only store of benchmark results
+
+Replaces results.csv, progress.txt and sort_results.py of time_test.py: the
+results of benchmark.py are kept in a JSON Lines file, one record (a JSON
+object) per line, which is only ever appended to. Records:
+
+session: {"type": "session", "metadata": {...}} written when a run starts (see
+    metadata() of benchmark.py), so every result can be traced to its machine,
+    commit and settings.
+run: {"type": "run", "version", "depth", "scramble_index", "scramble", "run",
+    "ns"} for every measured run of a job, keyed by version, depth, scramble
+    (its index in the corpus of the depth, and the scramble itself) and run (the
+    index of the measured run).
+job: {"type": "job", "version", "depth", "scramble_index", "scramble",
+    "status", "result", "runs", "stats", "error"} after the run records of a
+    job: the job is finished (see STATUSES of benchmark.py), "runs" is the
+    number of its run records.
+
+All records of a job are written at once and flushed to the disk, so an
+interrupted run loses at most the jobs that were running, and a run with the
+same store resumes with the jobs that are not finished. A line cut by the
+interruption is skipped when reading. If a key is stored more than once (e.g. a
+job repeated after deleting its job record), the last record counts.
+
+Usage: python results_store.py [store] ["jobs" or "sessions"]
+"""
+
+
+
+import os
+import sys
+import json
+
+SESSION = "session"
+RUN = "run"
+JOB = "job"
+RECORD_TYPES = [SESSION, RUN, JOB]
+
+# store of benchmark.py
+STORE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+
+def job_key(record):
+    """Returns the key (version, depth, index of the scramble, scramble) of the job of a record."""
+    return record["version"], record["depth"], record["scramble_index"], record["scramble"]
+
+
+def run_key(record):
+    """Returns the key (version, depth, index of the scramble, scramble, run) of a run record."""
+    return (*job_key(record), record["run"])
+
+
+def read_records(path):
+    """Yields the records of a store in the order they were written (nothing if the store does not exist).
+
+    Lines that are not complete JSON objects (cut by an interruption) are skipped.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get("type") in RECORD_TYPES:
+                yield record
+
+
+def append_records(path, records):
+    """Appends records to a store (creating it) and flushes them to the disk.
+
+    Args:
+        path: A string with the path of the store
+        records: A list with the records as dictionaries
+    """
+    # a line cut by an interruption is ended, so the next record starts on its own line
+    cut = False
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            cut = f.read(1) != b"\n"
+    with open(path, "a") as f:
+        if cut:
+            f.write("\n")
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def session_record(metadata):
+    """Returns the record of a session with the metadata of a run."""
+    return {"type": SESSION, "metadata": metadata}
+
+
+def job_records(job):
+    """Returns the run records and the job record of a job (a dictionary from run_job() of benchmark.py)."""
+    records = []
+    for run, nanoseconds in enumerate(job["times_ns"]):
+        records.append({"type": RUN, "version": job["version"], "depth": job["depth"], "scramble_index": job["scramble_index"], "scramble": job["scramble"], "run": run, "ns": nanoseconds})
+    records.append({"type": JOB, "version": job["version"], "depth": job["depth"], "scramble_index": job["scramble_index"], "scramble": job["scramble"], "status": job["status"],
+                    "result": job["result"], "runs": len(job["times_ns"]), "stats": job["stats"], "error": job["error"]})
+    return records
+
+
+def sessions(records):
+    """Returns a list with the metadata of all sessions of a list of records."""
+    return [record["metadata"] for record in records if record["type"] == SESSION]
+
+
+def finished_jobs(records):
+    """Returns a set with the keys (see job_key()) of all finished jobs of a list of records."""
+    return {job_key(record) for record in records if record["type"] == JOB}
+
+
+def stored_jobs(records):
+    """Rebuilds the finished jobs of a list of records.
+
+    Returns:
+        A dictionary with a dictionary for every finished job (see job_key()): the fields of its job record and a list with the nanoseconds of its runs as "times_ns"
+    """
+    runs = {}
+    jobs = {}
+    for record in records:
+        if record["type"] == RUN:
+            runs[run_key(record)] = record["ns"]
+        elif record["type"] == JOB:
+            jobs[job_key(record)] = record
+    finished = {}
+    for key, record in jobs.items():
+        job = {name: value for name, value in record.items() if name != "type"}
+        job["times_ns"] = [runs[(*key, run)] for run in range(record["runs"]) if (*key, run) in runs]
+        finished[key] = job
+    return finished
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else STORE
+    listing = sys.argv[2] if len(sys.argv) > 2 else "jobs"
+
+    records = list(read_records(path))
+    if listing == "sessions":
+        for metadata in sessions(records):
+            print(json.dumps(metadata))
+    else:
+        for (version, depth, scramble_index, scramble), job in sorted(stored_jobs(records).items(), key=lambda item: (item[0][1], item[0][0], item[0][2])):
+            print(f"version {version}, depth {depth}, {scramble}: {job['status']}, {len(job['times_ns'])} runs")
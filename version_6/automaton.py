@@ -0,0 +1,212 @@
+"""Automaton of the allowed move sequences
+
+Many move sequences lead to the same state: U U is U2, U D is D U, and some
+longer sequences like F2 B2 R2 L2 and R2 L2 F2 B2 are equal as well. A search
+only has to try one of them. This file finds these redundant sequences with a
+breadth-first search over the cube states (see cube_state.py): of all sequences
+(up to a maximum length) leading to the same state, only the first in shortlex
+order (shorter first, then by the order of MOVES) is kept. A sequence is redundant if it
+contains a sequence that is not kept, so no shortest solution is lost.
+
+The redundant sequences are combined into a finite-state automaton
+(Aho-Corasick): every state of the automaton stands for the end of the moves
+made so far, transitions[18*state+move] is the state after the move or -1 if
+the move makes the sequence redundant. The search only follows the moves of
+successors[state] and never compares strings.
+
+For the same face the automaton only allows one move, for opposite faces only
+the order U D, F B, R L (the order of MOVES). The automatons are generated for
+the moves of a search (all 18 moves or the moves of step 2) and saved in the
+folder "tables" like the other tables. Running this file generates them in
+advance and shows their effective branching factor.
+"""
+
+
+
+import time
+from array import array
+
+import v6
+import tables
+import symmetry
+import cube_state
+
+# name: (moves of the search, maximum length of the redundant sequences)
+AUTOMATON_DEFINITIONS = {
+    "all_moves": (list(range(18)), 5),
+    "step2_moves": ([move for face, moves in v6.STEP2_SOLVING_MOVES for move in moves], 7),
+}
+
+# the automaton starts in this state (no moves made)
+START = 0
+
+# faces in the order of MOVES, a face and its opposite face differ only in the lowest bit
+FACES = "UDFBRL"
+
+
+def faces_from_prev_move(prev_move):
+    """Converts the prev_move string of recursive_solving() (e.g. "UD") to face numbers (-1 for no move)."""
+    return FACES.find(prev_move[0]), FACES.find(prev_move[1])
+
+
+def find_redundant_sequences(moves, max_length):
+    """Finds the shortest redundant move sequences with a breadth-first search over the cube states.
+
+    A sequence is kept if no shorter sequence and no earlier sequence of the same length leads to the same state. A sequence is returned if it is not kept although all its parts without the first or the last move are kept.
+
+    Args:
+        moves: A list with the indices (in MOVES) of the moves of the search
+        max_length: An integer with the maximum length of the sequences
+
+    Returns:
+        A list of tuples with the moves of the redundant sequences
+    """
+    kept = {cube_state.SOLVED_STATE: ()}
+    level = [((), cube_state.SOLVED_STATE)]
+    redundant = []
+    for length in range(1, max_length+1):
+        next_level = []
+        for sequence, state in level:
+            for move in moves:
+                new_state = state.apply_move(move)
+                if new_state not in kept:
+                    kept[new_state] = sequence + (move,)
+                    if length < max_length:
+                        next_level.append((sequence + (move,), new_state))
+                    continue
+                suffix = sequence[1:] + (move,)
+                if kept.get(cube_state.SOLVED_STATE.apply_moves(suffix)) == suffix:
+                    redundant.append(sequence + (move,))
+        level = next_level
+    return redundant
+
+
+def build_automaton(moves, redundant):
+    """Builds the automaton (Aho-Corasick) rejecting every sequence that contains one of the redundant sequences.
+
+    Args:
+        moves: A list with the indices (in MOVES) of the moves of the search
+        redundant: A list of tuples with the moves of the redundant sequences
+
+    Returns:
+        An array (typecode "i") with the state after move m in position 18*state+m (-1 if the move is not allowed)
+    """
+    # trie of the redundant sequences
+    children = [{}]
+    rejecting = [False]
+    for sequence in redundant:
+        node = 0
+        for move in sequence:
+            if move not in children[node]:
+                children[node][move] = len(children)
+                children.append({})
+                rejecting.append(False)
+            node = children[node][move]
+        rejecting[node] = True
+
+    # goto[node][move]: longest sequence of the trie that is an end of the sequence of node followed by move
+    goto = [{} for node in children]
+    fallback = [0 for node in children]
+    queue = []
+    for move in moves:
+        child = children[0].get(move)
+        if child is None:
+            goto[0][move] = 0
+        else:
+            goto[0][move] = child
+            queue.append(child)
+    while queue:
+        node = queue.pop(0)
+        rejecting[node] = rejecting[node] or rejecting[fallback[node]]
+        for move in moves:
+            child = children[node].get(move)
+            if child is None:
+                goto[node][move] = goto[fallback[node]][move]
+            else:
+                fallback[child] = goto[fallback[node]][move]
+                goto[node][move] = child
+                queue.append(child)
+
+    # number the states that do not reject
+    numbers = {}
+    for node in range(len(children)):
+        if not rejecting[node]:
+            numbers[node] = len(numbers)
+    transitions = array("i", [-1])*(18*len(numbers))
+    for node, number in numbers.items():
+        for move in moves:
+            target = goto[node][move]
+            if not rejecting[target]:
+                transitions[18*number+move] = numbers[target]
+    return transitions
+
+
+def generate_automaton(name):
+    """Generates an automaton (see build_automaton()) for a key of AUTOMATON_DEFINITIONS."""
+    moves, max_length = AUTOMATON_DEFINITIONS[name]
+    return build_automaton(moves, find_redundant_sequences(moves, max_length))
+
+
+def get_successors(name):
+    """Returns the allowed moves of every state of an automaton, loading it from the disk or generating (and saving) it on first use.
+
+    Args:
+        name: A string with the name of the automaton (a key of AUTOMATON_DEFINITIONS)
+
+    Returns:
+        A list containing for every state a list of tuples (move, state after the move) with all allowed moves
+    """
+    if name not in tables.loaded_tables:
+        transitions = tables.read_table(name+"_automaton", "i", None)
+        if transitions is None:
+            transitions = generate_automaton(name)
+            tables.save_table(name+"_automaton", transitions)
+        tables.loaded_tables[name] = [[(move, transitions[18*state+move]) for move in range(18) if transitions[18*state+move] >= 0] for state in range(len(transitions)//18)]
+    return tables.loaded_tables[name]
+
+
+def first_successors(name, prev_move="  ", symmetries=()):
+    """Returns the allowed first moves of a search.
+
+    Only the faces of the previous moves are known, so the rules for faces are applied to them: no move on the face of the last move, on its opposite face only in the order of MOVES, and no move on the face before if the last move was on the opposite face. The symmetries of the start position remove further moves (see first_moves() of symmetry.py).
+
+    Args:
+        name: A string with the name of the automaton (a key of AUTOMATON_DEFINITIONS)
+        prev_move: A string with the faces of the last and of the second last move (see recursive_solving())
+        symmetries: A list with the indices of the symmetries leaving the start position unchanged
+
+    Returns:
+        A list of tuples (move, state after the move)
+    """
+    last_face, second_face = faces_from_prev_move(prev_move)
+    searched = symmetry.first_moves(symmetries)
+    successors = []
+    for move, state in get_successors(name)[START]:
+        face = move//3
+        if face == last_face or (face == last_face^1 and face < last_face) or (face == second_face and second_face == last_face^1):
+            continue
+        if searched[move]:
+            successors.append((move, state))
+    return successors
+
+
+def branching_factor(name, length=20):
+    """Returns the number of allowed sequences of the given length divided by the number of allowed sequences one move shorter."""
+    successors = get_successors(name)
+    counts = [0 for state in successors]
+    counts[START] = 1
+    for i in range(length):
+        previous = sum(counts)
+        new_counts = [0 for state in successors]
+        for state, count in enumerate(counts):
+            for move, next_state in successors[state]:
+                new_counts[next_state] += count
+        counts = new_counts
+    return sum(counts)/previous
+
+
+if __name__ == "__main__":
+    for name in AUTOMATON_DEFINITIONS:
+        starttime = time.time()
+        successors = get_successors(name)
+        print(f"Automaton {name} ready with {len(successors)} states, branching factor {branching_factor(name)} (Time used: {time.time()-starttime} seconds)")
@@ -0,0 +1,159 @@
+"""Solving many scrambles
+
+solve_many() solves scrambles with the two-phase solver (see solver.py) in a
+pool of worker processes and yields every result as soon as it is finished (not
+in the order of the scrambles). The scrambles are read from any iterable while
+the results are yielded, so a long file or a generator is streamed. The pool is created on first
+use and kept for later calls: the tables are loaded before the workers are
+started (and again in every worker if they are not inherited), so no solve
+waits for loading tables.
+
+statistics() summarises the results: the throughput (solves per second of wall
+time) and percentiles of the latency (seconds a worker needed for one solve).
+
+Usage: python batch.py [file with one scramble per line, "-" for stdin] [number of workers] [target length] [time budget in seconds]
+"""
+
+
+
+import os
+import sys
+import time
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import v6
+import tables
+import search
+import solver
+import pruning
+import symmetry
+import automaton
+
+# default number of worker processes
+WORKERS = os.cpu_count()
+# scrambles submitted per worker and not yet finished (more are only taken from the input when results are yielded)
+PENDING_PER_WORKER = 4
+
+PERCENTILES = [50, 90, 99]
+
+# number of workers: pool
+executors = {}
+
+
+def load_tables():
+    """Loads (or generates) all tables the two-phase solver needs."""
+    for names in search.STEP_MOVE_TABLES.values():
+        for name in names:
+            tables.get_move_table(name)
+    for name in ["flipslice_class", "flipslice_symmetry", "twist_symmetry"]:
+        symmetry.get_symmetry_table(name)
+    for name in ["flipslice_twist", *pruning.PRUNING_TABLE_DEFINITIONS]:
+        pruning.get_pruning_table(name)
+    for name in automaton.AUTOMATON_DEFINITIONS:
+        automaton.get_successors(name)
+
+
+def get_executor(workers=WORKERS):
+    """Returns a pool of "workers" processes with the tables loaded, creating it on first use."""
+    if workers not in executors:
+        load_tables()
+        executors[workers] = ProcessPoolExecutor(workers, initializer=load_tables)
+    return executors[workers]
+
+
+def shutdown():
+    """Stops all worker processes."""
+    for executor in executors.values():
+        executor.shutdown()
+    executors.clear()
+
+
+def solve_one(scramble, target_length, time_budget):
+    """Solves one scramble (runs in a worker process).
+
+    Returns:
+        A tuple containing the string with the moves of the solution and the number of seconds used
+    """
+    starttime = time.perf_counter()
+    solution = solver.solve_scramble(scramble, target_length, time_budget)
+    return solution, time.perf_counter() - starttime
+
+
+def solve_many(scrambles, workers=WORKERS, target_length=v6.TARGET_LENGTH, time_budget=v6.TIME_BUDGET):
+    """Solves many scrambles in parallel, yielding every result as soon as it is finished.
+
+    Args:
+        scrambles: An iterable with strings containing the moves of the scrambles (see turn() of CubeStep2)
+        workers: An integer with the number of worker processes
+        target_length: An integer with the number of moves at which a solution is good enough to stop searching (see solve() of solver.py)
+        time_budget: A float with the number of seconds after which the best solution found so far is returned
+
+    Yields:
+        Tuples (index of the scramble, scramble, solution, seconds used by the worker)
+
+    The scrambles are taken from the iterable while the results are yielded, at most PENDING_PER_WORKER per worker are submitted and not finished.
+    """
+    executor = get_executor(workers)
+    futures = {}
+    scrambles = iter(enumerate(scrambles))
+    while True:
+        for index, scramble in scrambles:
+            futures[executor.submit(solve_one, scramble, target_length, time_budget)] = index, scramble
+            if len(futures) >= PENDING_PER_WORKER*workers:
+                break
+        if not futures:
+            return
+        done, pending = wait(futures, return_when=FIRST_COMPLETED)
+        for future in done:
+            index, scramble = futures.pop(future)
+            solution, seconds = future.result()
+            yield index, scramble, solution, seconds
+
+
+def percentile(values, percent):
+    """Returns the percentile of a list of numbers (nearest rank, None for an empty list)."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[max(0, -(-len(values)*percent//100) - 1)]
+
+
+def statistics(latencies, wall_time):
+    """Summarises the results of solve_many().
+
+    Args:
+        latencies: A list with the seconds used for every solve
+        wall_time: A float with the seconds all solves took together
+
+    Returns:
+        A dictionary with the number of solves, the throughput in solves per second and the latency percentiles in seconds
+    """
+    summary = {"solves": len(latencies), "solves_per_second": len(latencies)/wall_time if wall_time else 0}
+    for percent in PERCENTILES:
+        summary[f"p{percent}"] = percentile(latencies, percent)
+    summary["max"] = max(latencies, default=None)
+    return summary
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "-"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else WORKERS
+    target_length = int(sys.argv[3]) if len(sys.argv) > 3 else v6.TARGET_LENGTH
+    time_budget = float(sys.argv[4]) if len(sys.argv) > 4 else v6.TIME_BUDGET
+
+    starttime = time.perf_counter()
+    get_executor(workers)
+    # ProcessPoolExecutor starts the workers with the first scrambles, this is only the time to load the tables
+    print(f"Tables loaded (Time used: {time.perf_counter()-starttime} seconds)", file=sys.stderr)
+
+    # the scrambles are read while solving, so the file stays open until all are solved (standard input is not closed)
+    with contextlib.nullcontext(sys.stdin) if path == "-" else open(path) as file:
+        scrambles = (line.strip() for line in file if line.strip())
+        starttime = time.perf_counter()
+        latencies = []
+        for index, scramble, solution, seconds in solve_many(scrambles, workers, target_length, time_budget):
+            latencies.append(seconds)
+            print(f"{index}\t{scramble}\t{solution}\t{len(solution)//2}\t{seconds:.4f}", flush=True)
+    print(statistics(latencies, time.perf_counter()-starttime), file=sys.stderr)
+    shutdown()
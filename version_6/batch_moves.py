@@ -0,0 +1,227 @@
+"""Moves on many cube states at once
+
+N cube states in the linear cubie method are stored in one numpy array of
+shape (N, 40) and type int8, one state per row. A move is one gather of the
+columns (the position every value comes from, MOVE_GATHER) followed by adding
+the rotations of the move (MOVE_ADD) modulo 3 for the corners and modulo 2 for
+the edges (MODULUS), applied to all rows at once. Different moves can be
+applied to every row with apply_moves(). random_states() draws uniformly
+distributed solvable states directly, without retries.
+
+This is used for random-walk sampling, scrambles and generating tables, where
+millions of moves are needed: numpy on a single cube (like version_5) is slower
+than Python lists, but on many cubes at once it is much faster.
+
+Usage: python batch_moves.py [number of states] [number of moves]
+"""
+
+
+
+import sys
+import time
+
+import numpy as np
+
+import v6
+import coordinates
+
+
+def generate_move_arrays():
+    """Derives the gather and add arrays of all 18 moves from the move tables of v6.py.
+
+    Returns:
+        A tuple containing two numpy arrays of shape (18, 40):
+            An array (intp) with the column every column of a state receives its value from
+            An array (int8) with the value added to every column
+    """
+    gather = np.empty((18, 40), dtype=np.intp)
+    add = np.zeros((18, 40), dtype=np.int8)
+    for move, (permutation, orientation) in enumerate(zip(v6.MOVE_PERMUTATIONS, v6.MOVE_ORIENTATIONS)):
+        gather[move, 0::2] = 2*np.array(permutation)
+        gather[move, 1::2] = 2*np.array(permutation) + 1
+        add[move, 1::2] = orientation
+    return gather, add
+
+MOVE_GATHER, MOVE_ADD = generate_move_arrays()
+
+# modulus of every column: the cubies never reach 64, the rotations are modulo 3 (corners) and 2 (edges)
+MODULUS = np.array([64, 3]*8 + [64, 2]*12, dtype=np.int8)
+
+SOLVED_STATE = np.array(v6.SOLVED_STATE_CUBIE_LINEAR, dtype=np.int8)
+
+
+def solved_states(n):
+    """Returns an array (N, 40) with n solved cubes."""
+    return np.tile(SOLVED_STATE, (n, 1))
+
+
+def apply_move(states, move):
+    """Executes the same move on all states.
+
+    Args:
+        states: A numpy array (N, 40) with cubes in the linear cubie method
+        move: An integer with the index of the move in MOVES
+
+    Returns:
+        A new numpy array with the states after the move
+    """
+    new_states = states[:, MOVE_GATHER[move]]
+    new_states += MOVE_ADD[move]
+    new_states %= MODULUS
+    return new_states
+
+
+def apply_moves(states, moves):
+    """Executes a different move on every state.
+
+    Args:
+        states: A numpy array (N, 40) with cubes in the linear cubie method
+        moves: A numpy array (N) with the index of the move (in MOVES) for every state
+
+    Returns:
+        A new numpy array with the states after the moves
+    """
+    # the rows are grouped by move, as gathering with a different index array for every row needs an index array as large as the states
+    new_states = np.empty_like(states)
+    for move in range(18):
+        rows = np.flatnonzero(moves == move)
+        new_states[rows] = apply_move(states[rows], move)
+    return new_states
+
+
+def apply_sequences(states, sequences):
+    """Executes a sequence of moves on every state (see apply_moves()).
+
+    Args:
+        states: A numpy array (N, 40) with cubes in the linear cubie method
+        sequences: A numpy array (N, length) with the indices of the moves for every state
+
+    Returns:
+        A new numpy array with the states after the moves
+    """
+    for column in range(sequences.shape[1]):
+        states = apply_moves(states, sequences[:, column])
+    return states
+
+
+def random_sequences(n, length, rng=None):
+    """Returns n random move sequences without two moves on the same face in a row.
+
+    Args:
+        n: An integer with the number of sequences
+        length: An integer with the number of moves of every sequence
+        rng: A numpy Generator (optional, a new one is created)
+
+    Returns:
+        A numpy array (n, length) with the indices of the moves (in MOVES)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    if length == 0:
+        return np.empty((n, 0), dtype=np.intp)
+    # every face is followed by one of the 5 other faces with the same probability
+    faces = np.empty((n, length), dtype=np.intp)
+    faces[:, :1] = rng.integers(0, 6, (n, 1))
+    faces[:, 1:] = (faces[:, :1] + np.cumsum(rng.integers(1, 6, (n, length-1)), axis=1)) % 6
+    return (3*faces + rng.integers(0, 3, (n, length))).astype(np.intp)
+
+
+def random_walk(n, length, rng=None):
+    """Returns n cubes scrambled with random sequences of "length" moves (see random_sequences()) and the sequences."""
+    sequences = random_sequences(n, length, rng)
+    return apply_sequences(solved_states(n), sequences), sequences
+
+
+def permutation_parities(permutations):
+    """Returns a numpy array with the parity (0 even, 1 odd) of every row of permutations, counting the inversions of all pairs of columns at once."""
+    first, second = np.triu_indices(permutations.shape[1], 1)
+    return np.count_nonzero(permutations[:, first] > permutations[:, second], axis=1) & 1
+
+
+def are_solvable(states):
+    """Checks for every state if it can be solved with the 18 moves (is_solvable() of coordinates.py for a whole array).
+
+    Args:
+        states: A numpy array (N, 40) with cubes in the linear cubie method
+
+    Returns:
+        A numpy array of booleans with one entry per state
+    """
+    corners, edges = states[:, 0:16:2], states[:, 16::2]
+    corner_rotations, edge_rotations = states[:, 1:16:2].astype(np.int64), states[:, 17::2].astype(np.int64)
+    solvable = (np.sort(corners, axis=1) == np.arange(8)).all(axis=1) & (np.sort(edges, axis=1) == np.arange(12)).all(axis=1)
+    solvable &= ((corner_rotations >= 0) & (corner_rotations < 3)).all(axis=1) & ((edge_rotations >= 0) & (edge_rotations < 2)).all(axis=1)
+    solvable &= (corner_rotations.sum(axis=1) % 3 == 0) & (edge_rotations.sum(axis=1) % 2 == 0)
+    return solvable & (permutation_parities(corners) == permutation_parities(edges))
+
+
+def random_states(n, rng=None):
+    """Returns n random solvable cube states, every state with the same probability (see random_state() of v6.py).
+
+    The permutations are shuffled rows, the rotation of the last corner and edge completes the sum of the rotations and the last two edges are swapped where the parity of the corners and the edges differs, so no state has to be drawn again.
+
+    Args:
+        n: An integer with the number of states
+        rng: A numpy Generator (optional, a new one is created)
+
+    Returns:
+        A numpy array (n, 40) of type int8 with the cubes in the linear cubie method
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    corners = rng.permuted(np.tile(np.arange(8, dtype=np.int8), (n, 1)), axis=1)
+    edges = rng.permuted(np.tile(np.arange(12, dtype=np.int8), (n, 1)), axis=1)
+    swapped = np.flatnonzero(permutation_parities(corners) != permutation_parities(edges))
+    edges[swapped, 10:] = edges[swapped, 11:9:-1]
+    corner_rotations = rng.integers(0, 3, (n, 8), dtype=np.int8)
+    corner_rotations[:, 7] = -corner_rotations[:, :7].sum(axis=1) % 3
+    edge_rotations = rng.integers(0, 2, (n, 12), dtype=np.int8)
+    edge_rotations[:, 11] = edge_rotations[:, :11].sum(axis=1) % 2
+
+    states = np.empty((n, 40), dtype=np.int8)
+    states[:, 0:16:2], states[:, 1:16:2] = corners, corner_rotations
+    states[:, 16::2], states[:, 17::2] = edges, edge_rotations
+    return states
+
+
+def is_solved(states):
+    """Returns a numpy array of booleans indicating for every state if it is solved."""
+    return (states == SOLVED_STATE).all(axis=1)
+
+
+def get_twists(states):
+    """Returns a numpy array with the twist coordinate of every state (see get_twist() of coordinates.py)."""
+    return coordinates.orientations_to_coordinates(states[:, 1:16:2].astype(np.int64), 3)
+
+
+def get_flips(states):
+    """Returns a numpy array with the flip coordinate of every state (see get_flip() of coordinates.py)."""
+    return coordinates.orientations_to_coordinates(states[:, 17::2].astype(np.int64), 2)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    rng = np.random.default_rng()
+    sequences = random_sequences(n, length, rng)
+    states = solved_states(n)
+    starttime = time.perf_counter()
+    states = apply_sequences(states, sequences)
+    seconds = time.perf_counter() - starttime
+    print(f"{n*length} moves on {n} states, {n*length/seconds:.0f} moves per second (Time used: {seconds} seconds)")
+
+    states = solved_states(n)
+    starttime = time.perf_counter()
+    for move in range(length):
+        states = apply_move(states, move % 18)
+    seconds = time.perf_counter() - starttime
+    print(f"{n*length} moves on {n} states (same move on all), {n*length/seconds:.0f} moves per second (Time used: {seconds} seconds)")
+
+    starttime = time.perf_counter()
+    states = random_states(n, rng)
+    seconds = time.perf_counter() - starttime
+    print(f"{n} random states, {n/seconds:.0f} states per second (Time used: {seconds} seconds)")
+
+    starttime = time.perf_counter()
+    solvable = are_solvable(states)
+    seconds = time.perf_counter() - starttime
+    print(f"{np.count_nonzero(solvable)} of {n} states solvable, {n/seconds:.0f} states checked per second (Time used: {seconds} seconds)")
@@ -0,0 +1,323 @@
+"""Coordinates of the cube
+
+This file encodes the parts of a cube state that matter for solving as small
+integers (coordinates), so a solved check, a hash or a table lookup is a single
+integer operation instead of a comparison of whole lists. All coordinates are 0
+for a solved cube.
+
+twist: rotation of the 8 corners (0..2186)
+flip: rotation (=flip) of the 12 edges (0..2047)
+slice: positions of the 4 edges of the middle layer (0..494), order ignored
+slice_permutation: order of the 4 edges of the middle layer (0..23)
+corner_permutation: positions of the 8 corners (0..40319)
+ud_edge_permutation: positions of the 8 edges of the top and bottom layer (0..40319), only meaningful if they are all in these two layers
+edge_permutation: positions of the 12 edges (0..479001599)
+
+The states are stored in the linear cubie method (explained in notation_methods.txt) or as the 20 values of CubeStep1 (rotation of every cubie, +2 for the edges of the middle layer).
+
+The functions at the end of this file compute coordinates of whole numpy arrays at once, which is used to generate the large tables.
+"""
+
+
+
+import itertools
+from math import comb, factorial
+
+import numpy as np
+
+N_TWIST = 2187
+N_FLIP = 2048
+N_SLICE = 495
+N_SLICE_PERMUTATION = 24
+N_CORNER_PERMUTATION = 40320
+N_UD_EDGE_PERMUTATION = 40320
+N_EDGE_PERMUTATION = 479001600
+
+# the four edges of the middle layer (cubie numbers 8-11)
+SLICE_EDGES = [8, 9, 10, 11]
+
+# cubies and rotations of a valid cube (see is_solvable())
+CORNERS = set(range(8))
+EDGES = set(range(12))
+CORNER_ROTATIONS = {0, 1, 2}
+EDGE_ROTATIONS = {0, 1}
+
+
+def permutation_to_coordinate(permutation):
+    """Returns the rank of a permutation (0 for the identity).
+
+    Args:
+        permutation: A list containing the numbers 0 to n-1 in any order
+
+    Returns:
+        An integer between 0 and n!-1
+    """
+    coordinate = 0
+    n = len(permutation)
+    for i in range(n-1):
+        smaller = 0
+        for j in range(i+1, n):
+            if permutation[j] < permutation[i]:
+                smaller += 1
+        coordinate = coordinate*(n-i) + smaller
+    return coordinate
+
+
+def coordinate_to_permutation(coordinate, n):
+    """Returns the permutation with a given rank (inverse of permutation_to_coordinate()).
+
+    Args:
+        coordinate: An integer between 0 and n!-1
+        n: An integer with the length of the permutation
+
+    Returns:
+        A list containing the numbers 0 to n-1
+    """
+    smaller = [0 for i in range(n)]
+    for i in range(n-2, -1, -1):
+        smaller[i] = coordinate % (n-i)
+        coordinate //= n-i
+    available = [i for i in range(n)]
+    return [available.pop(s) for s in smaller]
+
+
+def permutation_parity(permutation):
+    """Returns the parity of a permutation (0 even, 1 odd) from the number of its cycles.
+
+    A cycle of length k needs k-1 swaps, so the parity is the number of elements minus the number of cycles. This only walks the list once instead of sorting it.
+
+    Args:
+        permutation: A list containing the numbers 0 to n-1 in any order
+
+    Returns:
+        An integer (0 or 1)
+    """
+    seen = [False for i in permutation]
+    parity = len(permutation)
+    for start in range(len(permutation)):
+        if not seen[start]:
+            parity += 1
+            position = start
+            while not seen[position]:
+                seen[position] = True
+                position = permutation[position]
+    return parity & 1
+
+
+def is_solvable(state):
+    """Checks if a cube in the linear cubie method can be solved with the 18 moves.
+
+    Every cubie has to be in the cube exactly once with a valid rotation, the rotations of the corners have to add up to a multiple of 3 and those of the edges to a multiple of 2, and the permutations of the corners and the edges have to have the same parity.
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+
+    Returns:
+        A boolean indicating if the cube is solvable
+    """
+    corners, edges = state[0:16:2], state[16::2]
+    corner_rotations, edge_rotations = state[1:16:2], state[17::2]
+    if set(corners) != CORNERS or set(edges) != EDGES or not CORNER_ROTATIONS.issuperset(corner_rotations) or not EDGE_ROTATIONS.issuperset(edge_rotations):
+        return False
+    if sum(corner_rotations) % 3 or sum(edge_rotations) % 2:
+        return False
+    return permutation_parity(corners) == permutation_parity(edges)
+
+
+def orientation_to_coordinate(orientations, base):
+    """Returns the coordinate of the rotation of all the corners (base 3) or edges (base 2).
+
+    The rotation of the last cubie is not stored, as it is determined by the others on a solvable cube.
+    """
+    coordinate = 0
+    for orientation in orientations[:-1]:
+        coordinate = coordinate*base + orientation
+    return coordinate
+
+
+def coordinate_to_orientation(coordinate, base, n):
+    """Returns the rotations of the n corners (base 3) or edges (base 2) described by a coordinate."""
+    orientations = [0 for i in range(n)]
+    for i in range(n-2, -1, -1):
+        orientations[i] = coordinate % base
+        coordinate //= base
+    orientations[-1] = -sum(orientations) % base
+    return orientations
+
+
+def positions_to_slice(is_slice_edge):
+    """Returns the slice coordinate of the edges in the middle layer.
+
+    Args:
+        is_slice_edge: A list with 12 booleans indicating for every edge position if it contains an edge of the middle layer
+
+    Returns:
+        An integer between 0 and 494
+    """
+    coordinate = 0
+    found = 0
+    for position in range(11, -1, -1):
+        if is_slice_edge[position]:
+            found += 1
+            coordinate += comb(11-position, found)
+    return coordinate
+
+
+def slice_to_positions(coordinate):
+    """Returns the 4 edge positions of the middle layer described by a slice coordinate (in increasing order)."""
+    positions = []
+    for found in range(4, 0, -1):
+        k = found-1
+        while comb(k+1, found) <= coordinate:
+            k += 1
+        coordinate -= comb(k, found)
+        positions.append(11-k)
+    return positions
+
+
+def get_twist(state):
+    """Returns the twist coordinate of a cube in the linear cubie method."""
+    return orientation_to_coordinate(state[1:16:2], 3)
+
+
+def get_flip(state):
+    """Returns the flip coordinate of a cube in the linear cubie method."""
+    return orientation_to_coordinate(state[17::2], 2)
+
+
+def get_slice(state):
+    """Returns the slice coordinate of a cube in the linear cubie method."""
+    return positions_to_slice([edge >= 8 for edge in state[16::2]])
+
+
+def get_slice_permutation(state):
+    """Returns the order of the edges of the middle layer (in the order of their positions) as a coordinate."""
+    return permutation_to_coordinate([edge-8 for edge in state[16::2] if edge >= 8])
+
+
+def get_corner_permutation(state):
+    """Returns the corner permutation coordinate of a cube in the linear cubie method."""
+    return permutation_to_coordinate(state[0:16:2])
+
+
+def get_ud_edge_permutation(state):
+    """Returns the permutation of the edges in the top and bottom layer (positions 0-7) as a coordinate."""
+    return permutation_to_coordinate(state[16:32:2])
+
+
+def get_edge_permutation(state):
+    """Returns the edge permutation coordinate of a cube in the linear cubie method."""
+    return permutation_to_coordinate(state[16::2])
+
+
+def set_twist(state, twist):
+    """Changes the rotation of the corners of a cube in the linear cubie method to the given twist coordinate."""
+    state[1:16:2] = coordinate_to_orientation(twist, 3, 8)
+
+
+def set_flip(state, flip):
+    """Changes the rotation of the edges of a cube in the linear cubie method to the given flip coordinate."""
+    state[17::2] = coordinate_to_orientation(flip, 2, 12)
+
+
+def set_slice(state, slice, slice_permutation=0):
+    """Places the edges of the middle layer in the positions given by the slice (and slice permutation) coordinate.
+
+    The other edges are placed in the remaining positions in increasing order.
+    """
+    positions = slice_to_positions(slice)
+    slice_edges = [edge+8 for edge in coordinate_to_permutation(slice_permutation, 4)]
+    other_edges = [edge for edge in range(8)]
+    edges = [slice_edges.pop(0) if position in positions else other_edges.pop(0) for position in range(12)]
+    state[16::2] = edges
+
+
+def set_corner_permutation(state, corner_permutation):
+    """Changes the positions of the corners of a cube in the linear cubie method to the given coordinate."""
+    state[0:16:2] = coordinate_to_permutation(corner_permutation, 8)
+
+
+def set_ud_edge_permutation(state, ud_edge_permutation):
+    """Changes the positions of the edges in the top and bottom layer to the given coordinate (the middle layer is left solved)."""
+    state[16:32:2] = coordinate_to_permutation(ud_edge_permutation, 8)
+    state[32::2] = SLICE_EDGES
+
+
+def set_edge_permutation(state, edge_permutation):
+    """Changes the positions of the edges of a cube in the linear cubie method to the given coordinate."""
+    state[16::2] = coordinate_to_permutation(edge_permutation, 12)
+
+
+def encode(state):
+    """Encodes a cube in the linear cubie method as coordinates.
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+
+    Returns:
+        A tuple (twist, flip, corner_permutation, edge_permutation) describing the whole cube
+    """
+    return get_twist(state), get_flip(state), get_corner_permutation(state), get_edge_permutation(state)
+
+
+def decode(twist, flip, corner_permutation, edge_permutation):
+    """Decodes the coordinates returned by encode() back to the linear cubie method.
+
+    Returns:
+        A list containing the cube in the linear cubie method
+    """
+    state = [0 for i in range(40)]
+    set_twist(state, twist)
+    set_flip(state, flip)
+    set_corner_permutation(state, corner_permutation)
+    set_edge_permutation(state, edge_permutation)
+    return state
+
+
+def encode_step1(step1_state):
+    """Encodes the 20 values of CubeStep1 as coordinates.
+
+    Args:
+        step1_state: A list containing the rotation of every cubie (+2 for the edges of the middle layer)
+
+    Returns:
+        A tuple (twist, flip, slice), which is (0, 0, 0) if the first step of the solving process is completed
+    """
+    return orientation_to_coordinate(step1_state[:8], 3), orientation_to_coordinate([value & 1 for value in step1_state[8:]], 2), positions_to_slice([value >= 2 for value in step1_state[8:]])
+
+
+def decode_step1(twist, flip, slice):
+    """Decodes the coordinates returned by encode_step1() back to the 20 values of CubeStep1."""
+    positions = slice_to_positions(slice)
+    return coordinate_to_orientation(twist, 3, 8) + [flip_value + 2*(position in positions) for position, flip_value in enumerate(coordinate_to_orientation(flip, 2, 12))]
+
+
+def rank_arrangements(positions, n):
+    """Returns the ranks of rows of distinct numbers below n in lexicographic order (permutation_to_coordinate() for a whole array, also for rows shorter than n).
+
+    Args:
+        positions: A numpy array with one row of k distinct numbers per arrangement
+        n: An integer with the number of possible values
+
+    Returns:
+        A numpy array with the rank of every row (between 0 and n!/(n-k)!-1)
+    """
+    coordinate = np.zeros(len(positions), dtype=np.int64)
+    for i in range(positions.shape[1]):
+        smaller_before = (positions[:, :i] < positions[:, i:i+1]).sum(axis=1)
+        coordinate = coordinate*(n-i) + positions[:, i] - smaller_before
+    return coordinate
+
+
+def all_orientations(base, n):
+    """Returns a numpy array with the rotations of the n corners (base 3) or edges (base 2) for every coordinate (coordinate_to_orientation() for all coordinates, one row per coordinate)."""
+    orientations = np.zeros((base**(n-1), n), dtype=np.int64)
+    orientations[:, :-1] = list(itertools.product(range(base), repeat=n-1))
+    orientations[:, -1] = -orientations[:, :-1].sum(axis=1) % base
+    return orientations
+
+
+def orientations_to_coordinates(orientations, base):
+    """Returns the coordinates of a numpy array with the rotations of the corners (base 3) or edges (base 2) in every row (orientation_to_coordinate() for a whole array)."""
+    n = orientations.shape[1]
+    return (orientations[:, :-1] % base) @ base**np.arange(n-2, -1, -1)
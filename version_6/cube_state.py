@@ -0,0 +1,105 @@
+"""Compact cube state
+
+A cube in the linear cubie method is a list of 40 integers, which needs about
+400 bytes of memory (and a cube object even more). CubeState stores the same
+state in 20 bytes: one byte per position with 3*cubie+rotation for the corners
+and 24+2*cubie+rotation for the edges. It is a subclass of bytes without
+instance attributes (empty __slots__), so it is immutable, hashable and not
+larger than a bytes object, which makes it suitable for holding millions of
+states in sets, dictionaries and queues.
+
+A move is a single gather done in C (itemgetter): the moves that rotate cubies
+gather from the state followed by two translated copies of it (every corner
+rotated by 1 and by 2, every edge flipped), so the rotation is chosen by the
+position the byte is gathered from.
+
+Usage: python cube_state.py [number of moves]
+"""
+
+
+
+import sys
+import time
+from operator import itemgetter
+
+import v6
+
+# translations adding 1 and 2 to the rotation of every corner (values 0-23) and flipping every edge (values 24-47)
+ROTATE_ONCE = bytes([3*(value//3) + (value+1)%3 for value in range(24)] + [value^1 for value in range(24, 256)])
+ROTATE_TWICE = bytes([3*(value//3) + (value+2)%3 for value in range(24)] + [value^1 for value in range(24, 256)])
+
+
+def generate_move_lookups():
+    """Derives the lookup data of all 18 moves from the move tables of v6.py.
+
+    Returns:
+        A tuple containing two lists with one entry per move (in the order of MOVES):
+            A list with an itemgetter returning the new bytes from the state (followed by its two rotated copies if the move rotates cubies)
+            A list of booleans indicating if the move rotates cubies
+    """
+    gathers = []
+    rotates = []
+    for permutation, orientation in zip(v6.MOVE_PERMUTATIONS, v6.MOVE_ORIENTATIONS):
+        gathers.append(itemgetter(*[20*rotation + source for source, rotation in zip(permutation, orientation)]))
+        rotates.append(any(orientation))
+    return gathers, rotates
+
+MOVE_GATHERS, MOVE_ROTATES = generate_move_lookups()
+
+
+class CubeState(bytes):
+    """An immutable cube state in 20 bytes (3*cubie+rotation for the corners, 24+2*cubie+rotation for the edges)."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_linear(cls, state):
+        """Creates a CubeState from a list containing the cube in the linear cubie method."""
+        return cls([3*state[2*i] + state[2*i+1] for i in range(8)] + [24 + 2*state[2*i] + state[2*i+1] for i in range(8, 20)])
+
+    def to_linear(self):
+        """Returns a list containing the cube in the linear cubie method."""
+        state = []
+        for position, value in enumerate(self):
+            state += divmod(value, 3) if position < 8 else divmod(value-24, 2)
+        return state
+
+    def apply_move(self, move):
+        """Returns a new CubeState after a move (an integer with the index of the move in MOVES)."""
+        if MOVE_ROTATES[move]:
+            return CubeState(MOVE_GATHERS[move](self + self.translate(ROTATE_ONCE) + self.translate(ROTATE_TWICE)))
+        return CubeState(MOVE_GATHERS[move](self))
+
+    def apply_moves(self, moves):
+        """Returns a new CubeState after a sequence of moves (a list with the indices of the moves in MOVES)."""
+        state = self
+        for move in moves:
+            state = state.apply_move(move)
+        return state
+
+    def is_solved(self):
+        """Returns a boolean indicating if the cube is solved."""
+        return self == SOLVED_STATE
+
+    def __repr__(self):
+        return f"CubeState({list(self)})"
+
+    __str__ = __repr__
+
+SOLVED_STATE = CubeState.from_linear(v6.SOLVED_STATE_CUBIE_LINEAR)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    state = v6.SOLVED_STATE_CUBIE_LINEAR
+    starttime = time.perf_counter()
+    for i in range(n):
+        state = v6.apply_move(state, i % 18)
+    print(f"apply_move() of v6.py: {n/(time.perf_counter()-starttime):.0f} moves per second, {sys.getsizeof(state)} bytes per state (the small integers are shared)")
+
+    state = SOLVED_STATE
+    starttime = time.perf_counter()
+    for i in range(n):
+        state = state.apply_move(i % 18)
+    print(f"apply_move() of CubeState: {n/(time.perf_counter()-starttime):.0f} moves per second, {sys.getsizeof(state)} bytes per state")
@@ -0,0 +1,206 @@
+"""Conversion between the sticker and the cubie method for many cubes at once
+
+Works like cubies_to_stickers() and stickers_to_cubies() of v6.py, but on
+numpy arrays: N cubes in the sticker method are an array of shape (N, 6, 3, 3),
+N cubes in the linear cubie method an array of shape (N, 40) (see
+batch_moves.py). Both directions use the stickers of every position derived
+from CUBIE_LIST (CUBIE_FACELETS of v6.py): the colors of the stickers of a
+position are combined into one number, which is looked up in a table with the
+cubie and rotation for every combination of colors (-1 for combinations that
+are no cubie).
+
+The reduced colors of step 1 (1 for the top and bottom color, 2 for the front
+and back color of the edges of the middle layer, 0 otherwise, see CubeStep1)
+are supported as well, and full colors can be reduced with reduce_colors().
+
+Cubes that cannot be decoded are marked in the result, invalid_pieces() lists
+the invalid pieces of a single cube.
+
+Usage: python facelets.py [number of cubes]
+"""
+
+
+
+import sys
+import time
+
+import numpy as np
+
+import v6
+import batch_moves
+
+# flat index (face*9+row*3+column) of the stickers of every corner and edge position
+CORNER_STICKERS = np.array([[9*face+3*row+column for face, row, column in facelets] for facelets in v6.CUBIE_FACELETS[0]])
+EDGE_STICKERS = np.array([[9*face+3*row+column for face, row, column in facelets] for facelets in v6.CUBIE_FACELETS[1]])
+
+SOLVED_STICKERS = np.repeat(np.arange(6), 9).reshape(6, 3, 3)
+
+
+def generate_lookup_tables(cubie_list=v6.CUBIE_LIST):
+    """Builds the tables for both directions of the conversion.
+
+    Returns:
+        A tuple containing four numpy arrays:
+            For the corners the colors of the 3 stickers (in the order of CUBIE_FACELETS) for every value 3*cubie+rotation
+            For the edges the colors of the 2 stickers for every value 2*cubie+rotation
+            For the corners the value 3*cubie+rotation for every combination 36*color_0+6*color_1+color_2 of the colors of the stickers (-1 if it is no cubie)
+            For the edges the value 2*cubie+rotation for every combination 6*color_0+color_1 (-1 if it is no cubie)
+    """
+    facelet_colors, cubie_from_colors = v6.generate_facelet_maps(cubie_list)
+    tables = []
+    for kind, n in [(0, 3), (1, 2)]:
+        colors = np.zeros((len(cubie_list[kind])*n, n), dtype=np.int8)
+        for combination, (cubie, rotation) in cubie_from_colors[kind].items():
+            colors[n*cubie+rotation] = combination
+        tables.append(colors)
+    for kind, n in [(0, 3), (1, 2)]:
+        values = np.full(6**n, -1, dtype=np.int8)
+        for combination, (cubie, rotation) in cubie_from_colors[kind].items():
+            values[np.ravel_multi_index(combination, (6,)*n)] = n*cubie+rotation
+        tables.append(values)
+    return tuple(tables)
+
+CORNER_COLORS, EDGE_COLORS, CORNER_VALUES, EDGE_VALUES = generate_lookup_tables()
+
+
+def cubies_to_stickers(states):
+    """Converts cubes in the linear cubie method to the sticker method.
+
+    Args:
+        states: A numpy array (N, 40) with cubes in the linear cubie method
+
+    Returns:
+        A numpy array (N, 6, 3, 3) of type int8 with the colors of the stickers
+    """
+    stickers = np.tile(SOLVED_STICKERS.astype(np.int8).reshape(1, 54), (len(states), 1))
+    states = states.astype(np.intp)
+    stickers[:, CORNER_STICKERS] = CORNER_COLORS[3*states[:, 0:16:2] + states[:, 1:16:2]]
+    stickers[:, EDGE_STICKERS] = EDGE_COLORS[2*states[:, 16::2] + states[:, 17::2]]
+    return stickers.reshape(-1, 6, 3, 3)
+
+
+def stickers_to_cubies(stickers):
+    """Converts cubes in the sticker method to the linear cubie method.
+
+    Args:
+        stickers: A numpy array (N, 6, 3, 3) with the colors of the stickers
+
+    Returns:
+        A tuple containing two numpy arrays:
+            An array (N, 40) of type int8 with the cubes in the linear cubie method (-1 for the cubie and rotation of invalid pieces)
+            An array (N) of booleans indicating for every cube if it could be decoded (right colors of the centers, every position an available cubie, no cubie twice)
+    """
+    flat = np.asarray(stickers, dtype=np.intp).reshape(-1, 54)
+    corner_colors = flat[:, CORNER_STICKERS]
+    edge_colors = flat[:, EDGE_STICKERS]
+    # colors out of range are looked up modulo 6, but such cubes are marked invalid
+    in_range = ((flat >= 0) & (flat < 6)).all(axis=1)
+    corners = CORNER_VALUES[np.ravel_multi_index((corner_colors[:, :, 0] % 6, corner_colors[:, :, 1] % 6, corner_colors[:, :, 2] % 6), (6, 6, 6))]
+    edges = EDGE_VALUES[np.ravel_multi_index((edge_colors[:, :, 0] % 6, edge_colors[:, :, 1] % 6), (6, 6))]
+
+    states = np.full((len(flat), 40), -1, dtype=np.int8)
+    states[:, 0:16:2] = np.where(corners >= 0, corners // 3, -1)
+    states[:, 1:16:2] = np.where(corners >= 0, corners % 3, -1)
+    states[:, 16::2] = np.where(edges >= 0, edges // 2, -1)
+    states[:, 17::2] = np.where(edges >= 0, edges % 2, -1)
+
+    valid = in_range & (flat[:, 4::9] == np.arange(6)).all(axis=1) & (corners >= 0).all(axis=1) & (edges >= 0).all(axis=1)
+    # every cubie exactly once
+    valid &= (np.sort(states[:, 0:16:2], axis=1) == np.arange(8)).all(axis=1)
+    valid &= (np.sort(states[:, 16::2], axis=1) == np.arange(12)).all(axis=1)
+    return states, valid
+
+
+def reduce_colors(stickers):
+    """Reduces cubes in the sticker method to the colors of step 1 (see CubeStep1).
+
+    Args:
+        stickers: A numpy array (N, 6, 3, 3) with the colors of the stickers
+
+    Returns:
+        A numpy array (N, 6, 3, 3) of type int8 with 1 for the top and bottom color, 2 for the front and back color of the edges of the middle layer and 0 for all other stickers
+    """
+    flat = np.asarray(stickers).reshape(-1, 54)
+    reduced = (flat < 2).astype(np.int8)
+    edge_colors = flat[:, EDGE_STICKERS]
+    # an edge of the middle layer has no top or bottom color, its front or back color gets 2
+    middle = (edge_colors >= 2).all(axis=2, keepdims=True) & (edge_colors < 4)
+    reduced[:, EDGE_STICKERS] = np.where(middle, 2, reduced[:, EDGE_STICKERS])
+    reduced[:, 4::9] = 0
+    return reduced.reshape(-1, 6, 3, 3)
+
+
+def step1_cubies_to_stickers(step1_states):
+    """Converts cubes in the notation of CubeStep1 to its sticker method.
+
+    Args:
+        step1_states: A numpy array (N, 20) with the rotation of every cubie (+2 for the edges of the middle layer)
+
+    Returns:
+        A numpy array (N, 6, 3, 3) of type int8 with the reduced colors (see reduce_colors())
+    """
+    step1_states = np.asarray(step1_states, dtype=np.intp)
+    stickers = np.zeros((len(step1_states), 54), dtype=np.int8)
+    rows = np.arange(len(step1_states))[:, None]
+    stickers[rows, CORNER_STICKERS[np.arange(8), step1_states[:, :8]]] = 1
+    stickers[rows, EDGE_STICKERS[np.arange(12), step1_states[:, 8:] % 2]] = 1 + step1_states[:, 8:] // 2
+    return stickers.reshape(-1, 6, 3, 3)
+
+
+def step1_stickers_to_cubies(stickers):
+    """Converts cubes in the sticker method of CubeStep1 to the notation of CubeStep1.
+
+    Args:
+        stickers: A numpy array (N, 6, 3, 3) with the reduced colors (see reduce_colors())
+
+    Returns:
+        A tuple containing two numpy arrays:
+            An array (N, 20) of type int8 with the cubes in the notation of CubeStep1 (-1 for invalid pieces)
+            An array (N) of booleans indicating for every cube if it could be decoded (one marked sticker per piece, 4 edges of the middle layer)
+    """
+    flat = np.asarray(stickers, dtype=np.intp).reshape(-1, 54)
+    corner_colors = flat[:, CORNER_STICKERS]
+    edge_colors = flat[:, EDGE_STICKERS]
+    corners_valid = ((corner_colors == 1).sum(axis=2) == 1) & ((corner_colors == 0) | (corner_colors == 1)).all(axis=2)
+    edges_valid = ((edge_colors != 0).sum(axis=2) == 1) & ((edge_colors >= 0) & (edge_colors <= 2)).all(axis=2)
+
+    step1_states = np.full((len(flat), 20), -1, dtype=np.int8)
+    step1_states[:, :8] = np.where(corners_valid, np.argmax(corner_colors == 1, axis=2), -1)
+    edge_values = np.argmax(edge_colors != 0, axis=2) + 2*(edge_colors.max(axis=2) == 2)
+    step1_states[:, 8:] = np.where(edges_valid, edge_values, -1)
+
+    valid = corners_valid.all(axis=1) & edges_valid.all(axis=1) & ((step1_states[:, 8:] >= 2).sum(axis=1) == 4)
+    return step1_states, valid
+
+
+def invalid_pieces(stickers, step1=False):
+    """Lists the invalid pieces of a single cube (see stickers_to_cubies() and step1_stickers_to_cubies() of v6.py).
+
+    Args:
+        stickers: A numpy array or list (6, 3, 3) with the colors of the stickers
+        step1: A boolean indicating if the stickers have the reduced colors of step 1
+
+    Returns:
+        A list of strings describing every invalid piece (empty if the cube can be decoded)
+    """
+    stickers = np.asarray(stickers).tolist()
+    try:
+        if step1:
+            v6.step1_stickers_to_cubies(stickers)
+        else:
+            v6.stickers_to_cubies(stickers)
+    except v6.InvalidCubeError as error:
+        return error.pieces
+    return []
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    states = batch_moves.random_walk(n, 25)[0]
+    starttime = time.perf_counter()
+    stickers = cubies_to_stickers(states)
+    print(f"{n} cubes converted to stickers, {n/(time.perf_counter()-starttime):.0f} cubes per second")
+    starttime = time.perf_counter()
+    decoded, valid = stickers_to_cubies(stickers)
+    print(f"{n} cubes converted to cubies, {n/(time.perf_counter()-starttime):.0f} cubes per second ({np.count_nonzero(valid)} valid, {np.count_nonzero((decoded == states).all(axis=1))} unchanged)")
@@ -0,0 +1,329 @@
+"""Optimal solver
+
+Finds a shortest solution of a cube with IDA* and pattern databases (Richard
+Korf): a pattern database stores for every state of a part of the cube the
+exact number of moves needed to solve this part, which is a lower bound for the
+whole cube.
+
+corner database: the 8 corners, reduced by the 48 symmetries of the cube
+    (see symmetry.py). Symmetric states need the same number of moves, so only
+    one state per class is stored: class of the corner permutation x twist
+    (2,152,008 entries instead of 88,179,840). A state is looked up by turning
+    it into the representative of its class with a symmetry.
+edge database: positions and flips of the 6 edges UB, UR, UF, UL, BL, BR
+    (42,577,920 entries). The symmetry x2 (half turn of the whole cube around
+    the axis through R and L) moves the other 6 edges onto these positions, so
+    the same database is looked up a second time for the conjugate of the cube.
+
+The databases and their tables are generated with a breadth-first search over
+numpy arrays on first use (this takes a few minutes) and saved in the folder
+"tables" like the other tables. They are memory-mapped (see map_table() of
+tables.py) instead of being read into Python lists, so several solver processes
+share one copy in memory.
+
+Searching an optimal solution of a randomly scrambled cube takes very long in
+Python: this mode is meant for cubes that can be solved with up to about 14
+moves and for checking the solutions of the two-phase solver.
+
+Usage: python optimal.py [scramble] [maximum depth]
+"""
+
+
+
+import sys
+import time
+import itertools
+
+import numpy as np
+
+import v6
+import tables
+import search
+import pruning
+import symmetry
+import automaton
+import coordinates
+
+# edges stored in the edge database (UB, UR, UF, UL, BL, BR) and the symmetry moving the other 6 edges onto them (x2)
+PATTERN_EDGES = [0, 1, 2, 3, 8, 9]
+EDGE_SYMMETRY = symmetry.find_symmetry(((0, 1, 2), (1, -1, -1)))
+
+N_CORNER_CLASSES = 984
+N_CORNER_PATTERN = N_CORNER_CLASSES*coordinates.N_TWIST
+N_EDGE_ARRANGEMENT = 665280 # ordered positions of the 6 edges: 12*11*10*9*8*7
+N_EDGE_PATTERN = N_EDGE_ARRANGEMENT*64
+
+# every cube can be solved with at most 20 moves
+MAX_DEPTH = 20
+
+
+def conjugate_corners():
+    """Conjugates every corner permutation with every symmetry.
+
+    Returns:
+        A tuple containing two numpy arrays of shape (40320, 48):
+            The corner permutation coordinate of the conjugate
+            The twist coordinate of the rotations the conjugation adds to the corners (see conjugate() of symmetry.py)
+    """
+    permutations = np.array(list(itertools.permutations(range(8))))
+    conjugates = np.zeros((coordinates.N_CORNER_PERMUTATION, symmetry.N_SYMMETRIES), dtype=np.int64)
+    offsets = np.zeros((coordinates.N_CORNER_PERMUTATION, symmetry.N_SYMMETRIES), dtype=np.int64)
+    for s, (positions, rotations, _, _, _) in enumerate(symmetry.SYMMETRIES):
+        positions, rotations = np.array(positions), np.array(rotations)
+        conjugate = np.zeros_like(permutations)
+        conjugate[:, positions] = positions[permutations]
+        offset = np.zeros_like(permutations)
+        offset[:, positions] = rotations - rotations[permutations]
+        conjugates[:, s] = coordinates.rank_arrangements(conjugate, 8)
+        offsets[:, s] = coordinates.orientations_to_coordinates(offset, 3)
+    return conjugates, offsets
+
+
+def generate_corner_symmetry_tables():
+    """Generates the tables turning a corner state into the representative of its class.
+
+    The representative of a class is the state with the smallest corner permutation coordinate. The conjugate of a state with corner permutation cp and twist t under the symmetry corner_class_symmetry[cp] is the representative, its twist is twist_add[twist_symmetry[48*t+s]*2187+corner_class_offset[cp]] (twist_symmetry: see symmetry.py).
+
+    Returns:
+        A dictionary with the tables corner_class, corner_class_symmetry, corner_class_offset and twist_add (numpy arrays)
+    """
+    conjugates, offsets = conjugate_corners()
+    symmetries = conjugates.argmin(axis=1)
+    representatives, classes = np.unique(conjugates.min(axis=1), return_inverse=True)
+    assert len(representatives) == N_CORNER_CLASSES
+
+    orientations = coordinates.all_orientations(3, 8)
+    twist_add = coordinates.orientations_to_coordinates((orientations[:, None, :] + orientations[None, :, :]).reshape(-1, 8), 3)
+
+    permutation_range = np.arange(coordinates.N_CORNER_PERMUTATION)
+    return {
+        "corner_class": classes.astype(np.uint16),
+        "corner_class_symmetry": symmetries.astype(np.uint8),
+        "corner_class_offset": offsets[permutation_range, symmetries].astype(np.uint16),
+        "twist_add": twist_add.astype(np.uint16),
+    }
+
+
+def generate_edge_move_tables():
+    """Generates the move tables of the edges of the edge database.
+
+    The coordinate of these edges is 64*arrangement+flip: "arrangement" is the rank of the positions of the 6 edges (in the order of PATTERN_EDGES), "flip" stores the rotation of the first edge in the highest of 6 bits. After move m the arrangement is edge_arrangement_move[18*arrangement+m] and the flip is flip^edge_flip_move[18*arrangement+m].
+
+    Returns:
+        A dictionary with the tables edge_arrangement_move and edge_flip_move (numpy arrays)
+    """
+    arrangements = np.array(list(itertools.permutations(range(12), 6)))
+    arrangement_move = np.zeros((N_EDGE_ARRANGEMENT, 18), dtype=np.uint32)
+    flip_move = np.zeros((N_EDGE_ARRANGEMENT, 18), dtype=np.uint8)
+    for move in range(18):
+        destinations = np.zeros(12, dtype=np.int64)
+        destinations[np.array(v6.MOVE_PERMUTATIONS[move][8:])-8] = np.arange(12)
+        new_positions = destinations[arrangements]
+        arrangement_move[:, move] = coordinates.rank_arrangements(new_positions, 12)
+        flips = np.array(v6.MOVE_ORIENTATIONS[move][8:])[new_positions]
+        flip_move[:, move] = flips @ (1 << np.arange(5, -1, -1))
+    return {"edge_arrangement_move": arrangement_move.reshape(-1), "edge_flip_move": flip_move.reshape(-1)}
+
+
+def generate_corner_pattern():
+    """Generates the corner database (see breadth_first_search() of pruning.py) over the classes of corner states."""
+    corner_move = np.array(tables.get_move_table("corner_permutation"), dtype=np.int64)
+    twist_move = np.array(tables.get_move_table("twist"), dtype=np.int64)
+    corner_class = np.asarray(get_table("corner_class"), dtype=np.int64)
+    corner_class_symmetry = np.asarray(get_table("corner_class_symmetry"), dtype=np.int64)
+    corner_class_offset = np.asarray(get_table("corner_class_offset"), dtype=np.int64)
+    twist_symmetry = np.asarray(symmetry.get_symmetry_table("twist_symmetry"), dtype=np.int64)
+    twist_add = np.asarray(get_table("twist_add"), dtype=np.int64)
+    n_twist = coordinates.N_TWIST
+
+    conjugates, offsets = conjugate_corners()
+    representatives = np.unique(conjugates.min(axis=1))
+    # symmetries leaving a representative unchanged turn a state of the class into another entry of the same class
+    stabilizers = conjugates[representatives] == representatives[:, None]
+
+    def neighbours(entries):
+        permutations = representatives[entries // n_twist]
+        twists = entries % n_twist
+        for move in range(18):
+            new_permutations = corner_move[18*permutations+move]
+            new_twists = twist_move[18*twists+move]
+            symmetries = corner_class_symmetry[new_permutations]
+            yield corner_class[new_permutations]*n_twist + twist_add[twist_symmetry[48*new_twists+symmetries]*n_twist+corner_class_offset[new_permutations]]
+
+    def equivalents(entries):
+        classes, twists = entries // n_twist, entries % n_twist
+        for s in range(1, symmetry.N_SYMMETRIES):
+            selected = stabilizers[classes, s]
+            yield classes[selected]*n_twist + twist_add[twist_symmetry[48*twists[selected]+s]*n_twist+offsets[representatives[classes[selected]], s]]
+
+    return {"corner_pattern": pruning.breadth_first_search(N_CORNER_PATTERN, 0, neighbours, equivalents)}
+
+
+def generate_edge_pattern():
+    """Generates the edge database (see breadth_first_search() of pruning.py)."""
+    arrangement_move = np.asarray(get_table("edge_arrangement_move"))
+    flip_move = np.asarray(get_table("edge_flip_move"))
+
+    def neighbours(entries):
+        arrangements, flips = entries >> 6, entries & 63
+        for move in range(18):
+            index = 18*arrangements+move
+            yield arrangement_move[index].astype(np.int64)*64 + (flips ^ flip_move[index])
+
+    arrangement, flip = get_edge_coordinate(v6.SOLVED_STATE_CUBIE_LINEAR)
+    return {"edge_pattern": pruning.breadth_first_search(N_EDGE_PATTERN, 64*arrangement+flip, neighbours)}
+
+
+# name: (typecode, number of entries, function generating the table (and the other tables generated together with it))
+OPTIMAL_TABLE_DEFINITIONS = {
+    "corner_class": ("H", coordinates.N_CORNER_PERMUTATION, generate_corner_symmetry_tables),
+    "corner_class_symmetry": ("B", coordinates.N_CORNER_PERMUTATION, generate_corner_symmetry_tables),
+    "corner_class_offset": ("H", coordinates.N_CORNER_PERMUTATION, generate_corner_symmetry_tables),
+    "twist_add": ("H", coordinates.N_TWIST*coordinates.N_TWIST, generate_corner_symmetry_tables),
+    "corner_pattern": ("B", N_CORNER_PATTERN, generate_corner_pattern),
+    "edge_arrangement_move": ("I", 18*N_EDGE_ARRANGEMENT, generate_edge_move_tables),
+    "edge_flip_move": ("B", 18*N_EDGE_ARRANGEMENT, generate_edge_move_tables),
+    "edge_pattern": ("B", N_EDGE_PATTERN, generate_edge_pattern),
+}
+
+
+def get_table(name):
+    """Returns a table of the optimal solver, memory-mapping it from the disk or generating (and saving) it on first use.
+
+    Args:
+        name: A string with the name of the table (a key of OPTIMAL_TABLE_DEFINITIONS)
+
+    Returns:
+        A memoryview of the table
+    """
+    if name not in tables.loaded_tables:
+        typecode, size, generate = OPTIMAL_TABLE_DEFINITIONS[name]
+        table = tables.map_table(name, typecode, size)
+        if table is None:
+            for generated_name, generated_table in generate().items():
+                tables.save_table(generated_name, generated_table)
+            table = tables.checked_table(name, tables.map_table(name, typecode, size))
+        tables.loaded_tables[name] = table
+    return tables.loaded_tables[name]
+
+
+def get_edge_coordinate(state):
+    """Returns the arrangement and flip (see generate_edge_move_tables()) of the edges of the edge database in a cube in the linear cubie method."""
+    positions = [state[16::2].index(edge) for edge in PATTERN_EDGES]
+    arrangement = 0
+    flip = 0
+    for i, position in enumerate(positions):
+        arrangement = arrangement*(12-i) + position - sum(earlier < position for earlier in positions[:i])
+        flip = flip*2 + state[17+2*position]
+    return arrangement, flip
+
+
+def solve(state, max_depth=MAX_DEPTH, nodes_per_depth=None, transposition_table=None, stats=None):
+    """Searches a shortest solution of a cube with IDA* over the pattern databases.
+
+    Every node keeps the corner coordinates and the edge coordinates of the cube and of its conjugate under EDGE_SYMMETRY, a move is a lookup in the move tables for each of them. The lower bound of a node is the largest of the three database values.
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+        max_depth: An integer with the maximum number of moves of the solution
+        nodes_per_depth: A dictionary the number of nodes expanded with every limit of moves is stored in (optional)
+        transposition_table: A TranspositionTable (see transposition.py) used only for the optimal solver (optional)
+        stats: A SearchStats object the counters of the search are added to (optional, see counting_node_search() of search.py)
+
+    Returns:
+        A list with the indices (in MOVES) of the moves of a shortest solution / None if there is no solution with at most "max_depth" moves
+    """
+    corner_move = tables.get_move_table("corner_permutation")
+    twist_move = tables.get_move_table("twist")
+    corner_class = get_table("corner_class")
+    corner_class_symmetry = get_table("corner_class_symmetry")
+    corner_class_offset = get_table("corner_class_offset")
+    twist_symmetry = symmetry.get_symmetry_table("twist_symmetry")
+    twist_add = get_table("twist_add")
+    corner_pattern = get_table("corner_pattern")
+    arrangement_move = get_table("edge_arrangement_move")
+    flip_move = get_table("edge_flip_move")
+    edge_pattern = get_table("edge_pattern")
+    edge_conjugation = symmetry.MOVE_CONJUGATION[EDGE_SYMMETRY]
+    n_twist = coordinates.N_TWIST
+    successors = automaton.get_successors("all_moves")
+
+    solution = []
+    expanded = [0]
+
+    def distance(corner_permutation, twist, arrangement, flip, arrangement_2, flip_2):
+        corner_distance = corner_pattern[corner_class[corner_permutation]*n_twist + twist_add[twist_symmetry[48*twist+corner_class_symmetry[corner_permutation]]*n_twist+corner_class_offset[corner_permutation]]]
+        return max(corner_distance, edge_pattern[64*arrangement+flip], edge_pattern[64*arrangement_2+flip_2])
+
+    def search_node(corner_permutation, twist, arrangement, flip, arrangement_2, flip_2, togo, automaton_state, moves=None):
+        if distance(corner_permutation, twist, arrangement, flip, arrangement_2, flip_2) > togo:
+            return False
+        if togo == 0:
+            return True
+        if transposition_table is not None:
+            key = search.transposition_key(((((corner_permutation*n_twist+twist)*N_EDGE_ARRANGEMENT+arrangement)*64+flip)*N_EDGE_ARRANGEMENT+arrangement_2)*64+flip_2, automaton_state)
+            if transposition_table.probe(key, togo):
+                return False
+        expanded[0] += 1
+        for move, next_state in (successors[automaton_state] if moves is None else moves):
+            index = 18*arrangement+move
+            index_2 = 18*arrangement_2+edge_conjugation[move]
+            solution.append(move)
+            if search_node(corner_move[18*corner_permutation+move], twist_move[18*twist+move], arrangement_move[index], flip^flip_move[index], arrangement_move[index_2], flip_2^flip_move[index_2], togo-1, next_state):
+                return True
+            solution.pop()
+        if transposition_table is not None:
+            transposition_table.store(key, togo)
+        return False
+
+    start = (coordinates.get_corner_permutation(state), coordinates.get_twist(state), *get_edge_coordinate(state), *get_edge_coordinate(symmetry.conjugate(state, EDGE_SYMMETRY)))
+    # the moves of a symmetric cube leading to symmetric cubes have solutions of the same lengths
+    first_moves = automaton.first_successors("all_moves", symmetries=symmetry.stabilizer(state))
+    if stats is not None:
+        # the same move and key as in search_node() on a tuple of coordinates (kept apart so search_node() stays fast, test_search.py checks that both search the same tree)
+        def apply_move(values, move):
+            corner_permutation, twist, arrangement, flip, arrangement_2, flip_2 = values
+            index = 18*arrangement+move
+            index_2 = 18*arrangement_2+edge_conjugation[move]
+            return corner_move[18*corner_permutation+move], twist_move[18*twist+move], arrangement_move[index], flip^flip_move[index], arrangement_move[index_2], flip_2^flip_move[index_2]
+
+        def node_key(values):
+            corner_permutation, twist, arrangement, flip, arrangement_2, flip_2 = values
+            return ((((corner_permutation*n_twist+twist)*N_EDGE_ARRANGEMENT+arrangement)*64+flip)*N_EDGE_ARRANGEMENT+arrangement_2)*64+flip_2
+
+        counting_search = search.counting_node_search(lambda values: distance(*values), apply_move, node_key, successors, 18, solution, expanded, stats, transposition_table)
+        return search.iterative_deepening(lambda togo: counting_search(start, togo, automaton.START, first_moves), distance(*start), max_depth, solution, expanded, nodes_per_depth)
+    return search.iterative_deepening(lambda togo: search_node(*start, togo, automaton.START, first_moves), distance(*start), max_depth, solution, expanded, nodes_per_depth)
+
+
+def solve_scramble(scramble, max_depth=MAX_DEPTH):
+    """Searches a shortest solution of a cube scrambled with the given moves (see solve()).
+
+    Args:
+        scramble: A string with the moves of the scramble (see turn() of CubeStep2)
+        max_depth: An integer with the maximum number of moves of the solution
+
+    Returns:
+        A string containing the moves of a shortest solution / None if there is no solution with at most "max_depth" moves
+    """
+    cube = v6.generate_cube()
+    cube.turn(scramble)
+    solution = solve(cube.get_cube_state(), max_depth)
+    return None if solution is None else "".join(v6.MOVES[move] for move in solution)
+
+
+if __name__ == "__main__":
+    scramble = sys.argv[1] if len(sys.argv) > 1 else "R'U2F_D_L_U2R2"
+    max_depth = int(sys.argv[2]) if len(sys.argv) > 2 else MAX_DEPTH
+
+    starttime = time.time()
+    for name in OPTIMAL_TABLE_DEFINITIONS:
+        get_table(name)
+    print(f"Tables ready (Time used: {time.time()-starttime} seconds)")
+
+    starttime = time.time()
+    solution = solve_scramble(scramble, max_depth)
+    if solution is None:
+        print(f"No solution with at most {max_depth} moves (Time used: {time.time()-starttime} seconds)")
+    else:
+        print(f"Optimal solution with {len(solution)//2} moves: {solution} (Time used: {time.time()-starttime} seconds)")
@@ -0,0 +1,217 @@
+"""Parallel search of the two steps
+
+The subtrees of the first moves (or of the first two moves) of a search are
+independent, so they are searched in a pool of worker processes
+(ProcessPoolExecutor). Every worker searches its subtree with IDA* (see
+search.py), starting at the lower bound of the pruning tables.
+
+The workers share the best solution found so far (its length and the index of
+its subtree in the order of the serial search). A worker stops as soon as its
+subtree cannot improve on it: when a shorter solution has been found or a
+solution of the same length in an earlier subtree. Of all solutions found, the
+shortest one of the earliest subtree is returned, which is exactly the solution
+the serial search finds first.
+
+The pool is created on first use and kept for later searches, so the workers
+load the tables only once. Only one parallel search can run at a time.
+
+Usage: python parallel.py [scramble] [number of workers] [split depth]
+"""
+
+
+
+import os
+import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import v6
+import search
+import automaton
+
+# default number of worker processes
+WORKERS = os.cpu_count()
+# default number of first moves that make up a subtree
+SPLIT_DEPTH = 1
+
+# the best solution is shared as length*SUBTREE_LIMIT + index of the subtree
+SUBTREE_LIMIT = 2**16
+NO_SOLUTION = 2**62
+
+# step: (builder of the depth-first search, lower bound, first moves, serial search, automaton)
+STEPS = {
+    "step1": (search.step1_node_search, search.step1_distance, search.step1_first_moves, search.step1_search, "all_moves"),
+    "step2": (search.step2_node_search, search.step2_distance, search.step2_first_moves, search.step2_search, "step2_moves"),
+}
+
+# best solution found so far (in the worker processes)
+shared_best = None
+# number of workers: (pool, best solution found so far)
+executors = {}
+
+
+def init_worker(best):
+    """Initialises a worker process with the shared best solution."""
+    global shared_best
+    shared_best = best
+
+
+def get_executor(workers=WORKERS):
+    """Returns a pool of worker processes and its shared best solution, creating them on first use.
+
+    Args:
+        workers: An integer with the number of worker processes
+
+    Returns:
+        A tuple containing the ProcessPoolExecutor and the multiprocessing.Value with the best solution found so far
+    """
+    if workers not in executors:
+        best = multiprocessing.Value("q", NO_SOLUTION)
+        executors[workers] = (ProcessPoolExecutor(workers, initializer=init_worker, initargs=(best,)), best)
+    return executors[workers]
+
+
+def shutdown():
+    """Stops all worker processes."""
+    for executor, best in executors.values():
+        executor.shutdown()
+    executors.clear()
+
+
+def subtree_prefixes(step, step_coordinates, prev_move="  ", split_depth=SPLIT_DEPTH):
+    """Returns the subtrees of a search in the order of the serial search.
+
+    Args:
+        step: A string with the step ("step1" or "step2")
+        step_coordinates: A tuple with the coordinates of the step (see STEP_MOVE_TABLES of search.py)
+        prev_move: See recursive_solving() of CubeStep1
+        split_depth: An integer with the number of first moves that make up a subtree
+
+    Returns:
+        A list of tuples (moves, coordinates after the moves, state of the automaton after the moves)
+    """
+    node_search, distance, first_moves, serial_search, name = STEPS[step]
+    successors = automaton.get_successors(name)
+    prefixes = [((), tuple(step_coordinates), None)]
+    for length in range(split_depth):
+        next_prefixes = []
+        for moves, values, state in prefixes:
+            for move, next_state in (first_moves(*values, prev_move) if state is None else successors[state]):
+                next_prefixes.append((moves + (move,), search.apply_step_move(step, values, move), next_state))
+        prefixes = next_prefixes
+    return prefixes
+
+
+def search_subtree(step, prefix, step_coordinates, state, index, first_depth, depth):
+    """Searches the shortest solution in a subtree (runs in a worker process).
+
+    Args:
+        step: A string with the step ("step1" or "step2")
+        prefix: A tuple with the first moves of the subtree
+        step_coordinates: A tuple with the coordinates after the first moves
+        state: An integer with the state of the automaton after the first moves
+        index: An integer with the position of the subtree in the order of the serial search
+        first_depth: An integer with the smallest number of moves of a solution
+        depth: An integer with the largest number of moves of a solution
+
+    Returns:
+        A tuple containing two values:
+            A list with the moves of the solution / None if there is no solution that improves on the best solution found so far
+            A dictionary with the number of nodes expanded with every limit of moves
+    """
+    node_search, distance, first_moves, serial_search, name = STEPS[step]
+    solution = list(prefix)
+    expanded = [0]
+    limit = [0]
+
+    def stop():
+        return shared_best.value < limit[0]*SUBTREE_LIMIT + index
+
+    subtree_search = node_search(solution, expanded, stop=stop)
+    nodes_per_depth = {}
+    for limit[0] in range(max(first_depth, len(prefix)+distance(*step_coordinates)), depth+1):
+        if stop():
+            break
+        expanded[0] = 0
+        found = subtree_search(*step_coordinates, limit[0]-len(prefix), state)
+        nodes_per_depth[limit[0]] = expanded[0]
+        if found:
+            if stop():
+                break
+            with shared_best.get_lock():
+                shared_best.value = min(shared_best.value, limit[0]*SUBTREE_LIMIT + index)
+            return solution, nodes_per_depth
+    return None, nodes_per_depth
+
+
+def parallel_search(step, step_coordinates, depth, prev_move="  ", nodes_per_depth=None, workers=WORKERS, split_depth=SPLIT_DEPTH):
+    """Searches the shortest solution of a step with at most "depth" moves in parallel, returning the same solution as the serial search.
+
+    Solutions with fewer moves than "split_depth" are searched serially first.
+
+    Args:
+        step: A string with the step ("step1" or "step2")
+        step_coordinates: A tuple with the coordinates of the step (see STEP_MOVE_TABLES of search.py)
+        depth: An integer describing the maximum number of moves in a row to consider
+        prev_move: See recursive_solving() of CubeStep1
+        nodes_per_depth: A dictionary the number of nodes expanded (by all workers) with every limit of moves is stored in (optional)
+        workers: An integer with the number of worker processes
+        split_depth: An integer with the number of first moves that make up a subtree (1 or 2)
+
+    Returns:
+        A list with the indices (in MOVES) of the moves of the solution / None if there is no solution with at most "depth" moves
+    """
+    node_search, distance, first_moves, serial_search, name = STEPS[step]
+    solution = serial_search(*step_coordinates, min(depth, split_depth-1), prev_move, nodes_per_depth)
+    if solution is not None:
+        return solution
+    first_depth = max(split_depth, distance(*step_coordinates))
+    if first_depth > depth:
+        return None
+
+    executor, best = get_executor(workers)
+    best.value = NO_SOLUTION
+    futures = {}
+    for index, (prefix, values, state) in enumerate(subtree_prefixes(step, step_coordinates, prev_move, split_depth)):
+        futures[executor.submit(search_subtree, step, prefix, values, state, index, first_depth, depth)] = index
+
+    solutions = {}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.cancelled():
+                continue
+            subtree_solution, subtree_nodes = future.result()
+            if subtree_solution is not None:
+                solutions[futures[future]] = subtree_solution
+            if nodes_per_depth is not None:
+                for limit, nodes in subtree_nodes.items():
+                    nodes_per_depth[limit] = nodes_per_depth.get(limit, 0) + nodes
+        # subtrees that have not started yet and cannot improve on the best solution are cancelled
+        for future in pending:
+            if best.value < first_depth*SUBTREE_LIMIT + futures[future]:
+                future.cancel()
+    if not solutions:
+        return None
+    return min(solutions.items(), key=lambda item: (len(item[1]), item[0]))[1]
+
+
+if __name__ == "__main__":
+    scramble = sys.argv[1] if len(sys.argv) > 1 else "R'U2F_D_L_U2R2"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else WORKERS
+    split_depth = int(sys.argv[3]) if len(sys.argv) > 3 else SPLIT_DEPTH
+
+    cube = v6.generate_cube()
+    cube.turn(scramble)
+    cube_step1 = v6.CubeStep1(solved=False, scramble=cube.step1_cube())
+    for mode, mode_workers in [("Serial", None), ("Parallel", workers)]:
+        starttime = time.time()
+        step1_found, solution_1 = cube_step1.recursive_solving(v6.MAX_DEPTH_STEP1, workers=mode_workers, split_depth=split_depth)
+        step2_cube = v6.generate_cube()
+        step2_cube.turn(scramble)
+        step2_cube.turn(solution_1)
+        step2_found, solution_2 = step2_cube.recursive_solving(v6.MAX_DEPTH_STEP2, workers=mode_workers, split_depth=split_depth)
+        print(f"{mode} solution: {solution_1} {solution_2} (Time used: {time.time()-starttime} seconds)")
+    shutdown()
@@ -0,0 +1,185 @@
+"""Pruning tables of the two steps
+
+A pruning table stores for every combination of coordinates (see
+coordinates.py) the minimal number of moves needed to bring all of them to 0.
+As solving the whole step needs at least as many moves, the largest value of
+the tables of a step is a lower bound the search can use to cut branches that
+cannot be solved with the moves left (IDA*).
+
+step 1 (all 18 moves): flipslice x twist, reduced by the 16 symmetries keeping
+the U-D axis (see symmetry.py). Symmetric states need the same number of moves,
+so only one entry per class of flipslice coordinates is stored (64430 x 2187
+instead of 1013760 x 2187 entries, 16 times less). As the table covers all
+coordinates of step 1 it stores the exact number of moves step 1 needs.
+step 2 (U, D, F2, B2, R2, L2): corner permutation x slice permutation and edge
+permutation (top and bottom layer) x slice permutation
+
+All tables are generated with a breadth-first search over numpy arrays: every
+depth expands all entries reached with the depth before at once through the move
+tables of tables.py. The tables of step 2 are saved (and loaded) the same way as
+the move tables, the table of step 1 is memory-mapped (see map_table() of
+tables.py). Running this file generates all the tables in advance and shows the
+states reached per depth and per second.
+"""
+
+
+import time
+
+import numpy as np
+
+import v6
+import tables
+import symmetry
+import coordinates
+
+STEP1_MOVES = [move for face, moves in v6.STEP1_SOLVING_MOVES for move in moves]
+STEP2_MOVES = [move for face, moves in v6.STEP2_SOLVING_MOVES for move in moves]
+
+N_FLIPSLICE_TWIST = symmetry.N_FLIPSLICE_CLASSES*coordinates.N_TWIST
+
+# value of the tables generated with numpy for entries not reached yet by the breadth-first search
+UNKNOWN = 255
+# number of entries searched at once by the breadth-first search over numpy arrays (limits the memory used)
+CHUNK_SIZE = 1 << 21
+
+# name: (first coordinate, number of values, second coordinate, number of values, moves of the step)
+# the slice permutation is the "slice_sorted" coordinate, which stays below 24 as long as the edges of the middle layer are in it
+PRUNING_TABLE_DEFINITIONS = {
+    "corner_slice_permutation": ("corner_permutation", coordinates.N_CORNER_PERMUTATION, "slice_sorted", coordinates.N_SLICE_PERMUTATION, STEP2_MOVES),
+    "edge_slice_permutation": ("ud_edge_permutation", coordinates.N_UD_EDGE_PERMUTATION, "slice_sorted", coordinates.N_SLICE_PERMUTATION, STEP2_MOVES),
+}
+
+
+def generate_pruning_table(name, report=None):
+    """Generates a pruning table with breadth_first_search() over the move tables.
+
+    Args:
+        name: A string with the name of the table (a key of PRUNING_TABLE_DEFINITIONS)
+        report: See breadth_first_search()
+
+    Returns:
+        A numpy array (uint8) with the number of moves needed to solve both coordinates in position first_coordinate*size_second+second_coordinate
+    """
+    first, first_size, second, second_size, moves = PRUNING_TABLE_DEFINITIONS[name]
+    first_move = np.array(tables.get_move_table(first), dtype=np.int64)
+    second_move = np.array(tables.get_move_table(second), dtype=np.int64)
+
+    def neighbours(entries):
+        first_coordinates, second_coordinates = entries // second_size, entries % second_size
+        for move in moves:
+            yield first_move[18*first_coordinates+move]*second_size + second_move[18*second_coordinates+move]
+
+    return breadth_first_search(first_size*second_size, 0, neighbours, report=report)
+
+
+def report_depth(depth, states, seconds):
+    """Prints the number of states reached with a depth of a breadth-first search (a "report" function for breadth_first_search())."""
+    print(f"  depth {depth}: {states} states, {states/seconds if seconds else 0:.0f} states per second (Time used: {seconds} seconds)")
+
+
+def breadth_first_search(size, start, neighbours, equivalents=None, report=None):
+    """Generates a table with a breadth-first search over numpy arrays starting at the solved state.
+
+    Every depth scans the table in blocks of CHUNK_SIZE entries for the entries reached with the last depth and expands them all at once.
+
+    Args:
+        size: An integer with the number of entries of the table
+        start: An integer with the entry of the solved state
+        neighbours: A function generating for a numpy array of entries one numpy array per move with the entries reached by the move
+        equivalents: A function generating for a numpy array of entries numpy arrays with entries describing the same states (optional, for tables reduced by symmetry)
+        report: A function called after every depth with the depth, the number of entries reached with it and the seconds it took (optional, e.g. report_depth())
+
+    Returns:
+        A numpy array (uint8) with the number of moves needed for every entry
+    """
+    table = np.full(size, UNKNOWN, dtype=np.uint8)
+    table[start] = 0
+    depth = 0
+    reached_states = 1
+    while reached_states:
+        starttime = time.perf_counter()
+        for first in range(0, size, CHUNK_SIZE):
+            frontier = np.flatnonzero(table[first:first+CHUNK_SIZE] == depth) + first
+            for reached in neighbours(frontier):
+                table[reached[table[reached] == UNKNOWN]] = depth+1
+        if equivalents is not None:
+            for first in range(0, size, CHUNK_SIZE):
+                for reached in equivalents(np.flatnonzero(table[first:first+CHUNK_SIZE] == depth+1) + first):
+                    table[reached[table[reached] == UNKNOWN]] = depth+1
+        reached_states = int(np.count_nonzero(table == depth+1))
+        if report is not None and reached_states:
+            report(depth+1, reached_states, time.perf_counter()-starttime)
+        depth += 1
+    return table
+
+
+def generate_flipslice_twist_table(report=None):
+    """Generates the pruning table of step 1 (flipslice class x twist) with breadth_first_search().
+
+    The entry of a state is 2187*flipslice_class[flipslice]+twist_symmetry[48*twist+flipslice_symmetry[flipslice]] with flipslice = 2048*slice+flip (see symmetry.py).
+
+    Args:
+        report: See breadth_first_search()
+
+    Returns:
+        A numpy array (uint8) with the number of moves needed to complete step 1
+    """
+    twist_move = np.array(tables.get_move_table("twist"), dtype=np.int64)
+    flip_move = np.array(tables.get_move_table("flip"), dtype=np.int64)
+    slice_move = np.array(tables.get_move_table("slice"), dtype=np.int64)
+    flipslice_class = np.array(symmetry.get_symmetry_table("flipslice_class"), dtype=np.int64)
+    flipslice_symmetry = np.array(symmetry.get_symmetry_table("flipslice_symmetry"), dtype=np.int64)
+    representatives = np.array(symmetry.get_symmetry_table("flipslice_representative"), dtype=np.int64)
+    twist_symmetry = np.array(symmetry.get_symmetry_table("twist_symmetry"), dtype=np.int64)
+    n_flip, n_twist = coordinates.N_FLIP, coordinates.N_TWIST
+
+    # symmetries leaving a representative unchanged turn a state of the class into another entry of the same class
+    stabilizers = symmetry.conjugate_flipslice()[representatives] == representatives[:, None]
+
+    def neighbours(entries):
+        flipslices = representatives[entries // n_twist]
+        flips, slices, twists = flipslices % n_flip, flipslices // n_flip, entries % n_twist
+        for move in range(18):
+            new_flipslices = slice_move[18*slices+move]*n_flip + flip_move[18*flips+move]
+            yield flipslice_class[new_flipslices]*n_twist + twist_symmetry[48*twist_move[18*twists+move]+flipslice_symmetry[new_flipslices]]
+
+    def equivalents(entries):
+        classes, twists = entries // n_twist, entries % n_twist
+        for i, s in enumerate(symmetry.UD_SYMMETRIES):
+            selected = stabilizers[classes, i]
+            yield classes[selected]*n_twist + twist_symmetry[48*twists[selected]+s]
+
+    return breadth_first_search(N_FLIPSLICE_TWIST, 0, neighbours, equivalents, report)
+
+
+def get_pruning_table(name, report=None):
+    """Returns a pruning table, loading it from the disk or generating (and saving) it on first use.
+
+    Args:
+        name: A string with the name of the table (a key of PRUNING_TABLE_DEFINITIONS or "flipslice_twist")
+        report: See breadth_first_search(), only used if the table is generated
+
+    Returns:
+        An array (a memoryview for "flipslice_twist") with the number of moves needed to solve both coordinates in position first_coordinate*size_second+second_coordinate
+    """
+    if name == "flipslice_twist" and name not in tables.loaded_tables:
+        table = tables.map_table(name+"_prune", "B", N_FLIPSLICE_TWIST)
+        if table is None:
+            tables.save_table(name+"_prune", generate_flipslice_twist_table(report))
+            table = tables.checked_table(name+"_prune", tables.map_table(name+"_prune", "B", N_FLIPSLICE_TWIST))
+        tables.loaded_tables[name] = table
+    if name not in tables.loaded_tables:
+        first, first_size, second, second_size, moves = PRUNING_TABLE_DEFINITIONS[name]
+        table = tables.read_table(name+"_prune", "b", first_size*second_size)
+        if table is None:
+            tables.save_table(name+"_prune", generate_pruning_table(name, report))
+            table = tables.checked_table(name+"_prune", tables.read_table(name+"_prune", "b", first_size*second_size))
+        tables.loaded_tables[name] = table
+    return tables.loaded_tables[name]
+
+
+if __name__ == "__main__":
+    for name in ["flipslice_twist", *PRUNING_TABLE_DEFINITIONS]:
+        starttime = time.time()
+        table = get_pruning_table(name, report_depth)
+        print(f"Pruning table {name} ready, maximum distance {max(table)} (Time used: {time.time()-starttime} seconds)")
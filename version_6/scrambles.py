@@ -0,0 +1,230 @@
+"""Scrambles
+
+Two kinds of scrambles are generated, both as strings of moves like the
+scrambles of turn() of CubeStep2 (e.g. "R'U2F_"):
+
+random state: a state drawn uniformly from all solvable states (see
+    random_state() of v6.py) is solved with the two-phase solver (see
+    solver.py), the inverse of the solution scrambles a solved cube to exactly
+    this state. Every state is equally likely, like in the official scrambles of
+    the WCA. The solver accepts the first solution of at most
+    SCRAMBLE_TARGET_LENGTH moves, and its first solution never has more, so
+    it stops there whatever the time budget and the scramble only depends on
+    the state. The scrambles have 21 moves on average (at most 23 on 200
+    states) and take about 0.13 seconds each: about 8 per second per worker
+    with the tables loaded. A lower target length gives shorter scrambles but
+    is slower (about 2 per second for 20 moves) and depends on the time
+    budget.
+random moves: a random sequence of moves, every move on a different face than
+    the move before and no move on the face of the second last move if the last
+    move was on its opposite face (U D U is the same as U2 D). The next face is
+    drawn from the faces allowed after the last two faces, so no move is drawn
+    twice. About 30000 scrambles of 25 moves are drawn per second.
+
+Both are reproducible with a seed: all random numbers come from one
+random.Random instance. generate_scrambles() yields any number of scrambles in
+order and solves the random states in chunks in the pool of worker processes of
+batch.py (only a few chunks ahead of the scrambles yielded), write_scrambles()
+streams them to a file.
+
+Usage: python scrambles.py [number of scrambles] ["state" or "moves"] [seed] [file, "-" for stdout] [number of workers] [length of random move scrambles]
+"""
+
+
+
+import sys
+import time
+import random
+import itertools
+from collections import deque
+
+import v6
+import batch
+import solver
+
+KINDS = ["state", "moves"]
+
+# the solver stops at the first solution with at most this many moves (a solution of step 1 and of step 2 never has more)
+SCRAMBLE_TARGET_LENGTH = v6.MAX_DEPTH_STEP1 + v6.MAX_DEPTH_STEP2
+# number of moves of a random move scramble
+SCRAMBLE_LENGTH = 25
+# random states solved by one task of a worker, and tasks submitted per worker and not yet yielded
+CHUNK_SIZE = 16
+PENDING_PER_WORKER = 4
+
+# faces in the order of MOVES, a face and its opposite face differ only in the lowest bit
+FACES = "UDFBRL"
+NO_FACE = 6
+
+
+def generate_allowed_faces():
+    """Lists the faces allowed after every combination of the last two faces (NO_FACE if there was no move).
+
+    Returns:
+        A list with a list of faces for every index 7*second_last_face+last_face
+    """
+    allowed = []
+    for second_face in range(7):
+        for last_face in range(7):
+            allowed.append([face for face in range(6) if face != last_face and not (face == second_face and second_face == last_face^1)])
+    return allowed
+
+ALLOWED_FACES = generate_allowed_faces()
+
+
+def invert_moves(moves):
+    """Returns the moves undoing a sequence of moves (the inverse moves in reverse order).
+
+    Args:
+        moves: A list with the indices (in MOVES) of the moves
+
+    Returns:
+        A list with the indices (in MOVES) of the inverse sequence
+    """
+    # "_" and "'" are swapped, "2" stays
+    return [move + (1, -1, 0)[move%3] for move in reversed(moves)]
+
+
+def random_move_sequence(length=SCRAMBLE_LENGTH, rng=random):
+    """Draws a random sequence of moves following the rules of random move scrambles (see ALLOWED_FACES).
+
+    Args:
+        length: An integer with the number of moves
+        rng: A random.Random instance (or the module random)
+
+    Returns:
+        A list with the indices (in MOVES) of the moves
+    """
+    moves = []
+    second_face = last_face = NO_FACE
+    for i in range(length):
+        face = rng.choice(ALLOWED_FACES[7*second_face+last_face])
+        moves.append(3*face + rng.randrange(3))
+        second_face, last_face = last_face, face
+    return moves
+
+
+def random_move_scramble(length=SCRAMBLE_LENGTH, rng=random):
+    """Returns a random move scramble (see random_move_sequence()) as a string."""
+    return "".join(v6.MOVES[move] for move in random_move_sequence(length, rng))
+
+
+def canonical_scramble(scramble):
+    """Returns the canonical form of a random move scramble: moves on opposite faces following each other (which commute) are ordered as in FACES.
+
+    Two random move scrambles with the same canonical form are the same sequence (e.g. "U_D2" and "D2U_").
+    """
+    moves = [scramble[i:i+2] for i in range(0, len(scramble), 2)]
+    for i in range(1, len(moves)):
+        face, last_face = FACES.index(moves[i][0]), FACES.index(moves[i-1][0])
+        if face == last_face^1 and face < last_face:
+            moves[i-1], moves[i] = moves[i], moves[i-1]
+    return "".join(moves)
+
+
+def count_canonical_scrambles(length):
+    """Returns the number of different random move scrambles (see canonical_scramble()) with the given number of moves."""
+    # sequences per last face, a face may only follow its opposite face if it comes later in FACES
+    counts = [3] * 6 if length else []
+    for i in range(length-1):
+        counts = [3*sum(counts[last_face] for last_face in range(6) if face != last_face and not (face == last_face^1 and face < last_face)) for face in range(6)]
+    return sum(counts) if length else 1
+
+
+def state_scramble(state, target_length=SCRAMBLE_TARGET_LENGTH, time_budget=v6.TIME_BUDGET):
+    """Returns the scramble leading from a solved cube to the given state (the inverse of a solution).
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+        target_length: See solve() of solver.py
+        time_budget: See solve() of solver.py
+
+    Returns:
+        A string containing the moves of the scramble
+    """
+    return "".join(v6.MOVES[move] for move in invert_moves(solver.solve(state, target_length, time_budget)))
+
+
+def random_state_scramble(rng=random, target_length=SCRAMBLE_TARGET_LENGTH, time_budget=v6.TIME_BUDGET):
+    """Returns a random state scramble (see state_scramble() and random_state() of v6.py)."""
+    return state_scramble(v6.random_state(rng), target_length, time_budget)
+
+
+def state_scrambles(states):
+    """Returns a list with the scrambles of a list of states (see state_scramble(), one task of a worker)."""
+    return [state_scramble(state) for state in states]
+
+
+def generate_scrambles(n, kind="state", seed=None, workers=None, length=SCRAMBLE_LENGTH):
+    """Generates scrambles in the order of their random numbers (the same seed gives the same scrambles).
+
+    Args:
+        n: An integer with the number of scrambles
+        kind: A string with the kind of scrambles ("state" or "moves")
+        seed: Any value accepted by random.seed() (optional, a random seed is used)
+        workers: An integer with the number of worker processes solving the random states (optional, solved in this process if None)
+        length: An integer with the number of moves of random move scrambles
+
+    Yields:
+        Strings containing the moves of the scrambles
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown kind of scramble: {kind} (expected one of {KINDS})")
+    rng = random.Random(seed)
+    if kind == "moves":
+        for i in range(n):
+            yield random_move_scramble(length, rng)
+    elif workers is None:
+        for i in range(n):
+            yield random_state_scramble(rng)
+    else:
+        # the states are drawn here, so the scrambles do not depend on the number of workers
+        states = (v6.random_state(rng) for i in range(n))
+        executor = batch.get_executor(workers)
+        pending = deque()
+        while True:
+            # only a few chunks are drawn ahead, the scrambles are yielded in order as their chunks are finished
+            while len(pending) < PENDING_PER_WORKER*workers:
+                chunk = list(itertools.islice(states, CHUNK_SIZE))
+                if not chunk:
+                    break
+                pending.append(executor.submit(state_scrambles, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def write_scrambles(file, n, kind="state", seed=None, workers=None, length=SCRAMBLE_LENGTH):
+    """Writes scrambles (see generate_scrambles()) to a file, one per line, as soon as they are generated.
+
+    Args:
+        file: A file object opened for writing
+        n, kind, seed, workers, length: See generate_scrambles()
+
+    Returns:
+        An integer with the number of scrambles written
+    """
+    written = 0
+    for scramble in generate_scrambles(n, kind, seed, workers, length):
+        file.write(scramble+"\n")
+        written += 1
+    file.flush()
+    return written
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    kind = sys.argv[2] if len(sys.argv) > 2 else "state"
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    path = sys.argv[4] if len(sys.argv) > 4 else "-"
+    workers = int(sys.argv[5]) if len(sys.argv) > 5 else None
+    length = int(sys.argv[6]) if len(sys.argv) > 6 else SCRAMBLE_LENGTH
+
+    file = sys.stdout if path == "-" else open(path, "w")
+    starttime = time.perf_counter()
+    written = write_scrambles(file, n, kind, seed, workers, length)
+    seconds = time.perf_counter() - starttime
+    print(f"{written} scrambles, {written/seconds:.0f} scrambles per second (Time used: {seconds} seconds)", file=sys.stderr)
+    if file is not sys.stdout:
+        file.close()
+    batch.shutdown()
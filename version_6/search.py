@@ -0,0 +1,348 @@
+"""Searches for the two steps of the solving process
+
+Both steps are solved with IDA* on coordinates (see coordinates.py): a
+depth-first search with an increasing limit of moves, where every move is a
+lookup in the move tables (tables.py) and every branch is cut as soon as the
+pruning tables (pruning.py) show that the cube cannot be solved with the moves
+left.
+
+Only the move sequences allowed by the automatons of automaton.py are searched:
+no two moves on the same layer in a row, opposite layers only in one order and
+no longer sequences that are equal to shorter or earlier ones. The automaton
+state after the moves so far is an integer, so no strings are compared. If the
+start position is symmetric (see symmetry.py), only one of every class of
+symmetric first moves is searched. A transposition table (see transposition.py)
+can be passed to skip states that have already been searched.
+
+A SearchStats object (see search_stats.py) can be passed to count what a search
+does. The search is then built by counting_node_search() instead, which counts
+the same tree with slower, generic code, so the searches without counters are
+not slowed down at all.
+
+The depth-first searches are built by step1_node_search() and
+step2_node_search(), so that parallel.py can run the subtrees of the first
+moves in other processes.
+"""
+
+
+
+import v6
+import tables
+import pruning
+import symmetry
+import automaton
+import coordinates
+import search_stats
+
+# number of expanded nodes after which the "stop" function of a search is checked
+STOP_INTERVAL = 1024
+
+# names of the move tables of the coordinates of every step
+STEP_MOVE_TABLES = {
+    "step1": ["twist", "flip", "slice"],
+    "step2": ["corner_permutation", "ud_edge_permutation", "slice_sorted"],
+}
+# numbers of values of the coordinates of every step
+STEP_SIZES = {
+    "step1": (coordinates.N_TWIST, coordinates.N_FLIP, coordinates.N_SLICE),
+    "step2": (coordinates.N_CORNER_PERMUTATION, coordinates.N_UD_EDGE_PERMUTATION, coordinates.N_SLICE_PERMUTATION),
+}
+# automatons of the moves of every step (see automaton.py)
+STEP_AUTOMATONS = {"step1": "all_moves", "step2": "step2_moves"}
+
+
+def step1_distance(twist, flip, slice):
+    """Returns the number of moves needed to complete step 1 (from the symmetry-reduced pruning table, see pruning.py)."""
+    flipslice = coordinates.N_FLIP*slice + flip
+    flipslice_class = symmetry.get_symmetry_table("flipslice_class")
+    flipslice_symmetry = symmetry.get_symmetry_table("flipslice_symmetry")
+    twist_symmetry = symmetry.get_symmetry_table("twist_symmetry")
+    return pruning.get_pruning_table("flipslice_twist")[coordinates.N_TWIST*flipslice_class[flipslice] + twist_symmetry[48*twist+flipslice_symmetry[flipslice]]]
+
+
+def transposition_key(coordinate, automaton_state):
+    """Returns the key of a state for a transposition table.
+
+    The moves allowed next depend on the state of the automaton (see automaton.py), so it is part of the key.
+
+    Args:
+        coordinate: An integer describing the state
+        automaton_state: An integer with the state of the automaton after the previous moves (the automatons have fewer than 2**16 states)
+
+    Returns:
+        An integer
+    """
+    return (coordinate << 16) + automaton_state
+
+
+def iterative_deepening(search, first_depth, depth, solution, expanded, nodes_per_depth=None):
+    """Runs a depth-first search once for every limit of moves from "first_depth" to "depth" and stops at the first solution.
+
+    Args:
+        search: A function searching with a given limit of moves, returning True (and filling "solution") if a solution has been found
+        first_depth: An integer with the smallest limit of moves (the lower bound of the pruning tables for the start position, as no smaller limit can succeed)
+        depth: An integer with the largest limit of moves
+        solution: The list "search" stores the moves of the solution in
+        expanded: A list with one integer "search" increases for every node it expands
+        nodes_per_depth: A dictionary the number of nodes expanded with every limit of moves is stored in (optional)
+
+    Returns:
+        The list "solution" / None if there is no solution with at most "depth" moves
+    """
+    for togo in range(first_depth, depth+1):
+        expanded[0] = 0
+        found = search(togo)
+        if nodes_per_depth is not None:
+            nodes_per_depth[togo] = expanded[0]
+        if found:
+            return solution
+    return None
+
+
+def step2_distance(corner_permutation, ud_edge_permutation, slice_permutation):
+    """Returns a lower bound of the number of moves needed to complete step 2 (from the pruning tables, see pruning.py)."""
+    n_slice_permutation = coordinates.N_SLICE_PERMUTATION
+    corner_slice = pruning.get_pruning_table("corner_slice_permutation")
+    edge_slice = pruning.get_pruning_table("edge_slice_permutation")
+    return max(corner_slice[corner_permutation*n_slice_permutation+slice_permutation], edge_slice[ud_edge_permutation*n_slice_permutation+slice_permutation])
+
+
+def apply_step_move(step, step_coordinates, move):
+    """Returns the coordinates of a step (a key of STEP_MOVE_TABLES) after a move as a tuple."""
+    return tuple(tables.get_move_table(name)[18*coordinate+move] for name, coordinate in zip(STEP_MOVE_TABLES[step], step_coordinates))
+
+
+def counting_node_search(distance, apply_move, key, successors, n_moves, solution, expanded, stats, transposition_table=None):
+    """Builds a depth-first search that visits the same nodes as the searches of the steps and counts everything it does.
+
+    The coordinates of a node are a tuple and the lower bound, the moves and the key for the transposition table are functions, so one search works for every step (and for optimal.py), but it is much slower. It is only built if counters are wanted.
+
+    Args:
+        distance: A function returning the lower bound of the moves needed for a tuple of coordinates
+        apply_move: A function returning the tuple of coordinates after a move (index in MOVES)
+        key: A function returning the integer describing a tuple of coordinates for the transposition table
+        successors: The successors of the automaton of the moves of the search (see get_successors() of automaton.py)
+        n_moves: An integer with the number of moves of the search
+        solution: See step1_node_search()
+        expanded: See step1_node_search()
+        stats: A SearchStats object the counters are added to
+        transposition_table: A TranspositionTable (optional)
+
+    Returns:
+        A function search(values, togo, state, moves=None) working like the search of step1_node_search() on the tuple of coordinates "values" (the first moves "moves" have to be given for the start position)
+    """
+    # limit of moves and length of the solution at the start position
+    start = [0, 0]
+
+    def search(values, togo, state, moves=None):
+        if moves is not None:
+            start[0], start[1] = togo, len(solution)
+        stats.count_node(len(solution)-start[1], start[0])
+        if distance(values) > togo:
+            stats.count_prune(search_stats.PRUNING_TABLE)
+            return False
+        if togo == 0:
+            stats.solved_checks += 1
+            return True
+        if transposition_table is not None:
+            node_key = transposition_key(key(values), state)
+            if transposition_table.probe(node_key, togo):
+                stats.count_prune(search_stats.TRANSPOSITION_TABLE)
+                return False
+        expanded[0] += 1
+        next_moves = successors[state] if moves is None else moves
+        stats.count_prune(search_stats.AUTOMATON if moves is None else search_stats.FIRST_MOVES, n_moves-len(next_moves))
+        for move, next_state in next_moves:
+            stats.moves += 1
+            solution.append(move)
+            if search(apply_move(values, move), togo-1, next_state):
+                return True
+            solution.pop()
+        if transposition_table is not None:
+            transposition_table.store(node_key, togo)
+        return False
+
+    return search
+
+
+def step_counting_search(step, solution, expanded, stats, transposition_table=None):
+    """Builds the counting search (see counting_node_search()) of a step ("step1" or "step2")."""
+    distance = step1_distance if step == "step1" else step2_distance
+    sizes = STEP_SIZES[step]
+    name = STEP_AUTOMATONS[step]
+    return counting_node_search(lambda values: distance(*values), lambda values, move: apply_step_move(step, values, move), lambda values: (values[0]*sizes[1]+values[1])*sizes[2]+values[2], automaton.get_successors(name), len(automaton.AUTOMATON_DEFINITIONS[name][0]), solution, expanded, stats, transposition_table)
+
+
+def step1_node_search(solution, expanded, transposition_table=None, stop=None):
+    """Builds the depth-first search of step 1.
+
+    Args:
+        solution: A list the search stores the moves of the solution in (the moves are appended to the moves already in the list)
+        expanded: A list with one integer the search increases for every node it expands
+        transposition_table: A TranspositionTable used only for searches of step 1 (optional)
+        stop: A function checked every STOP_INTERVAL expanded nodes, the search returns True without a solution as soon as it returns True (optional)
+
+    Returns:
+        A function search(twist, flip, slice, togo, state, moves=None) searching a solution with exactly "togo" moves from the given coordinates and automaton state (or with the first moves "moves", a list of tuples (move, state after the move)), returning True if a solution has been found
+    """
+    twist_move = tables.get_move_table("twist")
+    flip_move = tables.get_move_table("flip")
+    slice_move = tables.get_move_table("slice")
+    flipslice_class = symmetry.get_symmetry_table("flipslice_class")
+    flipslice_symmetry = symmetry.get_symmetry_table("flipslice_symmetry")
+    twist_symmetry = symmetry.get_symmetry_table("twist_symmetry")
+    flipslice_twist = pruning.get_pruning_table("flipslice_twist")
+    n_flip, n_twist, n_slice = coordinates.N_FLIP, coordinates.N_TWIST, coordinates.N_SLICE
+    successors = automaton.get_successors("all_moves")
+
+    def search(twist, flip, slice, togo, state, moves=None):
+        flipslice = n_flip*slice+flip
+        if flipslice_twist[n_twist*flipslice_class[flipslice]+twist_symmetry[48*twist+flipslice_symmetry[flipslice]]] > togo:
+            return False
+        if togo == 0:
+            return True
+        if transposition_table is not None:
+            key = transposition_key((twist*n_flip+flip)*n_slice+slice, state)
+            if transposition_table.probe(key, togo):
+                return False
+        expanded[0] += 1
+        if stop is not None and expanded[0] % STOP_INTERVAL == 0 and stop():
+            return True
+        for move, next_state in (successors[state] if moves is None else moves):
+            solution.append(move)
+            if search(twist_move[18*twist+move], flip_move[18*flip+move], slice_move[18*slice+move], togo-1, next_state):
+                return True
+            solution.pop()
+        if transposition_table is not None:
+            transposition_table.store(key, togo)
+        return False
+
+    return search
+
+
+def step1_first_moves(twist, flip, slice, prev_move="  "):
+    """Returns the first moves of a search of step 1 as a list of tuples (move, state of the automaton after the move), see first_successors() of automaton.py."""
+    symmetries = ()
+    if prev_move == "  ":
+        state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+        coordinates.set_twist(state, twist)
+        coordinates.set_flip(state, flip)
+        coordinates.set_slice(state, slice)
+        symmetries = symmetry.stabilizer(state, symmetry.UD_SYMMETRIES, key=lambda state: (coordinates.get_twist(state), coordinates.get_flip(state), coordinates.get_slice(state)))
+    return automaton.first_successors("all_moves", prev_move, symmetries)
+
+
+def step1_search(twist, flip, slice, depth, prev_move="  ", nodes_per_depth=None, transposition_table=None, stats=None):
+    """Searches the shortest solution of step 1 with at most "depth" moves.
+
+    The limit of moves starts at the lower bound of the pruning table and is increased by one until a solution is found. Every limit is searched only once and the search stops at the first solution, which is a shortest one. As the pruning table of step 1 stores the exact number of moves needed, the first limit already succeeds.
+
+    Args:
+        twist: An integer with the twist coordinate
+        flip: An integer with the flip coordinate
+        slice: An integer with the slice coordinate
+        depth: An integer describing the maximum number of moves in a row to consider
+        prev_move: See recursive_solving() of CubeStep1
+        nodes_per_depth: A dictionary the number of nodes expanded with every limit of moves is stored in (optional)
+        transposition_table: A TranspositionTable used only for searches of step 1 (optional)
+        stats: A SearchStats object the counters of the search are added to (optional, see counting_node_search())
+
+    Returns:
+        A list with the indices (in MOVES) of the moves of the solution / None if there is no solution with at most "depth" moves
+    """
+    solution = []
+    expanded = [0]
+    first_moves = step1_first_moves(twist, flip, slice, prev_move)
+    first_depth = step1_distance(twist, flip, slice)
+    if stats is not None:
+        counting_search = step_counting_search("step1", solution, expanded, stats, transposition_table)
+        return iterative_deepening(lambda togo: counting_search((twist, flip, slice), togo, automaton.START, first_moves), first_depth, depth, solution, expanded, nodes_per_depth)
+    search = step1_node_search(solution, expanded, transposition_table)
+    return iterative_deepening(lambda togo: search(twist, flip, slice, togo, automaton.START, first_moves), first_depth, depth, solution, expanded, nodes_per_depth)
+
+
+def step2_node_search(solution, expanded, transposition_table=None, stop=None):
+    """Builds the depth-first search of step 2 (see step1_node_search()).
+
+    Returns:
+        A function search(corner_permutation, ud_edge_permutation, slice_permutation, togo, state, moves=None) working like the search of step1_node_search()
+    """
+    corner_move = tables.get_move_table("corner_permutation")
+    edge_move = tables.get_move_table("ud_edge_permutation")
+    slice_move = tables.get_move_table("slice_sorted")
+    corner_slice = pruning.get_pruning_table("corner_slice_permutation")
+    edge_slice = pruning.get_pruning_table("edge_slice_permutation")
+    n_slice_permutation, n_ud_edge_permutation = coordinates.N_SLICE_PERMUTATION, coordinates.N_UD_EDGE_PERMUTATION
+    successors = automaton.get_successors("step2_moves")
+
+    def search(corner_permutation, ud_edge_permutation, slice_permutation, togo, state, moves=None):
+        distance = max(corner_slice[corner_permutation*n_slice_permutation+slice_permutation], edge_slice[ud_edge_permutation*n_slice_permutation+slice_permutation])
+        if distance > togo:
+            return False
+        if togo == 0:
+            return True
+        if transposition_table is not None:
+            key = transposition_key((corner_permutation*n_ud_edge_permutation+ud_edge_permutation)*n_slice_permutation+slice_permutation, state)
+            if transposition_table.probe(key, togo):
+                return False
+        expanded[0] += 1
+        if stop is not None and expanded[0] % STOP_INTERVAL == 0 and stop():
+            return True
+        for move, next_state in (successors[state] if moves is None else moves):
+            solution.append(move)
+            if search(corner_move[18*corner_permutation+move], edge_move[18*ud_edge_permutation+move], slice_move[18*slice_permutation+move], togo-1, next_state):
+                return True
+            solution.pop()
+        if transposition_table is not None:
+            transposition_table.store(key, togo)
+        return False
+
+    return search
+
+
+def step2_first_moves(corner_permutation, ud_edge_permutation, slice_permutation, prev_move="  "):
+    """Returns the first moves of a search of step 2 (see step1_first_moves())."""
+    symmetries = ()
+    if prev_move == "  ":
+        state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+        coordinates.set_corner_permutation(state, corner_permutation)
+        coordinates.set_ud_edge_permutation(state, ud_edge_permutation)
+        state[32::2] = [edge+8 for edge in coordinates.coordinate_to_permutation(slice_permutation, 4)]
+        symmetries = symmetry.stabilizer(state, symmetry.UD_SYMMETRIES)
+    return automaton.first_successors("step2_moves", prev_move, symmetries)
+
+
+def step2_search(corner_permutation, ud_edge_permutation, slice_permutation, depth, prev_move="  ", nodes_per_depth=None, transposition_table=None, stats=None):
+    """Searches the shortest solution of step 2 with at most "depth" moves (U, D, F2, B2, R2, L2).
+
+    The limit of moves is increased the same way as in step1_search().
+
+    Args:
+        corner_permutation: An integer with the corner permutation coordinate
+        ud_edge_permutation: An integer with the permutation coordinate of the edges in the top and bottom layer
+        slice_permutation: An integer with the slice permutation coordinate
+        depth: An integer describing the maximum number of moves in a row to consider
+        prev_move: See recursive_solving() of CubeStep2
+        nodes_per_depth: A dictionary the number of nodes expanded with every limit of moves is stored in (optional)
+        transposition_table: A TranspositionTable used only for searches of step 2 (optional)
+        stats: A SearchStats object the counters of the search are added to (optional, see counting_node_search())
+
+    Returns:
+        A list with the indices (in MOVES) of the moves of the solution / None if there is no solution with at most "depth" moves
+    """
+    solution = []
+    expanded = [0]
+    first_moves = step2_first_moves(corner_permutation, ud_edge_permutation, slice_permutation, prev_move)
+    first_depth = step2_distance(corner_permutation, ud_edge_permutation, slice_permutation)
+    if stats is not None:
+        counting_search = step_counting_search("step2", solution, expanded, stats, transposition_table)
+        return iterative_deepening(lambda togo: counting_search((corner_permutation, ud_edge_permutation, slice_permutation), togo, automaton.START, first_moves), first_depth, depth, solution, expanded, nodes_per_depth)
+    search = step2_node_search(solution, expanded, transposition_table)
+    return iterative_deepening(lambda togo: search(corner_permutation, ud_edge_permutation, slice_permutation, togo, automaton.START, first_moves), first_depth, depth, solution, expanded, nodes_per_depth)
+
+
+def step2_coordinates(state):
+    """Returns the coordinates of step 2 (corner permutation, edge permutation, slice permutation) of a cube in the linear cubie method / None if step 1 is not completed."""
+    if coordinates.get_twist(state) or coordinates.get_flip(state) or coordinates.get_slice(state):
+        return None
+    return coordinates.get_corner_permutation(state), coordinates.get_ud_edge_permutation(state), coordinates.get_slice_permutation(state)
@@ -0,0 +1,88 @@
+"""Counters of a search
+
+A SearchStats object passed to a search (recursive_solving() of CubeStep1 and
+CubeStep2, solve() of optimal.py) collects how the search spent its time: the
+nodes visited, the solved checks, the moves applied and the moves or nodes cut
+by every rule, in total and per depth of the node (number of moves from the
+start). Without a SearchStats object the searches run without any counters (see
+counting_node_search() of search.py), so the counters cost nothing unless they
+are used.
+
+The effective branching factor b* is the branching factor a uniform tree of the
+depth of the search would need to have as many nodes: 1 + b* + b*^2 + ... +
+b*^d = nodes visited.
+"""
+
+
+
+# rules cutting the search
+PRUNING_TABLE = "pruning_table"     # nodes whose lower bound (pruning tables) exceeds the moves left
+TRANSPOSITION_TABLE = "transposition_table"     # nodes already searched with as many moves left (see transposition.py)
+AUTOMATON = "automaton"     # moves not tried because they make the move sequence redundant (see automaton.py)
+FIRST_MOVES = "first_moves"     # first moves not tried because of the previous moves or the symmetry of the start position
+
+
+class SearchStats():
+    """Counters of one or more searches.
+
+    Attributes:
+        nodes: An integer with the number of nodes visited (every node is checked against the pruning tables)
+        solved_checks: An integer with the number of nodes checked for being solved (nodes with no moves left that passed the pruning tables)
+        moves: An integer with the number of moves applied
+        prunes: A dictionary with the number of nodes or moves cut by every rule (see the constants of this file)
+        nodes_per_depth: A dictionary with the number of nodes visited at every depth (number of moves from the start)
+        nodes_per_limit: A dictionary with the number of nodes visited with every limit of moves of IDA*
+        depth: An integer with the largest depth a node was visited at
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.solved_checks = 0
+        self.moves = 0
+        self.prunes = {}
+        self.nodes_per_depth = {}
+        self.nodes_per_limit = {}
+        self.depth = 0
+
+    def count_node(self, depth, limit=None):
+        """Counts a node visited at the given depth (and with the given limit of moves)."""
+        self.nodes += 1
+        self.nodes_per_depth[depth] = self.nodes_per_depth.get(depth, 0) + 1
+        if limit is not None:
+            self.nodes_per_limit[limit] = self.nodes_per_limit.get(limit, 0) + 1
+        if depth > self.depth:
+            self.depth = depth
+
+    def count_prune(self, rule, n=1):
+        """Counts n nodes or moves cut by a rule."""
+        if n:
+            self.prunes[rule] = self.prunes.get(rule, 0) + n
+
+    def effective_branching_factor(self):
+        """Returns the effective branching factor (see above) / None if no node below the start was visited."""
+        if self.depth == 0:
+            return None
+        low, high = 0.0, float(self.nodes)
+        for i in range(100):
+            middle = (low+high) / 2
+            if sum(middle**depth for depth in range(self.depth+1)) < self.nodes:
+                low = middle
+            else:
+                high = middle
+        return (low+high) / 2
+
+    def as_dict(self):
+        """Returns all counters and the effective branching factor as a dictionary (e.g. for saving as JSON)."""
+        return {
+            "nodes": self.nodes,
+            "solved_checks": self.solved_checks,
+            "moves": self.moves,
+            "prunes": dict(self.prunes),
+            "nodes_per_depth": dict(sorted(self.nodes_per_depth.items())),
+            "nodes_per_limit": dict(sorted(self.nodes_per_limit.items())),
+            "depth": self.depth,
+            "effective_branching_factor": self.effective_branching_factor(),
+        }
+
+    def __repr__(self):
+        return f"SearchStats({self.as_dict()})"
@@ -0,0 +1,131 @@
+"""Two-phase solver
+
+Solves a whole cube with the two steps of the solving process (two-phase
+algorithm by Herbert Kociemba): every solution of step 1 (in order of
+increasing length) is completed with the shortest solution of step 2 that is
+shorter than the best total solution found so far. The search continues with
+longer solutions of step 1 (which often lead to shorter total solutions) until
+the solution is short enough or the time is up.
+
+Usage: python solver.py [scramble] [target length] [time budget in seconds]
+"""
+
+
+
+import sys
+import time
+
+import v6
+import tables
+import pruning
+import search
+import symmetry
+import automaton
+import coordinates
+
+STEP2_MOVE_SET = set(pruning.STEP2_MOVES)
+
+# maximum number of moves of step 2: long searches of step 2 are avoided, as longer solutions of step 1 with a short step 2 are found faster (the full depth is only used if this finds no solution at all)
+STEP2_DEPTH_LIMIT = 11
+
+
+def solve(state, target_length=v6.TARGET_LENGTH, time_budget=v6.TIME_BUDGET):
+    """Solves a cube with the two-phase algorithm.
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+        target_length: An integer with the number of moves at which a solution is good enough to stop searching
+        time_budget: A float with the number of seconds after which the best solution found so far is returned (the search always continues until a first solution is found)
+
+    Returns:
+        A list with the indices (in MOVES) of the moves of the shortest solution found
+    """
+    starttime = time.time()
+    twist_move = tables.get_move_table("twist")
+    flip_move = tables.get_move_table("flip")
+    slice_move = tables.get_move_table("slice")
+    flipslice_class = symmetry.get_symmetry_table("flipslice_class")
+    flipslice_symmetry = symmetry.get_symmetry_table("flipslice_symmetry")
+    twist_symmetry = symmetry.get_symmetry_table("twist_symmetry")
+    flipslice_twist = pruning.get_pruning_table("flipslice_twist")
+    n_flip, n_twist = coordinates.N_FLIP, coordinates.N_TWIST
+    successors = automaton.get_successors("all_moves")
+
+    solution = []
+    best = [None]
+    step2_limit = [STEP2_DEPTH_LIMIT]
+    expanded = [0]
+
+    def step2():
+        """Completes the current solution of step 1 with step 2. Returns True if the search should stop."""
+        step2_state = state
+        for move in solution:
+            step2_state = v6.apply_move(step2_state, move)
+        depth = step2_limit[0] if best[0] is None else min(step2_limit[0], len(best[0])-len(solution)-1)
+        prev_move = "".join(v6.MOVES[move][0] for move in solution[:-3:-1]).ljust(2)
+        solution_2 = search.step2_search(*search.step2_coordinates(step2_state), depth, prev_move)
+        if solution_2 is not None:
+            best[0] = solution + solution_2
+            if len(best[0]) <= target_length:
+                return True
+        # a search of step 2 takes much longer than reading the clock, so the time is checked after every one
+        return best[0] is not None and time.time()-starttime > time_budget
+
+    def step1(twist, flip, slice, togo, automaton_state, moves=None):
+        flipslice = n_flip*slice+flip
+        if flipslice_twist[n_twist*flipslice_class[flipslice]+twist_symmetry[48*twist+flipslice_symmetry[flipslice]]] > togo:
+            return False
+        # the clock is only read every STOP_INTERVAL nodes
+        expanded[0] += 1
+        if best[0] is not None and expanded[0] % search.STOP_INTERVAL == 0 and time.time()-starttime > time_budget:
+            return True
+        if togo == 0:
+            # a solution ending with a move of step 2 was already completed as a shorter solution of step 1
+            if solution and solution[-1] in STEP2_MOVE_SET:
+                return False
+            return step2()
+        for move, next_state in (successors[automaton_state] if moves is None else moves):
+            solution.append(move)
+            if step1(twist_move[18*twist+move], flip_move[18*flip+move], slice_move[18*slice+move], togo-1, next_state):
+                return True
+            solution.pop()
+        return False
+
+    twist, flip, slice = coordinates.get_twist(state), coordinates.get_flip(state), coordinates.get_slice(state)
+    first_depth = search.step1_distance(twist, flip, slice)
+    # the moves of a symmetric cube leading to symmetric cubes have solutions of the same lengths
+    first_moves = automaton.first_successors("all_moves", symmetries=symmetry.stabilizer(state, symmetry.UD_SYMMETRIES))
+    for limit in [STEP2_DEPTH_LIMIT, v6.MAX_DEPTH_STEP2]:
+        step2_limit[0] = limit
+        for togo in range(first_depth, v6.MAX_DEPTH_STEP1+1):
+            if best[0] is not None and togo >= len(best[0]):
+                break
+            if step1(twist, flip, slice, togo, automaton.START, first_moves):
+                break
+        if best[0] is not None:
+            break
+    return best[0]
+
+
+def solve_scramble(scramble, target_length=v6.TARGET_LENGTH, time_budget=v6.TIME_BUDGET):
+    """Solves a cube scrambled with the given moves (see solve()).
+
+    Args:
+        scramble: A string with the moves of the scramble (see turn() of CubeStep2)
+
+    Returns:
+        A string containing the moves of the shortest solution found
+    """
+    cube = v6.generate_cube()
+    cube.turn(scramble)
+    return "".join(v6.MOVES[move] for move in solve(cube.get_cube_state(), target_length, time_budget))
+
+
+if __name__ == "__main__":
+    scramble = sys.argv[1] if len(sys.argv) > 1 else "R'U2F_D_L_U2R2"
+    target_length = int(sys.argv[2]) if len(sys.argv) > 2 else v6.TARGET_LENGTH
+    time_budget = float(sys.argv[3]) if len(sys.argv) > 3 else v6.TIME_BUDGET
+
+    starttime = time.time()
+    solution = solve_scramble(scramble, target_length, time_budget)
+    print(f"Solution with {len(solution)//2} moves: {solution} (Time used: {time.time()-starttime} seconds)")
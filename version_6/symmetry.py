@@ -0,0 +1,260 @@
+"""Symmetries of the cube
+
+The cube has 48 symmetries: the 24 rotations of the whole cube, each with and
+without a mirror image. A symmetry S turns a state X into its conjugate
+S X S^-1: the whole cube is rotated (or mirrored) and the colors are renamed, so
+that the solved cube stays solved. Every move becomes another move this way
+(MOVE_CONJUGATION), so conjugate states need the same number of moves to be
+solved and a table only has to store one state of every class of symmetric
+states.
+
+The symmetries are derived from the positions of the stickers in space (the
+same positions the 3D viewers draw) and CUBIE_FACELETS of v6.py, so they follow
+the cubie model without any hand-written tables.
+
+Symmetry tables (saved like the move tables of tables.py):
+twist_symmetry: twist coordinate of the conjugate of every twist under every symmetry (48*twist+symmetry), valid without the corner permutation for the 16 symmetries keeping the U-D axis
+flipslice_class, flipslice_symmetry: the symmetry-coordinate of the flipslice coordinate (2048*slice+flip) under these 16 symmetries, i.e. the number of its class and a symmetry turning it into the representative of the class (the smallest flipslice coordinate of the class)
+flipslice_representative: the flipslice coordinate of the representative of every class
+"""
+
+
+
+import itertools
+
+import numpy as np
+
+import v6
+import tables
+import coordinates
+
+N_SYMMETRIES = 48
+N_FLIPSLICE = coordinates.N_SLICE*coordinates.N_FLIP
+N_FLIPSLICE_CLASSES = 64430
+
+
+def generate_symmetry_matrices():
+    """Returns the 48 symmetries as tuples (axes, signs): the new coordinate i is signs[i] times the old coordinate axes[i]. The identity comes first."""
+    return [(axes, signs) for axes in itertools.permutations(range(3)) for signs in itertools.product((1, -1), repeat=3)]
+
+SYMMETRY_MATRICES = generate_symmetry_matrices()
+
+
+def derive_symmetry(matrix):
+    """Derives the effect of a symmetry on the cubies from the positions of their stickers.
+
+    Args:
+        matrix: A tuple (axes, signs) of SYMMETRY_MATRICES
+
+    Returns:
+        A tuple containing:
+            A list with the position every corner position is moved to
+            A list with the sticker (0-2) the first sticker of every corner position is moved to
+            A list with the position every edge position is moved to
+            A list with the sticker (0-1) the first sticker of every edge position is moved to
+            A boolean indicating if the symmetry is a mirror image (which reverses the direction of corner rotations)
+    """
+    axes, signs = matrix
+    stickers = {}
+    for kind in range(2):
+        for position, facelets in enumerate(v6.CUBIE_FACELETS[kind]):
+            for index, facelet in enumerate(facelets):
+                stickers[v6.sticker_position(*facelet)] = (kind, position, index)
+
+    inversions = sum(axes[i] > axes[j] for i in range(3) for j in range(i+1, 3))
+    mirrored = (-1)**inversions * signs[0]*signs[1]*signs[2] < 0
+
+    result = []
+    for kind, n in [(0, 3), (1, 2)]:
+        new_positions = []
+        rotations = []
+        for facelets in v6.CUBIE_FACELETS[kind]:
+            targets = []
+            for facelet in facelets:
+                point = v6.sticker_position(*facelet)
+                targets.append(stickers[tuple(signs[i]*point[axes[i]] for i in range(3))])
+            new_positions.append(targets[0][1])
+            rotations.append(targets[0][2])
+            # the stickers of a position stay together and keep (or reverse if mirrored) their cyclic order
+            for index, target in enumerate(targets):
+                assert target[:2] == (kind, targets[0][1])
+                assert target[2] == ((targets[0][2]-index) % n if mirrored else (targets[0][2]+index) % n)
+        result += [new_positions, rotations]
+    return result[0], result[1], result[2], result[3], mirrored
+
+SYMMETRIES = [derive_symmetry(matrix) for matrix in SYMMETRY_MATRICES]
+
+# the 16 symmetries keeping the axis through the top and bottom layer (the moves U and D stay moves U and D)
+UD_SYMMETRIES = [s for s, (axes, signs) in enumerate(SYMMETRY_MATRICES) if axes[1] == 1]
+
+
+def conjugate(state, symmetry):
+    """Returns the conjugate S X S^-1 of a state X under a symmetry S.
+
+    A cubie c with rotation o in position p becomes the cubie S(c) in position S(p). Its rotation changes by the difference of the stickers the two positions are turned to (and changes its direction if S is a mirror image).
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+        symmetry: An integer with the index of the symmetry in SYMMETRIES
+
+    Returns:
+        A new list containing the conjugate in the linear cubie method
+    """
+    corner_positions, corner_rotations, edge_positions, edge_rotations, mirrored = SYMMETRIES[symmetry]
+    sign = -1 if mirrored else 1
+    new_state = [0 for i in range(40)]
+    for position in range(8):
+        cubie = state[2*position]
+        new_position = corner_positions[position]
+        new_state[2*new_position] = corner_positions[cubie]
+        new_state[2*new_position+1] = (sign*state[2*position+1] + corner_rotations[position] - corner_rotations[cubie]) % 3
+    for position in range(12):
+        cubie = state[16+2*position]
+        new_position = edge_positions[position]
+        new_state[16+2*new_position] = edge_positions[cubie]
+        new_state[17+2*new_position] = (state[17+2*position] + edge_rotations[position] - edge_rotations[cubie]) % 2
+    return new_state
+
+
+def find_symmetry(matrix):
+    """Returns the index of a symmetry given as (axes, signs) in SYMMETRIES."""
+    return SYMMETRY_MATRICES.index(matrix)
+
+
+def generate_inverse_symmetries():
+    """Returns a list with the index of the inverse of every symmetry (the transposed matrix)."""
+    inverses = []
+    for axes, signs in SYMMETRY_MATRICES:
+        inverse_axes = tuple(axes.index(i) for i in range(3))
+        inverses.append(find_symmetry((inverse_axes, tuple(signs[axes.index(i)] for i in range(3)))))
+    return inverses
+
+INVERSE_SYMMETRIES = generate_inverse_symmetries()
+
+
+def generate_move_conjugation():
+    """Returns a list with one list per symmetry containing the move every move becomes when it is conjugated with the symmetry."""
+    move_states = [v6.apply_move(v6.SOLVED_STATE_CUBIE_LINEAR, move) for move in range(18)]
+    return [[move_states.index(conjugate(move_state, symmetry)) for move_state in move_states] for symmetry in range(N_SYMMETRIES)]
+
+MOVE_CONJUGATION = generate_move_conjugation()
+
+
+def stabilizer(state, symmetries=range(N_SYMMETRIES), key=None):
+    """Returns the symmetries leaving a state unchanged.
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+        symmetries: The indices of the symmetries to check
+        key: A function the state and its conjugate are compared with (e.g. the coordinates of a step), by default they are compared completely
+
+    Returns:
+        A list with the indices of the symmetries S with S X S^-1 = X
+    """
+    if key is None:
+        key = lambda state: state
+    return [s for s in symmetries if key(conjugate(state, s)) == key(state)]
+
+
+def first_moves(symmetries):
+    """Returns the moves a search has to start with on a state left unchanged by the given symmetries.
+
+    If a symmetry S leaves the state unchanged, the moves m and S m S^-1 lead to conjugate states, which need the same number of moves to be solved. Only the first move of every such class of moves is kept.
+
+    Args:
+        symmetries: A list with the indices of the symmetries leaving the state unchanged (see stabilizer())
+
+    Returns:
+        A list of 18 booleans indicating for every move (in the order of MOVES) if it has to be searched
+    """
+    return [all(MOVE_CONJUGATION[s][move] >= move for s in symmetries) for move in range(18)]
+
+
+def generate_twist_symmetry_table():
+    """Generates the table twist_symmetry (see above).
+
+    Returns:
+        A dictionary with the table twist_symmetry (numpy array)
+    """
+    orientations = coordinates.all_orientations(3, 8)
+    table = np.zeros((coordinates.N_TWIST, N_SYMMETRIES), dtype=np.uint16)
+    for s, (positions, _, _, _, mirrored) in enumerate(SYMMETRIES):
+        conjugates = np.zeros_like(orientations)
+        conjugates[:, positions] = -orientations if mirrored else orientations
+        table[:, s] = coordinates.orientations_to_coordinates(conjugates, 3)
+    return {"twist_symmetry": table.reshape(-1)}
+
+
+def conjugate_flipslice():
+    """Conjugates every flipslice coordinate (2048*slice+flip) with the 16 symmetries keeping the U-D axis.
+
+    These symmetries keep the edges of the middle layer in the middle layer and change the rotation of an edge only depending on whether it and its position belong to the middle layer, so the conjugate only depends on the flipslice coordinate.
+
+    Returns:
+        A numpy array of shape (1013760, 16) with the flipslice coordinate of the conjugates (in the order of UD_SYMMETRIES)
+    """
+    slice_positions = np.zeros((coordinates.N_SLICE, 12), dtype=np.int64)
+    for slice in range(coordinates.N_SLICE):
+        slice_positions[slice, coordinates.slice_to_positions(slice)] = 1
+    slice_of_mask = np.zeros(1 << 12, dtype=np.int64)
+    slice_of_mask[slice_positions @ (1 << np.arange(12))] = np.arange(coordinates.N_SLICE)
+    flips = coordinates.all_orientations(2, 12)
+
+    conjugates = np.zeros((N_FLIPSLICE, len(UD_SYMMETRIES)), dtype=np.int64)
+    for i, s in enumerate(UD_SYMMETRIES):
+        _, _, positions, rotations, _ = SYMMETRIES[s]
+        positions, rotations = np.array(positions), np.array(rotations)
+        # rotation of the position minus rotation of the cubie in it (rotations[8] for the edges of the middle layer, rotations[0] for the others)
+        offsets = rotations - np.where(slice_positions == 1, rotations[8], rotations[0])
+        new_slice_positions = np.zeros_like(slice_positions)
+        new_slice_positions[:, positions] = slice_positions
+        new_flips = np.zeros((coordinates.N_SLICE, coordinates.N_FLIP, 12), dtype=np.int64)
+        new_flips[:, :, positions] = flips[None, :, :] + offsets[:, None, :]
+        new_slices = slice_of_mask[new_slice_positions @ (1 << np.arange(12))]
+        conjugates[:, i] = (new_slices[:, None]*coordinates.N_FLIP + coordinates.orientations_to_coordinates(new_flips.reshape(-1, 12), 2).reshape(coordinates.N_SLICE, coordinates.N_FLIP)).reshape(-1)
+    return conjugates
+
+
+def generate_flipslice_tables():
+    """Generates the tables flipslice_class, flipslice_symmetry and flipslice_representative (see above).
+
+    Returns:
+        A dictionary with the three tables (numpy arrays)
+    """
+    conjugates = conjugate_flipslice()
+    representatives, classes = np.unique(conjugates.min(axis=1), return_inverse=True)
+    assert len(representatives) == N_FLIPSLICE_CLASSES
+    return {
+        "flipslice_class": classes.astype(np.uint16),
+        "flipslice_symmetry": np.array(UD_SYMMETRIES, dtype=np.uint8)[conjugates.argmin(axis=1)],
+        "flipslice_representative": representatives.astype(np.uint32),
+    }
+
+
+# name: (typecode, number of entries, function generating the table (and the other tables generated together with it))
+SYMMETRY_TABLE_DEFINITIONS = {
+    "twist_symmetry": ("H", coordinates.N_TWIST*N_SYMMETRIES, generate_twist_symmetry_table),
+    "flipslice_class": ("H", N_FLIPSLICE, generate_flipslice_tables),
+    "flipslice_symmetry": ("B", N_FLIPSLICE, generate_flipslice_tables),
+    "flipslice_representative": ("I", N_FLIPSLICE_CLASSES, generate_flipslice_tables),
+}
+
+
+def get_symmetry_table(name):
+    """Returns a symmetry table, loading it from the disk or generating (and saving) it on first use.
+
+    Args:
+        name: A string with the name of the table (a key of SYMMETRY_TABLE_DEFINITIONS)
+
+    Returns:
+        An array containing the table
+    """
+    if name not in tables.loaded_tables:
+        typecode, size, generate = SYMMETRY_TABLE_DEFINITIONS[name]
+        table = tables.read_table(name, typecode, size)
+        if table is None:
+            for generated_name, generated_table in generate().items():
+                tables.save_table(generated_name, generated_table)
+            table = tables.checked_table(name, tables.read_table(name, typecode, size))
+        tables.loaded_tables[name] = table
+    return tables.loaded_tables[name]
@@ -0,0 +1,218 @@
+"""Move tables of the coordinates
+
+A move table stores for every value of a coordinate (see coordinates.py) and
+every one of the 18 moves the value of the coordinate after the move, so a move
+during the search is a single lookup: table[18*coordinate+move].
+
+The tables are generated with the move engine of v6.py (which is derived from
+the turn methods), saved in the folder "tables" next to this file together with
+a checksum and only loaded when they are first needed. Running this file
+generates all the tables in advance.
+
+A memory-mapped table (see map_table()) is only checked against its checksum
+once: the size and modification time of the checked file are saved as its
+stamp, and a file that still has this stamp is used without reading it.
+
+Every file is written to a temporary file in the same folder first and then
+moved into place (see write_file()), the checksum after the table, so a process
+loading a table while another one generates it never reads a partly written
+file.
+"""
+
+
+
+import os
+import mmap
+import time
+import hashlib
+import tempfile
+from array import array
+
+import v6
+import coordinates
+
+TABLE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+# name: (number of coordinate values, function returning the coordinate of a state, function setting the coordinate of a state, moves the table is generated for)
+MOVE_TABLE_DEFINITIONS = {
+    "twist": (coordinates.N_TWIST, coordinates.get_twist, coordinates.set_twist, range(18)),
+    "flip": (coordinates.N_FLIP, coordinates.get_flip, coordinates.set_flip, range(18)),
+    "slice": (coordinates.N_SLICE, coordinates.get_slice, coordinates.set_slice, range(18)),
+    "slice_sorted": (coordinates.N_SLICE*coordinates.N_SLICE_PERMUTATION,
+                     lambda state: coordinates.get_slice(state)*coordinates.N_SLICE_PERMUTATION + coordinates.get_slice_permutation(state),
+                     lambda state, coordinate: coordinates.set_slice(state, *divmod(coordinate, coordinates.N_SLICE_PERMUTATION)), range(18)),
+    "corner_permutation": (coordinates.N_CORNER_PERMUTATION, coordinates.get_corner_permutation, coordinates.set_corner_permutation, range(18)),
+    # only the moves of step 2 keep the edges of the top and bottom layer in these layers, the other entries stay 0
+    "ud_edge_permutation": (coordinates.N_UD_EDGE_PERMUTATION, coordinates.get_ud_edge_permutation, coordinates.set_ud_edge_permutation, [move for face, moves in v6.STEP2_SOLVING_MOVES for move in moves]),
+}
+
+# tables already loaded (name: array)
+loaded_tables = {}
+
+
+class TableError(Exception):
+    """Raised if a table saved on the disk does not match its checksum even after generating it again."""
+
+
+def generate_move_table(name):
+    """Generates a move table by executing every move on a cube with every value of the coordinate.
+
+    Args:
+        name: A string with the name of the coordinate (a key of MOVE_TABLE_DEFINITIONS)
+
+    Returns:
+        An array with the coordinate after move m in position 18*coordinate+m
+    """
+    size, get_coordinate, set_coordinate, moves = MOVE_TABLE_DEFINITIONS[name]
+    table = array("H", bytes(2*18*size))
+    state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+    for coordinate in range(size):
+        set_coordinate(state, coordinate)
+        for move in moves:
+            table[18*coordinate+move] = get_coordinate(v6.apply_move(state, move))
+    return table
+
+
+def checksum(table):
+    """Returns the SHA-256 checksum of a table as a hexadecimal string."""
+    return hashlib.sha256(table.tobytes()).hexdigest()
+
+
+def file_stamp(path):
+    """Returns a string with the size and the modification time (in nanoseconds) of a file."""
+    status = os.stat(path)
+    return f"{status.st_size} {status.st_mtime_ns}"
+
+
+def write_file(path, write):
+    """Writes a file atomically: a temporary file in the same folder is written and then replaces the file.
+
+    Args:
+        path: A string with the path of the file
+        write: A function writing the content to a binary file object
+    """
+    directory, filename = os.path.split(path)
+    descriptor, temporary = tempfile.mkstemp(prefix=filename+".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(descriptor, "wb") as f:
+            write(f)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def save_stamp(name, directory=TABLE_DIRECTORY):
+    """Saves the stamp (see file_stamp()) of a table that matches its checksum."""
+    try:
+        stamp = file_stamp(os.path.join(directory, name+".bin"))
+        write_file(os.path.join(directory, name+".stamp"), lambda f: f.write(stamp.encode()))
+    except OSError:
+        pass
+
+
+def has_stamp(name, directory=TABLE_DIRECTORY):
+    """Returns True if a table was checked against its checksum and not changed since (see save_stamp())."""
+    try:
+        with open(os.path.join(directory, name+".stamp")) as f:
+            return f.read().strip() == file_stamp(os.path.join(directory, name+".bin"))
+    except OSError:
+        return False
+
+
+def save_table(name, table, directory=TABLE_DIRECTORY):
+    """Saves a table, its checksum and its stamp in the given folder (each file atomically, see write_file())."""
+    os.makedirs(directory, exist_ok=True)
+    write_file(os.path.join(directory, name+".bin"), table.tofile)
+    table_checksum = checksum(table)
+    write_file(os.path.join(directory, name+".sha256"), lambda f: f.write(table_checksum.encode()))
+    save_stamp(name, directory)
+
+
+def checked_table(name, table):
+    """Returns a table read or mapped again after generating and saving it.
+
+    Raises:
+        TableError: If the table still does not match its checksum
+    """
+    if table is None:
+        raise TableError(f"table {name} does not match its checksum after generating it again (see {TABLE_DIRECTORY})")
+    return table
+
+
+def read_table(name, typecode, size, directory=TABLE_DIRECTORY):
+    """Reads a table saved by save_table().
+
+    Args:
+        size: An integer with the number of entries the table must have / None to read the whole file
+
+    Returns:
+        An array containing the table / None if the file is missing, has the wrong size or does not match its checksum
+    """
+    try:
+        with open(os.path.join(directory, name+".sha256")) as f:
+            saved_checksum = f.read().strip()
+        table = array(typecode)
+        with open(os.path.join(directory, name+".bin"), "rb") as f:
+            if size is None:
+                table.frombytes(f.read())
+            else:
+                table.fromfile(f, size)
+            if f.read(1):
+                return None
+    except (OSError, EOFError, ValueError):
+        return None
+    if checksum(table) != saved_checksum:
+        return None
+    return table
+
+
+def map_table(name, typecode, size, directory=TABLE_DIRECTORY):
+    """Memory-maps a table saved by save_table() instead of reading it into memory.
+
+    The operating system only loads the parts of the file that are used and shares them between all processes mapping the same file, so this is the way to open the large tables. The whole file is only read to check its checksum if it has no valid stamp (see has_stamp()).
+
+    Returns:
+        A memoryview of the table (indexed like an array) / None if the file is missing, has the wrong size or does not match its checksum
+    """
+    try:
+        with open(os.path.join(directory, name+".sha256")) as f:
+            saved_checksum = f.read().strip()
+        with open(os.path.join(directory, name+".bin"), "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(mapped) != size*array(typecode).itemsize:
+        return None
+    if not has_stamp(name, directory):
+        if hashlib.sha256(mapped).hexdigest() != saved_checksum:
+            return None
+        save_stamp(name, directory)
+    return memoryview(mapped).cast(typecode)
+
+
+def get_move_table(name):
+    """Returns a move table, loading it from the disk or generating (and saving) it on first use.
+
+    Args:
+        name: A string with the name of the coordinate (a key of MOVE_TABLE_DEFINITIONS)
+
+    Returns:
+        An array with the coordinate after move m in position 18*coordinate+m
+    """
+    if name not in loaded_tables:
+        size = 18*MOVE_TABLE_DEFINITIONS[name][0]
+        table = read_table(name+"_move", "H", size)
+        if table is None:
+            table = generate_move_table(name)
+            save_table(name+"_move", table)
+        loaded_tables[name] = table
+    return loaded_tables[name]
+
+
+if __name__ == "__main__":
+    for name in MOVE_TABLE_DEFINITIONS:
+        starttime = time.time()
+        get_move_table(name)
+        print(f"Move table {name} ready (Time used: {time.time()-starttime} seconds)")
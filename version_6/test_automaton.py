@@ -0,0 +1,55 @@
+"""Tests of the automatons of the move sequences
+
+An automaton (see automaton.py) may only remove sequences that are not needed:
+every state that can be reached with k moves must still be reached with k
+moves following the automaton. This is checked up to the length of the
+redundant sequences the automatons are built from.
+"""
+
+
+
+import pytest
+
+import v6
+import automaton
+
+
+def shortest_distances(moves, length, successors=None):
+    """Returns a dictionary with the smallest number of moves (at most "length") reaching every state, with all moves or only with the moves an automaton allows."""
+    distances = {tuple(v6.SOLVED_STATE_CUBIE_LINEAR): 0}
+    layer = [(v6.SOLVED_STATE_CUBIE_LINEAR, automaton.START)]
+    for depth in range(1, length+1):
+        next_layer = []
+        for state, automaton_state in layer:
+            allowed = [(move, None) for move in moves] if successors is None else successors[automaton_state]
+            for move, next_automaton_state in allowed:
+                next_state = v6.apply_move(state, move)
+                key = tuple(next_state)
+                if successors is None:
+                    # every state once, at its smallest depth
+                    if key in distances:
+                        continue
+                    distances[key] = depth
+                else:
+                    # the automaton allows every sequence only once, so all of them are followed
+                    distances.setdefault(key, depth)
+                next_layer.append((next_state, next_automaton_state))
+        layer = next_layer
+    return distances
+
+
+@pytest.mark.parametrize("name", list(automaton.AUTOMATON_DEFINITIONS))
+def test_keeps_shortest_solutions(name):
+    moves, max_length = automaton.AUTOMATON_DEFINITIONS[name]
+    assert shortest_distances(moves, max_length, automaton.get_successors(name)) == shortest_distances(moves, max_length)
+
+
+@pytest.mark.parametrize("name", list(automaton.AUTOMATON_DEFINITIONS))
+def test_face_rules(name):
+    successors = automaton.get_successors(name)
+    for state in range(len(successors)):
+        for move, next_state in successors[state]:
+            for next_move, after in successors[next_state]:
+                face, next_face = move//3, next_move//3
+                assert next_face != face
+                assert not (next_face == face^1 and next_face < face)
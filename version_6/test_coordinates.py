@@ -0,0 +1,78 @@
+"""Tests of the coordinates
+
+The coordinates of coordinates.py must describe a cube completely: decoding
+the coordinates of a cube gives the cube again, on random states of the linear
+cubie method and of CubeStep1.
+"""
+
+
+
+import random
+import itertools
+
+import pytest
+
+import v6
+import coordinates
+
+N_CUBES = 200
+
+
+def test_solved_cube():
+    assert coordinates.encode(v6.SOLVED_STATE_CUBIE_LINEAR) == (0, 0, 0, 0)
+    assert v6.generate_cube().get_coordinates() == (0, 0, 0, 0)
+
+
+def test_encode_decode():
+    rng = random.Random(0)
+    for i in range(N_CUBES):
+        state = v6.random_state(rng)
+        assert coordinates.decode(*coordinates.encode(state)) == state
+
+
+def test_encode_decode_step1():
+    rng = random.Random(1)
+    for i in range(N_CUBES):
+        step1_state = v6.random_step1_state(rng)
+        assert coordinates.decode_step1(*coordinates.encode_step1(step1_state)) == step1_state
+
+
+def test_step1_coordinates_match():
+    rng = random.Random(2)
+    for i in range(N_CUBES):
+        state = v6.random_state(rng)
+        step1_state = v6.CubeStep2(solved=False, scramble=state).step1_cube()
+        assert coordinates.encode_step1(step1_state) == (coordinates.get_twist(state), coordinates.get_flip(state), coordinates.get_slice(state))
+
+
+@pytest.mark.parametrize("n", range(1, 7))
+def test_permutation_ranks(n):
+    permutations = list(itertools.permutations(range(n)))
+    assert [coordinates.permutation_to_coordinate(list(permutation)) for permutation in permutations] == list(range(len(permutations)))
+    for coordinate, permutation in enumerate(permutations):
+        assert coordinates.coordinate_to_permutation(coordinate, n) == list(permutation)
+
+
+@pytest.mark.parametrize("get_coordinate, set_coordinate, size", [
+    (coordinates.get_twist, coordinates.set_twist, coordinates.N_TWIST),
+    (coordinates.get_flip, coordinates.set_flip, coordinates.N_FLIP),
+    (coordinates.get_slice, coordinates.set_slice, coordinates.N_SLICE),
+    (coordinates.get_corner_permutation, coordinates.set_corner_permutation, coordinates.N_CORNER_PERMUTATION),
+    (coordinates.get_ud_edge_permutation, coordinates.set_ud_edge_permutation, coordinates.N_UD_EDGE_PERMUTATION),
+])
+def test_set_get(get_coordinate, set_coordinate, size):
+    rng = random.Random(size)
+    for coordinate in [0, size-1] + [rng.randrange(size) for i in range(N_CUBES)]:
+        state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+        set_coordinate(state, coordinate)
+        assert get_coordinate(state) == coordinate
+
+
+def test_coordinates_in_range():
+    rng = random.Random(3)
+    for i in range(N_CUBES):
+        twist, flip, corner_permutation, edge_permutation = coordinates.encode(v6.random_state(rng))
+        assert 0 <= twist < coordinates.N_TWIST
+        assert 0 <= flip < coordinates.N_FLIP
+        assert 0 <= corner_permutation < coordinates.N_CORNER_PERMUTATION
+        assert 0 <= edge_permutation < coordinates.N_EDGE_PERMUTATION
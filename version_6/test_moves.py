@@ -0,0 +1,55 @@
+"""Tests of the move engine
+
+apply_move() (see build_move_engine() of v6.py) must give the same cube as
+the turn methods of CubeStep2 and CubeStep1 for every move on any cube, not
+only on the solved cube the engine is derived from.
+"""
+
+
+
+import random
+
+import pytest
+
+import v6
+
+N_CUBES = 20
+
+
+@pytest.mark.parametrize("move", range(18))
+def test_engine_matches_turn_methods(move):
+    rng = random.Random(move)
+    for i in range(N_CUBES):
+        state = v6.random_state(rng)
+        cube = v6.CubeStep2(solved=False, scramble=state.copy())
+        getattr(cube, v6.MOVE_METHODS[move])()
+        assert v6.apply_move(state, move) == cube.get_cube_state()
+
+
+@pytest.mark.parametrize("move", range(18))
+def test_step1_engine_matches_turn_methods(move):
+    rng = random.Random(move)
+    for i in range(N_CUBES):
+        step1_state = v6.CubeStep2(solved=False, scramble=v6.random_state(rng)).step1_cube()
+        cube = v6.CubeStep1(solved=False, scramble=step1_state.copy())
+        getattr(cube, v6.MOVE_METHODS[move])()
+        assert v6.apply_move(step1_state, move, v6.STEP1_MOVE_ENGINE) == cube.get_cube_state()
+
+
+def test_apply_move_keeps_state():
+    state = v6.random_state(random.Random(0))
+    copy = state.copy()
+    v6.apply_move(state, 0)
+    assert state == copy
+
+
+def test_turn_matches_turn_methods():
+    rng = random.Random(1)
+    moves = [rng.randrange(18) for i in range(30)]
+    cube = v6.generate_cube()
+    cube.turn("".join(v6.MOVES[move] for move in moves))
+    reference = v6.generate_cube()
+    reference.get_cube_state()
+    for move in moves:
+        getattr(reference, v6.MOVE_METHODS[move])()
+    assert cube.get_cube_state() == reference.get_cube_state()
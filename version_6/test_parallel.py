@@ -0,0 +1,74 @@
+"""Tests of the parallel search
+
+The parallel search (see parallel.py) must return exactly the solution of the
+serial search: the shortest one, and of those the first one in the order of the
+serial search.
+"""
+
+
+
+import random
+
+import pytest
+
+import v6
+import search
+import parallel
+import coordinates
+
+N_CUBES = 3
+WORKERS = 2
+STEP2_MOVES = [move for face, moves in v6.STEP2_SOLVING_MOVES for move in moves]
+
+
+@pytest.fixture(scope="module", autouse=True)
+def pool():
+    yield
+    parallel.shutdown()
+
+
+def scrambled_state(rng, moves, length):
+    """Returns a solved cube turned with "length" random moves out of "moves"."""
+    state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+    for i in range(length):
+        state = v6.apply_move(state, rng.choice(moves))
+    return state
+
+
+def step1_coordinates(state):
+    return coordinates.get_twist(state), coordinates.get_flip(state), coordinates.get_slice(state)
+
+
+@pytest.mark.parametrize("seed", range(N_CUBES))
+@pytest.mark.parametrize("prev_move", ["  ", "U ", "DU"])
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_step1(seed, prev_move, split_depth):
+    values = step1_coordinates(v6.random_state(random.Random(seed)))
+    serial = search.step1_search(*values, v6.MAX_DEPTH_STEP1, prev_move)
+    assert parallel.parallel_search("step1", values, v6.MAX_DEPTH_STEP1, prev_move, workers=WORKERS, split_depth=split_depth) == serial
+
+
+@pytest.mark.parametrize("seed", range(N_CUBES))
+@pytest.mark.parametrize("prev_move", ["  ", "R ", "LR"])
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_step2(seed, prev_move, split_depth):
+    values = search.step2_coordinates(scrambled_state(random.Random(seed), STEP2_MOVES, 14))
+    serial = search.step2_search(*values, v6.MAX_DEPTH_STEP2, prev_move)
+    assert parallel.parallel_search("step2", values, v6.MAX_DEPTH_STEP2, prev_move, workers=WORKERS, split_depth=split_depth) == serial
+
+
+@pytest.mark.parametrize("split_depth", [1, 2])
+def test_short_and_missing_solutions(split_depth):
+    # a solution shorter than the split depth is found serially, none with too few moves
+    values = step1_coordinates(v6.apply_move(v6.SOLVED_STATE_CUBIE_LINEAR, 6))
+    assert parallel.parallel_search("step1", values, v6.MAX_DEPTH_STEP1, workers=WORKERS, split_depth=split_depth) == search.step1_search(*values, v6.MAX_DEPTH_STEP1)
+    values = step1_coordinates(v6.random_state(random.Random(0)))
+    assert parallel.parallel_search("step1", values, 3, workers=WORKERS, split_depth=split_depth) is None
+
+
+@pytest.mark.parametrize("seed", range(N_CUBES))
+def test_recursive_solving(seed):
+    cube = v6.CubeStep1(solved=False, scramble=v6.random_step1_state(random.Random(seed)))
+    assert cube.recursive_solving(v6.MAX_DEPTH_STEP1, workers=WORKERS) == cube.recursive_solving(v6.MAX_DEPTH_STEP1)
+    cube = v6.CubeStep2(solved=False, scramble=scrambled_state(random.Random(seed), STEP2_MOVES, 14))
+    assert cube.recursive_solving(v6.MAX_DEPTH_STEP2, workers=WORKERS) == cube.recursive_solving(v6.MAX_DEPTH_STEP2)
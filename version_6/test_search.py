@@ -0,0 +1,67 @@
+"""Tests of the searches with counters
+
+A search with a SearchStats object (see counting_node_search() of search.py)
+must search the same tree as the search without counters: the same solution
+and the same number of nodes expanded with every limit of moves.
+"""
+
+
+
+import random
+
+import pytest
+
+import v6
+import search
+import optimal
+import coordinates
+import transposition
+from search_stats import SearchStats
+
+N_CUBES = 4
+STEP2_MOVES = [move for face, moves in v6.STEP2_SOLVING_MOVES for move in moves]
+
+
+def scrambled_state(rng, moves, length):
+    """Returns a solved cube turned with "length" random moves out of "moves"."""
+    state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+    for i in range(length):
+        state = v6.apply_move(state, rng.choice(moves))
+    return state
+
+
+def step1(state, **keywords):
+    return search.step1_search(coordinates.get_twist(state), coordinates.get_flip(state), coordinates.get_slice(state), v6.MAX_DEPTH_STEP1, **keywords)
+
+
+def step2(state, **keywords):
+    return search.step2_search(*search.step2_coordinates(state), v6.MAX_DEPTH_STEP2, **keywords)
+
+
+def assert_same_search(function, state, use_transposition_table=False):
+    """Runs a search without and with counters and checks that both searched the same tree."""
+    nodes, counted_nodes = {}, {}
+    solution = function(state, nodes_per_depth=nodes, transposition_table=transposition.TranspositionTable() if use_transposition_table else None)
+    stats = SearchStats()
+    counted_solution = function(state, nodes_per_depth=counted_nodes, transposition_table=transposition.TranspositionTable() if use_transposition_table else None, stats=stats)
+    assert counted_solution == solution
+    assert counted_nodes == nodes
+    assert stats.nodes >= sum(nodes.values())
+
+
+@pytest.mark.parametrize("seed", range(N_CUBES))
+@pytest.mark.parametrize("use_transposition_table", [False, True])
+def test_step1(seed, use_transposition_table):
+    assert_same_search(step1, v6.random_state(random.Random(seed)), use_transposition_table)
+
+
+@pytest.mark.parametrize("seed", range(N_CUBES))
+@pytest.mark.parametrize("use_transposition_table", [False, True])
+def test_step2(seed, use_transposition_table):
+    assert_same_search(step2, scrambled_state(random.Random(seed), STEP2_MOVES, 18), use_transposition_table)
+
+
+@pytest.mark.parametrize("seed", range(N_CUBES))
+@pytest.mark.parametrize("use_transposition_table", [False, True])
+def test_optimal(seed, use_transposition_table):
+    assert_same_search(optimal.solve, scrambled_state(random.Random(seed), range(18), 8), use_transposition_table)
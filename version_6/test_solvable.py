@@ -0,0 +1,111 @@
+"""Tests of the solvability checks
+
+coordinates.is_solvable(), CubeStep2.check_solvable() and
+batch_moves.are_solvable() must agree with the rule check_solvable() used
+before: the rotations of the edges add up to an even number, those of the
+corners to a multiple of 3, and the swaps needed to sort the edges and the
+corners add up to an even number.
+"""
+
+
+
+import random
+
+import pytest
+
+import v6
+import coordinates
+
+N_CUBES = 300
+
+
+def n_of_swaps(arr):
+    """Returns the minimum number of swaps required to sort the list (the n_of_swaps() check_solvable() used before)."""
+    arrpos = sorted(enumerate(arr), key=lambda it: it[1])
+    vis = [False]*len(arr)
+    ans = 0
+    for i in range(len(arr)):
+        if vis[i] or arrpos[i][0] == i:
+            continue
+        j = i
+        while not vis[j]:
+            vis[j] = True
+            j = arrpos[j][0]
+            ans += 1
+        ans -= 1
+    return ans
+
+
+def old_rule(state):
+    """Checks a cube with valid cubies and rotations like check_solvable() did before."""
+    if sum(state[17::2]) % 2 or sum(state[1:16:2]) % 3:
+        return False
+    return (n_of_swaps(state[16::2]) + n_of_swaps(state[0:16:2])) % 2 == 0
+
+
+def random_cubies(rng):
+    """Returns a cube with every cubie once and random rotations, solvable or not."""
+    corners, edges = rng.sample(range(8), 8), rng.sample(range(12), 12)
+    state = []
+    for corner in corners:
+        state += [corner, rng.randrange(3)]
+    for edge in edges:
+        state += [edge, rng.randrange(2)]
+    return state
+
+
+def corrupted(rng, state):
+    """Returns a cube with a single change that makes a solvable cube unsolvable: two swapped cubies, a twisted corner or a flipped edge."""
+    state = state.copy()
+    change = rng.randrange(3)
+    if change == 0:
+        i, j = rng.sample(range(8), 2) if rng.randrange(2) else [8 + k for k in rng.sample(range(12), 2)]
+        state[2*i], state[2*j] = state[2*j], state[2*i]
+    elif change == 1:
+        i = rng.randrange(8)
+        state[2*i+1] = (state[2*i+1] + rng.randrange(1, 3)) % 3
+    else:
+        i = rng.randrange(12)
+        state[17+2*i] ^= 1
+    return state
+
+
+def random_states():
+    rng = random.Random(0)
+    states = []
+    for i in range(N_CUBES):
+        state = v6.random_state(rng)
+        states += [state, corrupted(rng, state), random_cubies(rng)]
+    return states
+
+
+STATES = random_states()
+
+
+def test_is_solvable():
+    for state in STATES:
+        assert coordinates.is_solvable(state) == old_rule(state)
+    assert all(coordinates.is_solvable(v6.random_state(random.Random(seed))) for seed in range(N_CUBES))
+    assert not any(coordinates.is_solvable(corrupted(random.Random(seed), v6.random_state(random.Random(seed)))) for seed in range(N_CUBES))
+
+
+def test_check_solvable():
+    for state in STATES:
+        assert v6.CubeStep2(solved=False, scramble=state).check_solvable() == old_rule(state)
+
+
+@pytest.mark.parametrize("index, value", [(0, 1), (0, 8), (16, 12), (16, -1), (1, 3), (1, -1), (17, 2), (17, -1)])
+def test_invalid_cubies(index, value):
+    # a duplicate or unknown cubie or rotation is never solvable
+    state = v6.SOLVED_STATE_CUBIE_LINEAR.copy()
+    state[index] = value
+    assert not coordinates.is_solvable(state)
+    assert not v6.CubeStep2(solved=False, scramble=state).check_solvable()
+
+
+def test_are_solvable():
+    np = pytest.importorskip("numpy")
+    import batch_moves
+
+    states = STATES + [[value if i != index else -1 for i, value in enumerate(v6.SOLVED_STATE_CUBIE_LINEAR)] for index in (0, 1, 16, 17)]
+    assert batch_moves.are_solvable(np.array(states)).tolist() == [coordinates.is_solvable(state) for state in states]
@@ -0,0 +1,51 @@
+"""Tests of the conversion between stickers and cubies
+
+A cube must convert to stickers and back unchanged, and stickers that are no
+cube (including colors out of range) must raise an InvalidCubeError.
+"""
+
+
+
+import random
+
+import pytest
+
+import v6
+
+N_CUBES = 100
+
+
+def test_round_trip():
+    rng = random.Random(0)
+    for i in range(N_CUBES):
+        state = v6.random_state(rng)
+        assert v6.stickers_to_cubies(v6.cubies_to_stickers(state)) == state
+        step1_state = v6.random_step1_state(rng)
+        assert v6.step1_stickers_to_cubies(v6.step1_cubies_to_stickers(step1_state)) == step1_state
+
+
+STEP1_STATE = v6.random_step1_state(random.Random(0))
+# (face, row, column) of the marked sticker of the first corner and of the first edge
+CORNER_STICKER = v6.CUBIE_FACELETS[0][0][STEP1_STATE[0]]
+EDGE_STICKER = v6.CUBIE_FACELETS[1][0][STEP1_STATE[8] % 2]
+
+
+@pytest.mark.parametrize("sticker, color", [(CORNER_STICKER, 2), (CORNER_STICKER, -1), (EDGE_STICKER, 3), (EDGE_STICKER, -1), (EDGE_STICKER, -2)])
+def test_step1_colors_out_of_range(sticker, color):
+    stickers = v6.step1_cubies_to_stickers(STEP1_STATE)
+    face, row, column = sticker
+    stickers[face][row][column] = color
+    with pytest.raises(v6.InvalidCubeError) as error:
+        v6.step1_stickers_to_cubies(stickers)
+    assert len(error.value.pieces) == 1
+
+
+def test_step1_colors_out_of_range_in_batch():
+    np = pytest.importorskip("numpy")
+    import facelets
+
+    stickers = v6.step1_cubies_to_stickers(STEP1_STATE)
+    face, row, column = CORNER_STICKER
+    stickers[face][row][column] = -1
+    assert not facelets.step1_stickers_to_cubies(np.array([stickers]))[1][0]
+    assert facelets.invalid_pieces(stickers, step1=True)
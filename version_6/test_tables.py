@@ -0,0 +1,34 @@
+"""Tests of saving and loading the tables
+
+A saved table must load again (read or memory-mapped) without leaving
+temporary files, and a table that does not match its checksum must not load.
+"""
+
+
+
+from array import array
+
+import pytest
+
+import tables
+
+
+def test_save_and_load(tmp_path):
+    table = array("H", range(1000))
+    tables.save_table("test", table, tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["test.bin", "test.sha256", "test.stamp"]
+    assert tables.read_table("test", "H", len(table), tmp_path) == table
+    assert tables.read_table("test", "H", len(table)+1, tmp_path) is None
+    assert list(tables.map_table("test", "H", len(table), tmp_path)) == list(table)
+
+
+def test_checksum_mismatch(tmp_path):
+    table = array("H", range(1000))
+    tables.save_table("test", table, tmp_path)
+    with open(tmp_path/"test.sha256", "w") as f:
+        f.write(tables.checksum(array("H", range(999))))
+    (tmp_path/"test.stamp").unlink()
+    assert tables.read_table("test", "H", len(table), tmp_path) is None
+    assert tables.map_table("test", "H", len(table), tmp_path) is None
+    with pytest.raises(tables.TableError):
+        tables.checked_table("test", tables.read_table("test", "H", len(table), tmp_path))
@@ -0,0 +1,112 @@
+"""Transposition table for the searches
+
+Different move sequences often lead to the same state (automaton.py only
+removes the short ones), and IDA* searches the whole subtree of such a state
+again every time it reaches it. A transposition table remembers for every state
+it has searched without success the largest number of moves it was searched
+with: if the search reaches the state again with at most as many moves left,
+the subtree can be skipped.
+
+The table is bounded by a memory cap. When it is full, an entry is removed
+either by "lru" (the entry used least recently) or by "depth" (the entry with
+the fewest moves left, as it saved the least work; a new entry with fewer moves
+left than all stored entries is not stored at all).
+
+A table can be reused for later searches of the same kind (e.g. step 2 of
+several cubes), but not for searches with other coordinates or moves.
+"""
+
+
+
+from collections import OrderedDict
+
+# approximate number of bytes a stored state needs in memory (key, value and the overhead of the dictionary)
+ENTRY_SIZE = 150
+# default memory cap of a table in bytes
+MAX_MEMORY = 64 * 2**20
+
+EVICTION_POLICIES = ["lru", "depth"]
+
+
+class TranspositionTable():
+    def __init__(self, max_memory=MAX_MEMORY, eviction="lru"):
+        """Creates an empty transposition table.
+
+        Args:
+            max_memory: An integer with the maximum number of bytes the stored states may use (approximately)
+            eviction: A string with the policy used when the table is full: "lru" or "depth" (see above)
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy {eviction!r}, expected one of {EVICTION_POLICIES}")
+        self.max_entries = max(1, max_memory // ENTRY_SIZE)
+        self.eviction = eviction
+        # key: largest number of moves left the state has been searched with without success
+        self.entries = OrderedDict()
+        # keys of the entries ordered by their number of moves left (only for "depth")
+        self.entries_by_depth = {}
+        self.lookups = 0
+        self.hits = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def probe(self, key, togo):
+        """Checks if a state has already been searched without success with at least "togo" moves left.
+
+        Args:
+            key: An integer describing the state (and the moves allowed next)
+            togo: An integer with the number of moves left
+
+        Returns:
+            A boolean indicating if the state can be skipped
+        """
+        self.lookups += 1
+        searched = self.entries.get(key)
+        if searched is None or searched < togo:
+            return False
+        self.hits += 1
+        if self.eviction == "lru":
+            self.entries.move_to_end(key)
+        return True
+
+    def store(self, key, togo):
+        """Stores that a state has been searched without success with "togo" moves left."""
+        searched = self.entries.get(key)
+        if searched is not None:
+            if searched >= togo:
+                return
+            self.remove(key)
+        elif len(self.entries) >= self.max_entries:
+            if self.eviction == "depth" and togo < min(depth for depth, keys in self.entries_by_depth.items() if keys):
+                return
+            self.evict()
+        self.stores += 1
+        self.entries[key] = togo
+        if self.eviction == "depth":
+            self.entries_by_depth.setdefault(togo, {})[key] = None
+
+    def remove(self, key):
+        """Removes the entry of a state."""
+        togo = self.entries.pop(key)
+        if self.eviction == "depth":
+            del self.entries_by_depth[togo][key]
+
+    def evict(self):
+        """Removes one entry according to the eviction policy."""
+        self.evictions += 1
+        if self.eviction == "lru":
+            self.entries.popitem(last=False)
+        else:
+            keys = self.entries_by_depth[min(depth for depth, keys in self.entries_by_depth.items() if keys)]
+            self.remove(next(iter(keys)))
+
+    def clear(self):
+        """Removes all entries and resets the counters."""
+        self.__init__(self.max_entries*ENTRY_SIZE, self.eviction)
+
+    def hit_rate(self):
+        """Returns the share of lookups that allowed to skip a state (0 if there were no lookups)."""
+        return self.hits/self.lookups if self.lookups else 0
+
+    def statistics(self):
+        """Returns a dictionary with the counters of the table."""
+        return {"entries": len(self.entries), "lookups": self.lookups, "hits": self.hits, "hit_rate": self.hit_rate(), "stores": self.stores, "evictions": self.evictions}
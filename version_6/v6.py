@@ -2,6 +2,7 @@ import numpy as np
 import random
 import time
 import math
+import coordinates
 
 # This file does exactly the same as the file basic_functions.py, but stores the cube state in cubie method in a linear list instead of a nested one. This increases performance by ≈10%, but decreases readability
 
@@ -22,59 +23,279 @@ COLORS_LIST = list(COLORS)
 # list that stores the colors of all the differrent cubies (constant)
 CUBIE_LIST = [[[0, 5, 3], [0, 3, 4], [0, 4, 2], [0, 2, 5], [1, 3, 5], [1, 4, 3], [1, 2, 4], [1, 5, 2]],[[0, 3], [0, 4], [0, 2], [0, 5], [1, 3], [1, 4], [1, 2], [1, 5], [3, 5], [3, 4], [2, 4], [2, 5]]]
 
+
+def sticker_position(face, row, column):
+    """Returns the position (x, y, z) of the center of a sticker in the coordinates of the 3D viewers (U: y=-3, F: z=3, R: x=3)."""
+    a, b = 2*row-2, 2*column-2
+    return [(b, -3, a), (-b, 3, a), (b, a, 3), (-b, a, -3), (3, b, a), (-3, -b, a)][face]
+
+
+def generate_cubie_facelets(cubie_list=CUBIE_LIST):
+    """Derives the stickers of every corner and edge position from the colors of the cubies.
+
+    In a solved cube every cubie is in its own position with rotation 0 and its color i is on the face with this color (the color of the center of face k is k), so the position touches the faces of its colors.
+
+    Args:
+        cubie_list: The colors of every cubie (see CUBIE_LIST)
+
+    Returns:
+        A list containing for corners and edges a list with the stickers (face, row, column) of every position in the order of the colors in cubie_list
+    """
+    normals = [tuple(value//3 for value in sticker_position(face, 1, 1)) for face in range(6)]
+    # (center of the cubie, face): sticker
+    stickers = {}
+    for face in range(6):
+        for row in range(3):
+            for column in range(3):
+                point = sticker_position(face, row, column)
+                stickers[tuple(point[i]-normals[face][i] for i in range(3)), face] = (face, row, column)
+    facelets = []
+    for cubies in cubie_list:
+        facelets.append([])
+        for colors in cubies:
+            center = tuple(sum(2*normals[color][i] for color in colors) for i in range(3))
+            facelets[-1].append([stickers[center, color] for color in colors])
+    return facelets
+
+# list that stores the stickers (face, row, column) of every corner and edge position in the order of the colors in CUBIE_LIST (constant)
+# a cubie with rotation r in a position shows its color i on sticker (i+r)%3 (corners) or (i+r)%2 (edges) of the position
+CUBIE_FACELETS = generate_cubie_facelets()
+
 # list that stores the solved state in linear cubie method (constant)
 SOLVED_STATE_CUBIE_LINEAR = [0 for i in range(40)]
 SOLVED_STATE_CUBIE_LINEAR[:15:2] = [i for i in range(8)]
 SOLVED_STATE_CUBIE_LINEAR[16:39:2] = [i for i in range(12)]
 
-SOLVED_STEP1_CUBIE = [0 for i in range(20)]
+# list that stores a cube with the first step of the solving process completed in the notation of CubeStep1 (constant)
+SOLVED_STEP1_CUBIE = [0 for i in range(16)] + [2 for i in range(4)]
 
+# list of all the moves in the order used by the move engine (constant)
+MOVES = ["U_", "U'", "U2", "D_", "D'", "D2", "F_", "F'", "F2", "B_", "B'", "B2", "R_", "R'", "R2", "L_", "L'", "L2"]
+MOVE_INDEX = {move: i for i, move in enumerate(MOVES)}
+# names of the turn methods the move tables are derived from (same order as MOVES)
+MOVE_METHODS = ["turn_U", "turn_U_prime", "turn_U2", "turn_D", "turn_D_prime", "turn_D2", "turn_F", "turn_F_prime", "turn_F2", "turn_B", "turn_B_prime", "turn_B2", "turn_R", "turn_R_prime", "turn_R2", "turn_L", "turn_L_prime", "turn_L2"]
+OPPOSITE_FACE = {"U": "D", "D": "U", "F": "B", "B": "F", "R": "L", "L": "R"}
+
+# every cube can be brought to the end of step 1 with at most 12 moves and solved from there with at most 18 moves
+MAX_DEPTH_STEP1 = 12
+MAX_DEPTH_STEP2 = 18
+
+# the two-phase solver stops as soon as a solution has at most TARGET_LENGTH moves or after TIME_BUDGET seconds
+TARGET_LENGTH = 20
+TIME_BUDGET = 1.0
+
+# moves considered in the two steps of the solving process, grouped by face (face, indices in MOVES)
+STEP1_SOLVING_MOVES = [(face, [MOVE_INDEX[face+"_"], MOVE_INDEX[face+"'"], MOVE_INDEX[face+"2"]]) for face in "UDFBRL"]
+STEP2_SOLVING_MOVES = [(face, [MOVE_INDEX[face+"_"], MOVE_INDEX[face+"'"], MOVE_INDEX[face+"2"]] if face in "UD" else [MOVE_INDEX[face+"2"]]) for face in "UDFBRL"]
+
+
+def random_permutation(n, rng=random):
+    """Shuffles the numbers 0 to n-1 (Fisher-Yates) and counts the swaps done.
 
-def n_of_swaps(arr): # this function is copied and slighlty modified from geeksforgeeks.org (https://www.geeksforgeeks.org/minimum-number-swaps-required-sort-array/)
-    """Returns the minimum number of swaps required to sort the list.
-    
     Args:
-        arr: list
-        
+        n: An integer with the number of elements
+        rng: A random.Random instance (or the module random)
+
     Returns:
-        An integer with the minimum number of swaps needed to sort the list "arr"
+        A tuple containing the list with the permutation and an integer with its parity (0 even, 1 odd)
     """
+    permutation = list(range(n))
+    parity = 0
+    for i in range(n-1, 0, -1):
+        j = rng.randint(0, i)
+        if j != i:
+            permutation[i], permutation[j] = permutation[j], permutation[i]
+            parity ^= 1
+    return permutation, parity
+
+
+def random_state(rng=random):
+    """Draws a random solvable cube state, every state with the same probability.
+
+    Instead of drawing any state and retrying until it is solvable, the invalid parts are fixed directly: the rotation of the last corner and the last edge is chosen so that the rotations add up to a multiple of 3 and 2, and if the corners and the edges have permutations of different parity the last two edges are swapped. All three choices keep the distribution uniform.
+
+    Args:
+        rng: A random.Random instance (or the module random)
+
+    Returns:
+        A list containing the cube in the linear cubie method
+    """
+    corners, corner_parity = random_permutation(8, rng)
+    edges, edge_parity = random_permutation(12, rng)
+    if corner_parity != edge_parity:
+        edges[10], edges[11] = edges[11], edges[10]
+    corner_rotations = [rng.randint(0, 2) for i in range(7)]
+    corner_rotations.append(-sum(corner_rotations) % 3)
+    edge_rotations = [rng.randint(0, 1) for i in range(11)]
+    edge_rotations.append(sum(edge_rotations) % 2)
+
+    state = [0 for i in range(40)]
+    state[0:16:2], state[1:16:2] = corners, corner_rotations
+    state[16::2], state[17::2] = edges, edge_rotations
+    return state
+
+
+def random_step1_state(rng=random):
+    """Draws a random state in the notation of CubeStep1, every state with the same probability (see random_state()).
+
+    Args:
+        rng: A random.Random instance (or the module random)
+
+    Returns:
+        A list containing the rotation of every cubie (+2 for the edges of the middle layer)
+    """
+    state = [rng.randint(0, 2) for i in range(7)]
+    state.append(-sum(state) % 3)
+    edges = [rng.randint(0, 1) for i in range(11)]
+    edges.append(sum(edges) % 2)
+    for position in rng.sample(range(12), 4):
+        edges[position] += 2
+    return state + edges
+
+def generate_facelet_maps(cubie_list=CUBIE_LIST):
+    """Builds the lookup data for converting between the cubie and the sticker method.
+
+    A cubie with rotation r in a position shows its color i on sticker (i+r)%3 (corners) or (i+r)%2 (edges) of the position (see CUBIE_FACELETS).
+
+    Args:
+        cubie_list: The colors of every cubie (see CUBIE_LIST)
+
+    Returns:
+        A tuple containing two lists:
+            A list containing for every position (corners 0-7, edges 8-19), cubie and rotation a list of tuples ((face, row, column), color) with the stickers showing the cubie
+            A list containing for corners and edges a dictionary mapping the colors of the stickers of a position (in the order of CUBIE_FACELETS) to a tuple (cubie, rotation)
+    """
+    facelet_colors = []
+    for facelets in CUBIE_FACELETS[0] + CUBIE_FACELETS[1]:
+        cubies = cubie_list[len(facelets) == 2]
+        facelet_colors.append([[[(facelets[(i+rotation) % len(colors)], color) for i, color in enumerate(colors)] for rotation in range(len(colors))] for colors in cubies])
+    cubie_from_colors = []
+    for cubies in cubie_list:
+        cubie_from_colors.append({tuple(colors[(i-rotation) % len(colors)] for i in range(len(colors))): (cubie, rotation) for cubie, colors in enumerate(cubies) for rotation in range(len(colors))})
+    return facelet_colors, cubie_from_colors
+
+FACELET_COLORS, CUBIE_FROM_COLORS = generate_facelet_maps()
+
+
+def cubies_to_stickers(state, cubie_list=CUBIE_LIST):
+    """Converts a cube in the linear cubie method to the sticker method.
+
+    Args:
+        state: A list containing the cube in the linear cubie method
+        cubie_list: The colors of every cubie (see CUBIE_LIST)
+
+    Returns:
+        A list (6 x 3 x 3) containing the cube in the sticker method
+    """
+    facelet_colors = FACELET_COLORS if cubie_list is CUBIE_LIST else generate_facelet_maps(cubie_list)[0]
+    stickers = [[[face for column in range(3)] for row in range(3)] for face in range(6)]
+    for position in range(20):
+        for (face, row, column), color in facelet_colors[position][state[2*position]][state[2*position+1]]:
+            stickers[face][row][column] = color
+    return stickers
+
+
+class InvalidCubeError(Exception):
+    """Raised if the stickers of a cube cannot be decoded to cubies.
+
+    Attributes:
+        pieces: A list of strings describing every invalid piece
+    """
+
+    def __init__(self, pieces):
+        self.pieces = pieces
+        super().__init__("Invalid pieces: " + "; ".join(pieces))
+
+
+def piece_name(kind, position):
+    """Returns the name of a corner (kind 0) or edge (kind 1) position with its stickers, e.g. "corner 0 (stickers (0, 0, 0), (5, 0, 2), (3, 0, 2))"."""
+    return f"{['corner', 'edge'][kind]} {position} (stickers {', '.join(str(facelet) for facelet in CUBIE_FACELETS[kind][position])})"
+
+
+def stickers_to_cubies(stickers, cubie_list=CUBIE_LIST):
+    """Converts a cube in the sticker method to the linear cubie method.
+
+    Args:
+        stickers: A list (6 x 3 x 3) containing the cube in the sticker method
+        cubie_list: The colors of every cubie (see CUBIE_LIST)
+
+    Returns:
+        A list containing the cube in the linear cubie method
+
+    Raises:
+        InvalidCubeError: a center has the wrong color, the colors of a position are no available cubie or a cubie is in more than one position (the exception lists all of them)
+    """
+    cubie_from_colors = CUBIE_FROM_COLORS if cubie_list is CUBIE_LIST else generate_facelet_maps(cubie_list)[1]
+    invalid = [f"center of face {face} has color {stickers[face][1][1]}" for face in range(6) if stickers[face][1][1] != face]
+    state = []
+    for kind in range(2):
+        positions = {}
+        for position, facelets in enumerate(CUBIE_FACELETS[kind]):
+            colors = tuple(stickers[face][row][column] for face, row, column in facelets)
+            if colors not in cubie_from_colors[kind]:
+                invalid.append(f"{piece_name(kind, position)}: the colors {colors} are not an available cubie")
+                state += [0, 0]
+                continue
+            cubie, rotation = cubie_from_colors[kind][colors]
+            positions.setdefault(cubie, []).append(position)
+            state += [cubie, rotation]
+        for cubie, cubie_positions in positions.items():
+            if len(cubie_positions) > 1:
+                invalid.append(f"{['corner', 'edge'][kind]} cubie {cubie} {tuple(cubie_list[kind][cubie])} is in the positions {', '.join(str(position) for position in cubie_positions)}")
+    if invalid:
+        raise InvalidCubeError(invalid)
+    return state
+
+
+def step1_cubies_to_stickers(step1_state):
+    """Converts a cube in the notation of CubeStep1 to its sticker method (1 for the stickers of the top and bottom color, 2 for the front and back color of the edges of the middle layer, 0 for all other stickers).
+
+    Args:
+        step1_state: A list with the rotation of every cubie (+2 for the edges of the middle layer)
+
+    Returns:
+        A list (6 x 3 x 3) containing the cube in the sticker method of CubeStep1
+    """
+    stickers = [[[0 for column in range(3)] for row in range(3)] for face in range(6)]
+    for position, value in enumerate(step1_state):
+        if position < 8:
+            face, row, column = CUBIE_FACELETS[0][position][value]
+            stickers[face][row][column] = 1
+        else:
+            face, row, column = CUBIE_FACELETS[1][position-8][value % 2]
+            stickers[face][row][column] = 1 + value//2
+    return stickers
+
+
+def step1_stickers_to_cubies(stickers):
+    """Converts a cube in the sticker method of CubeStep1 (see step1_cubies_to_stickers()) to the notation of CubeStep1.
+
+    Raises:
+        InvalidCubeError: a sticker of a corner has another color than 0 or 1, a sticker of an edge another color than 0 to 2, a corner has not exactly one sticker with 1, an edge has not exactly one sticker with 1 or 2, or the number of edges with 2 is not 4 (the exception lists all of them)
+    """
+    invalid = []
+    step1_state = []
+    slice_edges = 0
+    for kind in range(2):
+        for position, facelets in enumerate(CUBIE_FACELETS[kind]):
+            colors = [stickers[face][row][column] for face, row, column in facelets]
+            marked = [index for index, color in enumerate(colors) if color]
+            # corners only have the colors 0 and 1, edges 0 to 2
+            if len(marked) != 1 or not all(color in range(3 - (kind == 0)) for color in colors):
+                invalid.append(f"{piece_name(kind, position)}: the colors {tuple(colors)} are not an available cubie")
+                step1_state.append(0)
+                continue
+            if colors[marked[0]] == 2:
+                slice_edges += 1
+                step1_state.append(2 + marked[0])
+            else:
+                step1_state.append(marked[0])
+    if slice_edges != 4 and not invalid:
+        invalid.append(f"{slice_edges} edges of the middle layer instead of 4")
+    if invalid:
+        raise InvalidCubeError(invalid)
+    return step1_state
 
-    n = len(arr)
-
-    # Create nested array with pairs where the first item per pair is the index and the second item the value
-    arrpos = [*enumerate(arr)]
-
-    # Sort the array by array element values to get right position of every element as the elements of nested array
-    arrpos.sort(key = lambda it : it[1])
-
-    # To keep track of visited elements. Initialize all elements as not visited (False).
-    vis = {k : False for k in range(n)}
-
-    # Initialize result
-    ans = 0
-    for i in range(n):
-        # already swapped or already present at correct position
-        if vis[i] or arrpos[i][0] == i:
-            continue
-
-        # find number of nodes in this cycle and add it to ans
-        cycle_size = 0
-        j = i
-        while not vis[j]:
-            # mark node as visited
-            vis[j] = True
-             
-            # move to next node
-            j = arrpos[j][0]
-            cycle_size += 1
-        
-        # update answer by adding current cycle
-        if cycle_size > 0:
-            ans += (cycle_size - 1)
-    
-    # return answer
-    return ans
 
 class CubeStep1():
     """A cube that can be visualised, permutated and solved. Differs from Cube() in that only orientation of the cubies is recorded (for step 1 of the solving process)
@@ -82,9 +303,9 @@ class CubeStep1():
     Attributes:
         size: An integer with the number of pieces along one side of the cube, always 3 in this project
         colors: A list containing the 6 colors of the cube as strings
-        stickers_used: A boolean indicating if the "cube_stickers" or the "cube_cubies" attribute is used
-        cube_stickers: A list containing the state of the cube in the sticker method (explained in "notation & basic principles.txt")
-        cube_cubies: A list containing the state of the cube in the cubie method (explained in "notation & basic principles.txt")
+        stickers_used: A boolean indicating if only the "cube_stickers" attribute is set (the cube has not been converted to the cubie method yet)
+        cube_stickers: A list containing the state of the cube in the sticker method (explained in "notation & basic principles.txt"), kept as a cached view of "cube_cubies" until the next move (None if not converted yet)
+        cube_cubies: A list containing the state of the cube in the cubie method (explained in "notation & basic principles.txt"), only changed by the turn methods (which clear "cube_stickers")
     """
 
     def __init__(self, solved=True, scramble=None, size=3, colors=[COLORS_LIST[0],COLORS_LIST[2]]):
@@ -153,235 +374,33 @@ class CubeStep1():
             if scramble: # uses a scramble given
                 self.cube_stickers = None
                 self.cube_cubies = scramble
-            else: # scrambles randomly (although quite inefficiently, it needs an average of 12 tries to guess a valid cube state)
-                raise Exception("This doesn't work yet.")
+            else: # scrambles randomly (see random_step1_state())
+                self.cube_stickers = None
+                self.cube_cubies = random_step1_state()
 
 
     def get_cube_state(self, sticker_notation=False, cubie_list=CUBIE_LIST):
         """Gives the current cube state in the preferred notation method.
         
         Can also be used to convert between the two different notations representing the state of the cube.
+        Both notations are kept: the sticker notation is only converted again after a move (the turn methods clear it), so repeated reads cost nothing. The returned list is the kept notation itself and must not be changed (copy it first).
 
         Args:
             sticker_notation: A boolean indicating in which notation the representation should get returned
 
         Returns:
             A list containing the cube in the chosen representation
-        
+
         Raises:
-            Exception: no cubie with colors available (might occur when converting to cubie method if the cube is not solvable)
+            InvalidCubeError: the stickers cannot be decoded to cubies (see step1_stickers_to_cubies())
         """
-        if sticker_notation:
-            if not self.stickers_used:
-                # convert cubie notation to sticker notation
-
-                # solved cube in sticker notation
-                self.cube_stickers = [[[0 for i in range(self.size)] for j in range(self.size)] for k in range(6)]
-                
-                # corners
-                # 00
-                if self.cube_cubies[0] == 0: self.cube_stickers[0][0][0] = 1
-                elif self.cube_cubies[0] == 1: self.cube_stickers[5][0][2] = 1
-                elif self.cube_cubies[0] == 2: self.cube_stickers[3][0][2] = 1
-                # 01
-                if self.cube_cubies[1] == 0: self.cube_stickers[0][0][2] = 1
-                elif self.cube_cubies[1] == 1: self.cube_stickers[3][0][0] = 1
-                elif self.cube_cubies[1] == 2: self.cube_stickers[4][0][0] = 1
-                # 02
-                if self.cube_cubies[2] == 0: self.cube_stickers[0][2][2] = 1
-                elif self.cube_cubies[2] == 1: self.cube_stickers[4][2][0] = 1
-                elif self.cube_cubies[2] == 2: self.cube_stickers[2][0][2] = 1
-                # 03
-                if self.cube_cubies[3] == 0: self.cube_stickers[0][2][0] = 1
-                elif self.cube_cubies[3] == 1: self.cube_stickers[2][0][0] = 1
-                elif self.cube_cubies[3] == 2: self.cube_stickers[5][2][2] = 1
-                # 04
-                if self.cube_cubies[4] == 0: self.cube_stickers[1][0][2] = 1
-                elif self.cube_cubies[4] == 1: self.cube_stickers[3][2][2] = 1
-                elif self.cube_cubies[4] == 2: self.cube_stickers[5][0][0] = 1
-                # 05
-                if self.cube_cubies[5] == 0: self.cube_stickers[1][0][0] = 1
-                elif self.cube_cubies[5] == 1: self.cube_stickers[4][0][2] = 1
-                elif self.cube_cubies[5] == 2: self.cube_stickers[3][2][0] = 1
-                # 06
-                if self.cube_cubies[6] == 0: self.cube_stickers[1][2][0] = 1
-                elif self.cube_cubies[6] == 1: self.cube_stickers[2][2][2] = 1
-                elif self.cube_cubies[6] == 2: self.cube_stickers[4][2][2] = 1
-                # 07
-                if self.cube_cubies[7] == 0: self.cube_stickers[1][2][2] = 1
-                elif self.cube_cubies[7] == 1: self.cube_stickers[5][2][0] = 1
-                elif self.cube_cubies[7] == 2: self.cube_stickers[2][2][0] = 1
-
-                # edges
-                # 10
-                if self.cube_cubies[8] == 0: self.cube_stickers[0][0][1] = 1
-                elif self.cube_cubies[8] == 1: self.cube_stickers[3][0][1] = 1
-                elif self.cube_cubies[8] == 2: self.cube_stickers[0][0][1] = 2
-                elif self.cube_cubies[8] == 3: self.cube_stickers[3][0][1] = 2
-                # 11
-                if self.cube_cubies[9] == 0: self.cube_stickers[0][1][2] = 1
-                elif self.cube_cubies[9] == 1: self.cube_stickers[4][1][0] = 1
-                elif self.cube_cubies[9] == 2: self.cube_stickers[0][1][2] = 2
-                elif self.cube_cubies[9] == 3: self.cube_stickers[4][1][0] = 2
-                # 12
-                if self.cube_cubies[10] == 0: self.cube_stickers[0][2][1] = 1
-                elif self.cube_cubies[10] == 1: self.cube_stickers[2][0][1] = 1
-                elif self.cube_cubies[10] == 2: self.cube_stickers[0][2][1] = 2
-                elif self.cube_cubies[10] == 3: self.cube_stickers[2][0][1] = 2
-                # 13
-                if self.cube_cubies[11] == 0: self.cube_stickers[0][1][0] = 1
-                elif self.cube_cubies[11] == 1: self.cube_stickers[5][1][2] = 1
-                elif self.cube_cubies[11] == 2: self.cube_stickers[0][1][0] = 2
-                elif self.cube_cubies[11] == 3: self.cube_stickers[5][1][2] = 2
-                # 14
-                if self.cube_cubies[12] == 0: self.cube_stickers[1][0][1] = 1
-                elif self.cube_cubies[12] == 1: self.cube_stickers[3][2][1] = 1
-                elif self.cube_cubies[12] == 2: self.cube_stickers[1][0][1] = 2
-                elif self.cube_cubies[12] == 3: self.cube_stickers[3][2][1] = 2
-                # 15
-                if self.cube_cubies[13] == 0: self.cube_stickers[1][1][0] = 1
-                elif self.cube_cubies[13] == 1: self.cube_stickers[4][1][2] = 1
-                elif self.cube_cubies[13] == 2: self.cube_stickers[1][1][0] = 2
-                elif self.cube_cubies[13] == 3: self.cube_stickers[4][1][2] = 2
-                # 16
-                if self.cube_cubies[14] == 0: self.cube_stickers[1][2][1] = 1
-                elif self.cube_cubies[14] == 1: self.cube_stickers[2][2][1] = 1
-                elif self.cube_cubies[14] == 2: self.cube_stickers[1][2][1] = 2
-                elif self.cube_cubies[14] == 3: self.cube_stickers[2][2][1] = 2
-                # 17
-                if self.cube_cubies[15] == 0: self.cube_stickers[1][1][2] = 1
-                elif self.cube_cubies[15] == 1: self.cube_stickers[5][1][0] = 1
-                elif self.cube_cubies[15] == 2: self.cube_stickers[1][1][2] = 2
-                elif self.cube_cubies[15] == 3: self.cube_stickers[5][1][0] = 2
-                # 18
-                if self.cube_cubies[16] == 0: self.cube_stickers[3][1][2] = 1
-                elif self.cube_cubies[16] == 1: self.cube_stickers[5][0][1] = 1
-                elif self.cube_cubies[16] == 2: self.cube_stickers[3][1][2] = 2
-                elif self.cube_cubies[16] == 3: self.cube_stickers[5][0][1] = 2
-                # 19
-                if self.cube_cubies[17] == 0: self.cube_stickers[3][1][0] = 1
-                elif self.cube_cubies[17] == 1: self.cube_stickers[4][0][1] = 1
-                elif self.cube_cubies[17] == 2: self.cube_stickers[3][1][0] = 2
-                elif self.cube_cubies[17] == 3: self.cube_stickers[4][0][1] = 2
-                # 110
-                if self.cube_cubies[18] == 0: self.cube_stickers[2][1][2] = 1
-                elif self.cube_cubies[18] == 1: self.cube_stickers[4][2][1] = 1
-                elif self.cube_cubies[18] == 2: self.cube_stickers[2][1][2] = 2
-                elif self.cube_cubies[18] == 3: self.cube_stickers[4][2][1] = 2
-                # 111
-                if self.cube_cubies[19] == 0: self.cube_stickers[2][1][0] = 1
-                elif self.cube_cubies[19] == 1: self.cube_stickers[5][2][1] = 1
-                elif self.cube_cubies[19] == 2: self.cube_stickers[2][1][0] = 2
-                elif self.cube_cubies[19] == 3: self.cube_stickers[5][2][1] = 2
-
-                self.cube_cubies = None
-                self.stickers_used = True
-            return self.cube_stickers
         if self.stickers_used:
-            # convert sticker notation to cubie notation
-
-            # outline in cubie notation:
-            self.cube_cubies = [0 for i in range(20)]
-            
-            
-            # corners
-            # 00
-            if self.cube_stickers[0][0][0] == 1: self.cube_cubies[0] = 0
-            elif self.cube_stickers[5][0][2] == 1: self.cube_cubies[0] = 1
-            elif self.cube_stickers[3][0][2] == 1: self.cube_cubies[0] = 2
-            # 01
-            if self.cube_stickers[0][0][2] == 1: self.cube_cubies[1] = 0
-            elif self.cube_stickers[3][0][0] == 1: self.cube_cubies[1] = 1
-            elif self.cube_stickers[4][0][0] == 1: self.cube_cubies[1] = 2
-            # 02
-            if self.cube_stickers[0][2][2] == 1: self.cube_cubies[2] = 0
-            elif self.cube_stickers[4][2][0] == 1: self.cube_cubies[2] = 1
-            elif self.cube_stickers[2][0][2] == 1: self.cube_cubies[2] = 2
-            # 03
-            if self.cube_stickers[0][2][0] == 1: self.cube_cubies[3] = 0
-            elif self.cube_stickers[2][0][0] == 1: self.cube_cubies[3] = 1
-            elif self.cube_stickers[5][2][2] == 1: self.cube_cubies[3] = 2
-            # 04
-            if self.cube_stickers[1][0][2] == 1: self.cube_cubies[4] = 0
-            elif self.cube_stickers[3][2][2] == 1: self.cube_cubies[4] = 1
-            elif self.cube_stickers[5][0][0] == 1: self.cube_cubies[4] = 2
-            # 05
-            if self.cube_stickers[1][0][0] == 1: self.cube_cubies[5] = 0
-            elif self.cube_stickers[4][0][2] == 1: self.cube_cubies[5] = 1
-            elif self.cube_stickers[3][2][0] == 1: self.cube_cubies[5] = 2
-            # 06
-            if self.cube_stickers[1][2][0] == 1: self.cube_cubies[6] = 0
-            elif self.cube_stickers[2][2][2] == 1: self.cube_cubies[6] = 1
-            elif self.cube_stickers[4][2][2] == 1: self.cube_cubies[6] = 2
-            # 07
-            if self.cube_stickers[1][2][2] == 1: self.cube_cubies[7] = 0
-            elif self.cube_stickers[5][2][0] == 1: self.cube_cubies[7] = 1
-            elif self.cube_stickers[2][2][0] == 1: self.cube_cubies[7] = 2
-
-            # edges
-            # 10
-            if self.cube_stickers[0][0][1] == 1: self.cube_cubies[8] = 0
-            elif self.cube_stickers[3][0][1] == 1: self.cube_cubies[8] = 1
-            elif self.cube_stickers[0][0][1] == 2: self.cube_cubies[8] = 2
-            elif self.cube_stickers[3][0][1] == 2: self.cube_cubies[8] = 3
-            # 11
-            if self.cube_stickers[0][1][2] == 1: self.cube_cubies[9] = 0
-            elif self.cube_stickers[4][1][0] == 1: self.cube_cubies[9] = 1
-            elif self.cube_stickers[0][1][2] == 2: self.cube_cubies[9] = 2
-            elif self.cube_stickers[4][1][0] == 2: self.cube_cubies[9] = 3
-            # 12
-            if self.cube_stickers[0][2][1] == 1: self.cube_cubies[10] = 0
-            elif self.cube_stickers[2][0][1] == 1: self.cube_cubies[10] = 1
-            elif self.cube_stickers[0][2][1] == 2: self.cube_cubies[10] = 2
-            elif self.cube_stickers[2][0][1] == 2: self.cube_cubies[10] = 3
-            # 13
-            if self.cube_stickers[0][1][0] == 1: self.cube_cubies[11] = 0
-            elif self.cube_stickers[5][1][2] == 1: self.cube_cubies[11] = 1
-            elif self.cube_stickers[0][1][0] == 2: self.cube_cubies[11] = 2
-            elif self.cube_stickers[5][1][2] == 2: self.cube_cubies[11] = 3
-            # 14
-            if self.cube_stickers[1][0][1] == 1: self.cube_cubies[12] = 0
-            elif self.cube_stickers[3][2][1] == 1: self.cube_cubies[12] = 1
-            elif self.cube_stickers[1][0][1] == 2: self.cube_cubies[12] = 2
-            elif self.cube_stickers[3][2][1] == 2: self.cube_cubies[12] = 3
-            # 15
-            if self.cube_stickers[1][1][0] == 1: self.cube_cubies[13] = 0
-            elif self.cube_stickers[4][1][2] == 1: self.cube_cubies[13] = 1
-            elif self.cube_stickers[1][1][0] == 2: self.cube_cubies[13] = 2
-            elif self.cube_stickers[4][1][2] == 2: self.cube_cubies[13] = 3
-            # 16
-            if self.cube_stickers[1][2][1] == 1: self.cube_cubies[14] = 0
-            elif self.cube_stickers[2][2][1] == 1: self.cube_cubies[14] = 1
-            elif self.cube_stickers[1][2][1] == 2: self.cube_cubies[14] = 2
-            elif self.cube_stickers[2][2][1] == 2: self.cube_cubies[14] = 3
-            # 17
-            if self.cube_stickers[1][1][2] == 1: self.cube_cubies[15] = 0
-            elif self.cube_stickers[5][1][0] == 1: self.cube_cubies[15] = 1
-            elif self.cube_stickers[1][1][2] == 2: self.cube_cubies[15] = 2
-            elif self.cube_stickers[5][1][0] == 2: self.cube_cubies[15] = 3
-            # 18
-            if self.cube_stickers[3][1][2] == 1: self.cube_cubies[16] = 0
-            elif self.cube_stickers[5][0][1] == 1: self.cube_cubies[16] = 1
-            elif self.cube_stickers[3][1][2] == 2: self.cube_cubies[16] = 2
-            elif self.cube_stickers[5][0][1] == 2: self.cube_cubies[16] = 3
-            # 19
-            if self.cube_stickers[3][1][0] == 1: self.cube_cubies[17] = 0
-            elif self.cube_stickers[4][0][1] == 1: self.cube_cubies[17] = 1
-            elif self.cube_stickers[3][1][0] == 2: self.cube_cubies[17] = 2
-            elif self.cube_stickers[4][0][1] == 2: self.cube_cubies[17] = 3
-            # 110
-            if self.cube_stickers[2][1][2] == 1: self.cube_cubies[18] = 0
-            elif self.cube_stickers[4][2][1] == 1: self.cube_cubies[18] = 1
-            elif self.cube_stickers[2][1][2] == 2: self.cube_cubies[18] = 2
-            elif self.cube_stickers[4][2][1] == 2: self.cube_cubies[18] = 3
-            # 111
-            if self.cube_stickers[2][1][0] == 1: self.cube_cubies[19] = 0
-            elif self.cube_stickers[5][2][1] == 1: self.cube_cubies[19] = 1
-            elif self.cube_stickers[2][1][0] == 2: self.cube_cubies[19] = 2
-            elif self.cube_stickers[5][2][1] == 2: self.cube_cubies[19] = 3
-
-            self.cube_stickers = None
+            self.cube_cubies = step1_stickers_to_cubies(self.cube_stickers)
             self.stickers_used = False
+        if sticker_notation:
+            if self.cube_stickers is None:
+                self.cube_stickers = step1_cubies_to_stickers(self.cube_cubies)
+            return self.cube_stickers
         return self.cube_cubies
 
     def turn(self, turns):
@@ -396,43 +415,10 @@ class CubeStep1():
 
         turns_list = [turns[i:i+2] for i in range(0, len(turns), 2)] # list of blocks of 2 characters from the original string (seperates multiple moves)
         for turn in turns_list:
-            match turn:
-                case "U_":
-                    self.turn_U()
-                case "U'":
-                    self.turn_U_prime()
-                case "U2":
-                    self.turn_U2()
-                case "D_":
-                    self.turn_D()
-                case "D'":
-                    self.turn_D_prime()
-                case "D2":
-                    self.turn_D2()
-                case "F_":
-                    self.turn_F()
-                case "F'":
-                    self.turn_F_prime()
-                case "F2":
-                    self.turn_F2()
-                case "B_":
-                    self.turn_B()
-                case "B'":
-                    self.turn_B_prime()
-                case "B2":
-                    self.turn_B2()
-                case "R_":
-                    self.turn_R()
-                case "R'":
-                    self.turn_R_prime()
-                case "R2":
-                    self.turn_R2()
-                case "L_":
-                    self.turn_L()
-                case "L'":
-                    self.turn_L_prime()
-                case "L2":
-                    self.turn_L2()
+            if turn in MOVE_INDEX:
+                self.cube_cubies = apply_move(self.cube_cubies, MOVE_INDEX[turn], STEP1_MOVE_ENGINE)
+        # the sticker notation is converted again when it is read (see get_cube_state())
+        self.cube_stickers = None
 
     def turn_U(self):
         """Executes a U turn on the cube."""
@@ -461,6 +447,7 @@ class CubeStep1():
         # move saved to 11
         self.cube_cubies[9] = saved
         
+        self.cube_stickers = None
         return self
 
     def turn_U_prime(self):
@@ -490,6 +477,7 @@ class CubeStep1():
         # move saved to 13
         self.cube_cubies[11] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_U2(self):
@@ -525,6 +513,7 @@ class CubeStep1():
         # move saved to 13
         self.cube_cubies[11] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_D(self):
@@ -554,6 +543,7 @@ class CubeStep1():
         # move saved to 17
         self.cube_cubies[15] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_D_prime(self):
@@ -583,6 +573,7 @@ class CubeStep1():
         # move saved to 15
         self.cube_cubies[13] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_D2(self):
@@ -618,6 +609,7 @@ class CubeStep1():
         # move saved to 17
         self.cube_cubies[15] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_F(self):
@@ -679,6 +671,7 @@ class CubeStep1():
             case 3:
                 self.cube_cubies[18] = 2
 
+        self.cube_stickers = None
         return self
 
     def turn_F_prime(self):
@@ -740,6 +733,7 @@ class CubeStep1():
             case 3:
                 self.cube_cubies[19] = 2
 
+        self.cube_stickers = None
         return self
 
     def turn_F2(self):
@@ -775,6 +769,7 @@ class CubeStep1():
         # move saved to 111
         self.cube_cubies[19] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_B(self):
@@ -836,6 +831,7 @@ class CubeStep1():
             case 3:
                 self.cube_cubies[16] = 2
 
+        self.cube_stickers = None
         return self
 
     def turn_B_prime(self):
@@ -897,6 +893,7 @@ class CubeStep1():
             case 3:
                 self.cube_cubies[17] = 2
 
+        self.cube_stickers = None
         return self
 
     def turn_B2(self):
@@ -932,6 +929,7 @@ class CubeStep1():
         # move saved to 19
         self.cube_cubies[17] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_R(self):
@@ -961,6 +959,7 @@ class CubeStep1():
         # move saved to 19
         self.cube_cubies[17] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_R_prime(self):
@@ -990,6 +989,7 @@ class CubeStep1():
         # move saved to 110
         self.cube_cubies[18] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_R2(self):
@@ -1025,6 +1025,7 @@ class CubeStep1():
         # move saved to 110
         self.cube_cubies[18] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_L(self):
@@ -1054,6 +1055,7 @@ class CubeStep1():
         # move saved to 111
         self.cube_cubies[19] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_L_prime(self):
@@ -1083,6 +1085,7 @@ class CubeStep1():
         # move saved to 18
         self.cube_cubies[16] = saved
 
+        self.cube_stickers = None
         return self
 
     def turn_L2(self):
@@ -1118,8 +1121,18 @@ class CubeStep1():
         # move saved to 111
         self.cube_cubies[19] = saved
 
+        self.cube_stickers = None
         return self
 
+    def get_coordinates(self):
+        """Gives the current cube state as coordinates (explained in coordinates.py).
+
+        Returns:
+            A tuple (twist, flip, slice) of integers, which is (0, 0, 0) if the first step of the solving process is completed
+        """
+
+        return coordinates.encode_step1(self.get_cube_state())
+
     def check_step1(self, solved_step1=SOLVED_STEP1_CUBIE):
         """Checks if the first step of the solving process on the cube is completed.
 
@@ -1135,155 +1148,35 @@ class CubeStep1():
             return True
         return False
 
-    def recursive_solving(self, depth, prev_move="  "):
-        """Solves the cube recursively up to a certain depth.
-        
+    def recursive_solving(self, depth, prev_move="  ", nodes_per_depth=None, transposition_table=None, workers=None, split_depth=1, stats=None):
+        """Solves the first step of the solving process up to a certain depth.
+
+        The search runs on coordinates with IDA* (see search.py), searching every limit of moves only once and stopping at the first (shortest) solution: every branch that cannot complete the first step with the moves left according to the pruning tables is cut immediately. The tables are loaded (or generated) on the first call.
+
         Args:
             depth: An integer describing the number of moves in a row to consider
             prev_move: A string representing the family of the two previous moves (U, D, F, B, R, L) --> no two moves on the same layer in a row, no 3 moves on opposite layers in a row
-            
+            nodes_per_depth: A dictionary the number of nodes expanded with every limit of moves is stored in (optional)
+            transposition_table: A TranspositionTable (see transposition.py) remembering the states searched without success, only used for the first step (optional, not used by the parallel search)
+            workers: An integer with the number of processes searching the subtrees of the first moves in parallel (see parallel.py) / None for the serial search
+            split_depth: An integer with the number of first moves that make up a subtree of the parallel search
+            stats: A SearchStats object (see search_stats.py) counting the nodes, checks, moves and cuts of the search (optional, not used by the parallel search)
+
         Returns:
             A tuple containing two values:
-                A boolean indicating if this branch has found a solution
-                A string containing the moves used to get to the fastest solution / An empty string if there is no solution on this branch or if the cube is already solved"""
-        if self.check_step1():
-            #print("solved")
-            return True, ""
-        #print(f"not solved yet {prev_move}")
-        #print(self.cube_cubies)
-        if depth > 0:
-            depth -= 1
-            found = -1
-
-            if prev_move[0] != "U" and prev_move != "DU":
-                solved, string = self.turn_U().recursive_solving(depth, "U"+prev_move[0])
-                #print(f"{string} U accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "U_"+string
-                    #return True, "U_"+string
-                self.turn_U_prime()
-
-                solved, string = self.turn_U_prime().recursive_solving(depth, "U"+prev_move[0])
-                #print(f"{string} U' accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "U'"+string
-                self.turn_U()
-
-                solved, string = self.turn_U2().recursive_solving(depth, "U"+prev_move[0])
-                #print(f"{string} U2 accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "U2"+string
-                self.turn_U2()
-
-            if prev_move[0] != "D" and prev_move != "UD":
-                solved, string = self.turn_D().recursive_solving(depth, "D"+prev_move[0])
-                #print(f"{string} D accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "D_"+string
-                self.turn_D_prime()
-
-                solved, string = self.turn_D_prime().recursive_solving(depth, "D"+prev_move[0])
-                #print(f"{string} D' accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "D'"+string
-                self.turn_D()
-
-                solved, string = self.turn_D2().recursive_solving(depth, "D"+prev_move[0])
-                #print(f"{string} D2 accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "D2"+string
-                self.turn_D2()
-
-            if prev_move[0] != "F" and prev_move != "BF":
-                solved, string = self.turn_F().recursive_solving(depth, "F"+prev_move[0])
-                #print(f"{string} F accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "F_"+string
-                self.turn_F_prime()
-
-                solved, string = self.turn_F_prime().recursive_solving(depth, "F"+prev_move[0])
-                #print(f"{string} F' accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "F'"+string
-                self.turn_F()
-
-                solved, string = self.turn_F2().recursive_solving(depth, "F"+prev_move[0])
-                #print(f"{string} F2 accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "F2"+string
-                self.turn_F2()
-
-            if prev_move[0] != "B" and prev_move != "FB":
-                solved, string = self.turn_B().recursive_solving(depth, "B"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "B_"+string
-                self.turn_B_prime()
-
-                solved, string = self.turn_B_prime().recursive_solving(depth, "B"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "B'"+string
-                self.turn_B()
-
-                solved, string = self.turn_B2().recursive_solving(depth, "B"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "B2"+string
-                self.turn_B2()
-
-            if prev_move[0] != "R" and prev_move != "LR":
-                solved, string = self.turn_R().recursive_solving(depth, "R"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "R_"+string
-                self.turn_R_prime()
-
-                solved, string = self.turn_R_prime().recursive_solving(depth, "R"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "R'"+string
-                self.turn_R()
-
-                solved, string = self.turn_R2().recursive_solving(depth, "R"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "R2"+string
-                self.turn_R2()
-
-            if prev_move[0] != "L" and prev_move != "RL":
-                solved, string = self.turn_L().recursive_solving(depth, "L"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "L_"+string
-                self.turn_L_prime()
-
-                solved, string = self.turn_L_prime().recursive_solving(depth, "L"+prev_move[0])
-                #print(f"{string} L' accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "L'"+string
-                self.turn_L()
-
-                solved, string = self.turn_L2().recursive_solving(depth, "L"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "L2"+string
-                self.turn_L2()
-
-            if found != -1:
-                return True, foundstring
+                A boolean indicating if a solution has been found
+                A string containing the moves of the shortest solution / An empty string if there is no solution or if the first step is already completed"""
+        import search # imported here, as search.py imports this file
+
+        if workers is None:
+            solution = search.step1_search(*self.get_coordinates(), depth, prev_move, nodes_per_depth, transposition_table, stats)
+        else:
+            import parallel
+
+            solution = parallel.parallel_search("step1", self.get_coordinates(), depth, prev_move, nodes_per_depth, workers, split_depth)
+        if solution is None:
             return False, ""
-        return False, ""
+        return True, "".join(MOVES[move] for move in solution)
 
 
 class CubeStep2():
@@ -1292,9 +1185,9 @@ class CubeStep2():
     Attributes:
         size: An integer with the number of pieces along one side of the cube, always 3 in this project
         colors: A list containing the 6 colors of the cube as strings
-        stickers_used: A boolean indicating if the "cube_stickers" or the "cube_cubies" attribute is used
-        cube_stickers: A list containing the state of the cube in the sticker method (explained in "notation & basic principles.txt")
-        cube_cubies: A list containing the state of the cube in the cubie method (explained in "notation & basic principles.txt")
+        stickers_used: A boolean indicating if only the "cube_stickers" attribute is set (the cube has not been converted to the cubie method yet)
+        cube_stickers: A list containing the state of the cube in the sticker method (explained in "notation & basic principles.txt"), kept as a cached view of "cube_cubies" until the next move (None if not converted yet)
+        cube_cubies: A list containing the state of the cube in the cubie method (explained in "notation & basic principles.txt"), only changed by the turn methods (which clear "cube_stickers")
     """
 
     def __init__(self, solved=True, scramble=None, size=3, colors=COLORS_LIST[2:]):
@@ -1344,25 +1237,16 @@ class CubeStep2():
             if scramble: # uses a scramble given
                 self.cube_stickers = None
                 self.cube_cubies = scramble
-            else: # scrambles randomly (although quite inefficiently, it needs an average of 12 tries to guess a valid cube state)
+            else: # scrambles randomly (see random_state())
                 self.cube_stickers = None
-                tries = 1
-                corners = [[i, random.randint(0, 2)] for i in range(8)]
-                edges = [[i, random.randint(0, 1)] for i in range(12)]
-                random.shuffle(corners), random.shuffle(edges)
-                self.cube_cubies = [corners, edges]
-                while not self.check_solvable():
-                    tries += 1
-                    corners = [[i, random.randint(0, 2)] for i in range(8)]
-                    edges = [[i, random.randint(0, 1)] for i in range(12)]
-                    random.shuffle(corners), random.shuffle(edges)
-                    self.cube_cubies = [corners, edges]
+                self.cube_cubies = random_state()
 
 
     def get_cube_state(self, sticker_notation=False, cubie_list=CUBIE_LIST):
         """Gives the current cube state in the preferred notation method.
         
         Can also be used to convert between the two different notations representing the state of the cube.
+        Both notations are kept: the sticker notation is only converted again after a move (the turn methods clear it), so repeated reads cost nothing. The returned list is the kept notation itself and must not be changed (copy it first).
 
         Args:
             sticker_notation: A boolean indicating in which notation the representation should get returned
@@ -1371,304 +1255,20 @@ class CubeStep2():
             A list containing the cube in the chosen representation
         
         Raises:
-            Exception: no cubie with colors available (might occur when converting to cubie method if the cube is not solvable)
+            InvalidCubeError: the stickers cannot be decoded to cubies (see stickers_to_cubies())
         """
-        if sticker_notation:
-            if not self.stickers_used:
-                # convert cubie notation to sticker notation
-
-                # solved cube in sticker notation
-                self.cube_stickers = [[[k for i in range(self.size)] for j in range(self.size)] for k in range(len(self.colors))]
-                
-                # corners
-                # 00
-                self.cube_stickers[0][0][0] = cubie_list[0][self.cube_cubies[0]][-self.cube_cubies[1]%3]
-                self.cube_stickers[5][0][2] = cubie_list[0][self.cube_cubies[0]][1-self.cube_cubies[1]%3]
-                self.cube_stickers[3][0][2] = cubie_list[0][self.cube_cubies[0]][2-self.cube_cubies[1]%3]
-                # 01
-                self.cube_stickers[0][0][2] = cubie_list[0][self.cube_cubies[2]][-self.cube_cubies[3]%3]
-                self.cube_stickers[3][0][0] = cubie_list[0][self.cube_cubies[2]][1-self.cube_cubies[3]%3]
-                self.cube_stickers[4][0][0] = cubie_list[0][self.cube_cubies[2]][2-self.cube_cubies[3]%3]
-                # 02
-                self.cube_stickers[0][2][2] = cubie_list[0][self.cube_cubies[4]][-self.cube_cubies[5]%3]
-                self.cube_stickers[4][2][0] = cubie_list[0][self.cube_cubies[4]][1-self.cube_cubies[5]%3]
-                self.cube_stickers[2][0][2] = cubie_list[0][self.cube_cubies[4]][2-self.cube_cubies[5]%3]
-                # 03
-                self.cube_stickers[0][2][0] = cubie_list[0][self.cube_cubies[6]][-self.cube_cubies[7]%3]
-                self.cube_stickers[2][0][0] = cubie_list[0][self.cube_cubies[6]][1-self.cube_cubies[7]%3]
-                self.cube_stickers[5][2][2] = cubie_list[0][self.cube_cubies[6]][2-self.cube_cubies[7]%3]
-                # 04
-                self.cube_stickers[1][0][2] = cubie_list[0][self.cube_cubies[8]][-self.cube_cubies[9]%3]
-                self.cube_stickers[3][2][2] = cubie_list[0][self.cube_cubies[8]][1-self.cube_cubies[9]%3]
-                self.cube_stickers[5][0][0] = cubie_list[0][self.cube_cubies[8]][2-self.cube_cubies[9]%3]
-                # 05
-                self.cube_stickers[1][0][0] = cubie_list[0][self.cube_cubies[10]][-self.cube_cubies[11]%3]
-                self.cube_stickers[4][0][2] = cubie_list[0][self.cube_cubies[10]][1-self.cube_cubies[11]%3]
-                self.cube_stickers[3][2][0] = cubie_list[0][self.cube_cubies[10]][2-self.cube_cubies[11]%3]
-                # 06
-                self.cube_stickers[1][2][0] = cubie_list[0][self.cube_cubies[12]][-self.cube_cubies[13]%3]
-                self.cube_stickers[2][2][2] = cubie_list[0][self.cube_cubies[12]][1-self.cube_cubies[13]%3]
-                self.cube_stickers[4][2][2] = cubie_list[0][self.cube_cubies[12]][2-self.cube_cubies[13]%3]
-                # 07
-                self.cube_stickers[1][2][2] = cubie_list[0][self.cube_cubies[14]][-self.cube_cubies[15]%3]
-                self.cube_stickers[5][2][0] = cubie_list[0][self.cube_cubies[14]][1-self.cube_cubies[15]%3]
-                self.cube_stickers[2][2][0] = cubie_list[0][self.cube_cubies[14]][2-self.cube_cubies[15]%3]
-
-                # edges
-                # 10
-                self.cube_stickers[0][0][1] = cubie_list[1][self.cube_cubies[16]][-self.cube_cubies[17]%2]
-                self.cube_stickers[3][0][1] = cubie_list[1][self.cube_cubies[16]][1-self.cube_cubies[17]%2]
-                # 11
-                self.cube_stickers[0][1][2] = cubie_list[1][self.cube_cubies[18]][-self.cube_cubies[19]%2]
-                self.cube_stickers[4][1][0] = cubie_list[1][self.cube_cubies[18]][1-self.cube_cubies[19]%2]
-                # 12
-                self.cube_stickers[0][2][1] = cubie_list[1][self.cube_cubies[20]][-self.cube_cubies[21]%2]
-                self.cube_stickers[2][0][1] = cubie_list[1][self.cube_cubies[20]][1-self.cube_cubies[21]%2]
-                # 13
-                self.cube_stickers[0][1][0] = cubie_list[1][self.cube_cubies[22]][-self.cube_cubies[23]%2]
-                self.cube_stickers[5][1][2] = cubie_list[1][self.cube_cubies[22]][1-self.cube_cubies[23]%2]
-                # 14
-                self.cube_stickers[1][0][1] = cubie_list[1][self.cube_cubies[24]][-self.cube_cubies[25]%2]
-                self.cube_stickers[3][2][1] = cubie_list[1][self.cube_cubies[24]][1-self.cube_cubies[25]%2]
-                # 15
-                self.cube_stickers[1][1][0] = cubie_list[1][self.cube_cubies[26]][-self.cube_cubies[27]%2]
-                self.cube_stickers[4][1][2] = cubie_list[1][self.cube_cubies[26]][1-self.cube_cubies[27]%2]
-                # 16
-                self.cube_stickers[1][2][1] = cubie_list[1][self.cube_cubies[28]][-self.cube_cubies[29]%2]
-                self.cube_stickers[2][2][1] = cubie_list[1][self.cube_cubies[28]][1-self.cube_cubies[29]%2]
-                # 17
-                self.cube_stickers[1][1][2] = cubie_list[1][self.cube_cubies[30]][-self.cube_cubies[31]%2]
-                self.cube_stickers[5][1][0] = cubie_list[1][self.cube_cubies[30]][1-self.cube_cubies[31]%2]
-                # 18
-                self.cube_stickers[3][1][2] = cubie_list[1][self.cube_cubies[32]][-self.cube_cubies[33]%2]
-                self.cube_stickers[5][0][1] = cubie_list[1][self.cube_cubies[32]][1-self.cube_cubies[33]%2]
-                # 19
-                self.cube_stickers[3][1][0] = cubie_list[1][self.cube_cubies[34]][-self.cube_cubies[35]%2]
-                self.cube_stickers[4][0][1] = cubie_list[1][self.cube_cubies[34]][1-self.cube_cubies[35]%2]
-                # 110
-                self.cube_stickers[2][1][2] = cubie_list[1][self.cube_cubies[36]][-self.cube_cubies[37]%2]
-                self.cube_stickers[4][2][1] = cubie_list[1][self.cube_cubies[36]][1-self.cube_cubies[37]%2]
-                # 111
-                self.cube_stickers[2][1][0] = cubie_list[1][self.cube_cubies[38]][-self.cube_cubies[39]%2]
-                self.cube_stickers[5][2][1] = cubie_list[1][self.cube_cubies[38]][1-self.cube_cubies[39]%2]
-
-                self.cube_cubies = None
-                self.stickers_used = True
-            return self.cube_stickers
         if self.stickers_used:
-            # convert sticker notation to cubie notation
-
-            # outline in cubie notation:
-            self.cube_cubies = [0 for i in range(40)]
-            
-            # corners
-            # 00
-            l = [self.cube_stickers[0][0][0], self.cube_stickers[5][0][2], self.cube_stickers[3][0][2]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[0][0][0]}, {self.cube_stickers[5][0][2]}, {self.cube_stickers[3][0][2]}) are not an available cubie.")
-            self.cube_cubies[0] = cubie_list[0].index(l)
-            self.cube_cubies[1] = rot
-            # self.cube_cubies[0][0] = [cubie_list[0].index(l), rot]
-            # 01
-            l = [self.cube_stickers[0][0][2], self.cube_stickers[3][0][0], self.cube_stickers[4][0][0]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[0][0][2]}, {self.cube_stickers[3][0][0]}, {self.cube_stickers[4][0][0]}) are not an available cubie.")
-            self.cube_cubies[2] = cubie_list[0].index(l)
-            self.cube_cubies[3] = rot
-            # 02
-            l = [self.cube_stickers[0][2][2], self.cube_stickers[4][2][0], self.cube_stickers[2][0][2]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[0][2][2]}, {self.cube_stickers[4][2][0]}, {self.cube_stickers[2][0][2]}) are not an available cubie.")
-            self.cube_cubies[4] = cubie_list[0].index(l)
-            self.cube_cubies[5] = rot
-            # 03
-            l = [self.cube_stickers[0][2][0], self.cube_stickers[2][0][0], self.cube_stickers[5][2][2]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[0][2][0]}, {self.cube_stickers[2][0][0]}, {self.cube_stickers[5][2][2]}) are not an available cubie.")
-            self.cube_cubies[6] = cubie_list[0].index(l)
-            self.cube_cubies[7] = rot
-            # 04
-            l = [self.cube_stickers[1][0][2], self.cube_stickers[3][2][2], self.cube_stickers[5][0][0]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[1][0][2]}, {self.cube_stickers[3][2][2]}, {self.cube_stickers[5][0][0]}) are not an available cubie.")
-            self.cube_cubies[8] = cubie_list[0].index(l)
-            self.cube_cubies[9] = rot
-            # 05
-            l = [self.cube_stickers[1][0][0], self.cube_stickers[4][0][2], self.cube_stickers[3][2][0]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[1][0][0]}, {self.cube_stickers[4][0][2]}, {self.cube_stickers[3][2][0]}) are not an available cubie.")
-            self.cube_cubies[10] = cubie_list[0].index(l)
-            self.cube_cubies[11] = rot
-            # 06
-            l = [self.cube_stickers[1][2][0], self.cube_stickers[2][2][2], self.cube_stickers[4][2][2]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[1][2][0]}, {self.cube_stickers[2][2][2]}, {self.cube_stickers[4][2][2]}) are not an available cubie.")
-            self.cube_cubies[12] = cubie_list[0].index(l)
-            self.cube_cubies[13] = rot
-            # 07
-            l = [self.cube_stickers[1][2][2], self.cube_stickers[5][2][0], self.cube_stickers[2][2][0]]
-            rot = 0 # rotation of the corner
-            while l not in cubie_list[0]:
-                l = list(np.roll(l, -1))
-                rot += 1
-                if rot >= 3:
-                    raise Exception(f"These three colors ({self.cube_stickers[1][2][2]}, {self.cube_stickers[5][2][0]}, {self.cube_stickers[2][2][0]}) are not an available cubie.")
-            self.cube_cubies[14] = cubie_list[0].index(l)
-            self.cube_cubies[15] = rot
-
-            # edges
-            # 10
-            l = [self.cube_stickers[0][0][1], self.cube_stickers[3][0][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[0][0][1]}, {self.cube_stickers[3][0][1]}) are not an available cubie.")
-            self.cube_cubies[16] = cubie_list[1].index(l)
-            self.cube_cubies[17] = flip
-            #self.cube_cubies[1][0] = [cubie_list[1].index(l), flip]
-            # 11
-            l = [self.cube_stickers[0][1][2], self.cube_stickers[4][1][0]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[0][1][2]}, {self.cube_stickers[4][1][0]}) are not an available cubie.")
-            self.cube_cubies[18] = cubie_list[1].index(l)
-            self.cube_cubies[19] = flip
-            # 12
-            l = [self.cube_stickers[0][2][1], self.cube_stickers[2][0][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[0][2][1]}, {self.cube_stickers[2][0][1]}) are not an available cubie.")
-            self.cube_cubies[20] = cubie_list[1].index(l)
-            self.cube_cubies[21] = flip
-            # 13
-            l = [self.cube_stickers[0][1][0], self.cube_stickers[5][1][2]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[0][1][0]}, {self.cube_stickers[5][1][2]}) are not an available cubie.")
-            self.cube_cubies[22] = cubie_list[1].index(l)
-            self.cube_cubies[23] = flip
-            # 14
-            l = [self.cube_stickers[1][0][1], self.cube_stickers[3][2][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[1][0][1]}, {self.cube_stickers[3][2][1]}) are not an available cubie.")
-            self.cube_cubies[24] = cubie_list[1].index(l)
-            self.cube_cubies[25] = flip
-            # 15
-            l = [self.cube_stickers[1][1][0], self.cube_stickers[4][1][2]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[1][1][0]}, {self.cube_stickers[4][1][2]}) are not an available cubie.")
-            self.cube_cubies[26] = cubie_list[1].index(l)
-            self.cube_cubies[27] = flip
-            # 16
-            l = [self.cube_stickers[1][2][1], self.cube_stickers[2][2][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[1][2][1]}, {self.cube_stickers[2][2][1]}) are not an available cubie.")
-            self.cube_cubies[28] = cubie_list[1].index(l)
-            self.cube_cubies[29] = flip
-            # 17
-            l = [self.cube_stickers[1][1][2], self.cube_stickers[5][1][0]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[1][1][2]}, {self.cube_stickers[5][1][0]}) are not an available cubie.")
-            self.cube_cubies[30] = cubie_list[1].index(l)
-            self.cube_cubies[31] = flip
-            # 18
-            l = [self.cube_stickers[3][1][2], self.cube_stickers[5][0][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[3][1][2]}, {self.cube_stickers[5][0][1]}) are not an available cubie.")
-            self.cube_cubies[32] = cubie_list[1].index(l)
-            self.cube_cubies[33] = flip
-            # 19
-            l = [self.cube_stickers[3][1][0], self.cube_stickers[4][0][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[3][1][0]}, {self.cube_stickers[4][0][1]}) are not an available cubie.")
-            self.cube_cubies[34] = cubie_list[1].index(l)
-            self.cube_cubies[35] = flip
-            # 110
-            l = [self.cube_stickers[2][1][2], self.cube_stickers[4][2][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[2][1][2]}, {self.cube_stickers[4][2][1]}) are not an available cubie.")
-            self.cube_cubies[36] = cubie_list[1].index(l)
-            self.cube_cubies[37] = flip
-            # 111
-            l = [self.cube_stickers[2][1][0], self.cube_stickers[5][2][1]]
-            flip = 0 # if the edge is flipped or not
-            while l not in cubie_list[1]:
-                l = list(np.roll(l, 1))
-                flip += 1
-                if flip >= 2:
-                    raise Exception(f"These two colors ({self.cube_stickers[2][1][0]}, {self.cube_stickers[5][2][1]}) are not an available cubie.")
-            self.cube_cubies[38] = cubie_list[1].index(l)
-            self.cube_cubies[39] = flip
-
-            self.cube_stickers = None
+            self.cube_cubies = stickers_to_cubies(self.cube_stickers, cubie_list)
             self.stickers_used = False
+            if cubie_list is not CUBIE_LIST:
+                self.cube_stickers = None
+        if sticker_notation:
+            # only the stickers of the standard cubie list are kept
+            if cubie_list is not CUBIE_LIST:
+                return cubies_to_stickers(self.cube_cubies, cubie_list)
+            if self.cube_stickers is None:
+                self.cube_stickers = cubies_to_stickers(self.cube_cubies, cubie_list)
+            return self.cube_stickers
         return self.cube_cubies
 
     def turn(self, turns):
@@ -1683,43 +1283,10 @@ class CubeStep2():
 
         turns_list = [turns[i:i+2] for i in range(0, len(turns), 2)] # list of blocks of 2 characters from the original string (seperates multiple moves)
         for turn in turns_list:
-            match turn:
-                case "U_":
-                    self.turn_U()
-                case "U'":
-                    self.turn_U_prime()
-                case "U2":
-                    self.turn_U2()
-                case "D_":
-                    self.turn_D()
-                case "D'":
-                    self.turn_D_prime()
-                case "D2":
-                    self.turn_D2()
-                case "F_":
-                    self.turn_F()
-                case "F'":
-                    self.turn_F_prime()
-                case "F2":
-                    self.turn_F2()
-                case "B_":
-                    self.turn_B()
-                case "B'":
-                    self.turn_B_prime()
-                case "B2":
-                    self.turn_B2()
-                case "R_":
-                    self.turn_R()
-                case "R'":
-                    self.turn_R_prime()
-                case "R2":
-                    self.turn_R2()
-                case "L_":
-                    self.turn_L()
-                case "L'":
-                    self.turn_L_prime()
-                case "L2":
-                    self.turn_L2()
+            if turn in MOVE_INDEX:
+                self.cube_cubies = apply_move(self.cube_cubies, MOVE_INDEX[turn], MOVE_ENGINE)
+        # the sticker notation is converted again when it is read (see get_cube_state())
+        self.cube_stickers = None
 
     def turn_U(self):
         """Executes a U turn on the cube."""
@@ -1748,6 +1315,7 @@ class CubeStep2():
         # move saved to 11
         self.cube_cubies[18:20] = saved[0:2]
         
+        self.cube_stickers = None
         return self
 
     def turn_U_prime(self):
@@ -1777,6 +1345,7 @@ class CubeStep2():
         # move saved to 13
         self.cube_cubies[22:24] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_U2(self):
@@ -1812,6 +1381,7 @@ class CubeStep2():
         # move saved to 13
         self.cube_cubies[22:24] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_D(self):
@@ -1841,6 +1411,7 @@ class CubeStep2():
         # move saved to 17
         self.cube_cubies[30:32] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_D_prime(self):
@@ -1870,6 +1441,7 @@ class CubeStep2():
         # move saved to 15
         self.cube_cubies[26:28] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_D2(self):
@@ -1905,6 +1477,7 @@ class CubeStep2():
         # move saved to 17
         self.cube_cubies[30:32] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_F(self):
@@ -1942,6 +1515,7 @@ class CubeStep2():
         self.cube_cubies[36] = saved[0]
         self.cube_cubies[37] = 1-saved[1]
 
+        self.cube_stickers = None
         return self
 
     def turn_F_prime(self):
@@ -1979,6 +1553,7 @@ class CubeStep2():
         self.cube_cubies[38] = saved[0]
         self.cube_cubies[39] = 1-saved[1]
 
+        self.cube_stickers = None
         return self
 
     def turn_F2(self):
@@ -2014,6 +1589,7 @@ class CubeStep2():
         # move saved to 111
         self.cube_cubies[38:40] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_B(self):
@@ -2051,6 +1627,7 @@ class CubeStep2():
         self.cube_cubies[32] = saved[0]
         self.cube_cubies[33] = 1-saved[1]
 
+        self.cube_stickers = None
         return self
 
     def turn_B_prime(self):
@@ -2088,6 +1665,7 @@ class CubeStep2():
         self.cube_cubies[34] = saved[0]
         self.cube_cubies[35] = 1-saved[1]
 
+        self.cube_stickers = None
         return self
 
     def turn_B2(self):
@@ -2123,6 +1701,7 @@ class CubeStep2():
         # move saved to 19
         self.cube_cubies[34:36] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_R(self):
@@ -2156,6 +1735,7 @@ class CubeStep2():
         # move saved to 19
         self.cube_cubies[34:36] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_R_prime(self):
@@ -2189,6 +1769,7 @@ class CubeStep2():
         # move saved to 110
         self.cube_cubies[36:38] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_R2(self):
@@ -2224,6 +1805,7 @@ class CubeStep2():
         # move saved to 110
         self.cube_cubies[36:38] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_L(self):
@@ -2257,6 +1839,7 @@ class CubeStep2():
         # move saved to 111
         self.cube_cubies[38:40] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_L_prime(self):
@@ -2290,6 +1873,7 @@ class CubeStep2():
         # move saved to 18
         self.cube_cubies[32:34] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def turn_L2(self):
@@ -2325,6 +1909,7 @@ class CubeStep2():
         # move saved to 111
         self.cube_cubies[38:40] = saved[0:2]
 
+        self.cube_stickers = None
         return self
 
     def check_solvable(self):
@@ -2339,26 +1924,19 @@ class CubeStep2():
         # make sure the cube notation is set to cubies
         try:
             self.get_cube_state()
-        except:
+        except InvalidCubeError:
             return False
 
-        # check for edge orientation (add up to even number)
-        edge_orientations = [self.cube_cubies[i] for i in range(17, 40, 2)]
-        if sum(edge_orientations)%2 != 0:
-            return False
-        
-        # check for corner orientation  (add up to number divisible by 3)
-        corner_orientations = [self.cube_cubies[i] for i in range(1, 16, 2)]
-        if sum(corner_orientations)%3 != 0:
-            return False
+        return coordinates.is_solvable(self.cube_cubies)
 
-        # check for position (even number of swaps across edges and corners together)
-        n = n_of_swaps([self.cube_cubies[i] for i in range(16, 39, 2)]) + n_of_swaps([self.cube_cubies[i] for i in range(0, 15, 2)])
-        if n%2 != 0:
-            return False
+    def get_coordinates(self):
+        """Gives the current cube state as coordinates (explained in coordinates.py).
 
-        # if nothing fails, the cube is solvable
-        return True
+        Returns:
+            A tuple (twist, flip, corner_permutation, edge_permutation) of integers, which is (0, 0, 0, 0) if the cube is solved
+        """
+
+        return coordinates.encode(self.get_cube_state())
 
     def check_solved(self, solved_state=SOLVED_STATE_CUBIE_LINEAR):
         """Checks if the cube is solved.
@@ -2371,104 +1949,57 @@ class CubeStep2():
             return True
         return False
 
-    def recursive_solving(self, depth, prev_move="  "):
-        """Solves the cube recursively up to a certain depth.
-        
+    def recursive_solving(self, depth, prev_move="  ", nodes_per_depth=None, transposition_table=None, workers=None, split_depth=1, stats=None):
+        """Solves the cube up to a certain depth using only the moves U, D, F2, B2, R2 and L2.
+
+        The search runs on coordinates with IDA* (see search.py), searching every limit of moves only once and stopping at the first (shortest) solution: every branch that cannot solve the cube with the moves left according to the pruning tables is cut immediately. The tables are loaded (or generated) on the first call.
+
         Args:
             depth: An integer describing the number of moves in a row to consider
             prev_move: A string representing the family of the two previous moves (U, D, F, B, R, L) --> no two moves on the same layer in a row, no 3 moves on opposite layers in a row
-            
+            nodes_per_depth: A dictionary the number of nodes expanded with every limit of moves is stored in (optional)
+            transposition_table: A TranspositionTable (see transposition.py) remembering the states searched without success, only used for the second step (optional, not used by the parallel search)
+            workers: An integer with the number of processes searching the subtrees of the first moves in parallel (see parallel.py) / None for the serial search
+            split_depth: An integer with the number of first moves that make up a subtree of the parallel search
+            stats: A SearchStats object (see search_stats.py) counting the nodes, checks, moves and cuts of the search (optional, not used by the parallel search)
+
         Returns:
             A tuple containing two values:
-                A boolean indicating if this branch has found a solution
-                A string containing the moves used to get to the fastest solution / An empty string if there is no solution on this branch or if the cube is already solved"""
-        if self.check_solved():
-            #print("solved")
-            return True, ""
-        #print(f"not solved yet {prev_move}")
-        #print(self.cube_cubies)
-        if depth > 0:
-            depth -= 1
-            found = -1
-
-            if prev_move[0] != "U" and prev_move != "DU":
-                solved, string = self.turn_U().recursive_solving(depth, "U"+prev_move[0])
-                #print(f"{string} U accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "U_"+string
-                    #return True, "U_"+string
-                self.turn_U_prime()
-
-                solved, string = self.turn_U_prime().recursive_solving(depth, "U"+prev_move[0])
-                #print(f"{string} U' accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "U'"+string
-                self.turn_U()
-
-                solved, string = self.turn_U2().recursive_solving(depth, "U"+prev_move[0])
-                #print(f"{string} U2 accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "U2"+string
-                self.turn_U2()
-
-            if prev_move[0] != "D" and prev_move != "UD":
-                solved, string = self.turn_D().recursive_solving(depth, "D"+prev_move[0])
-                #print(f"{string} D accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "D_"+string
-                self.turn_D_prime()
-
-                solved, string = self.turn_D_prime().recursive_solving(depth, "D"+prev_move[0])
-                #print(f"{string} D' accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "D'"+string
-                self.turn_D()
-
-                solved, string = self.turn_D2().recursive_solving(depth, "D"+prev_move[0])
-                #print(f"{string} D2 accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "D2"+string
-                self.turn_D2()
-
-            if prev_move[0] != "F" and prev_move != "BF":
-                solved, string = self.turn_F2().recursive_solving(depth, "F"+prev_move[0])
-                #print(f"{string} F2 accomplished (depth {depth}), Result: {solved}")
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "F2"+string
-                self.turn_F2()
-
-            if prev_move[0] != "B" and prev_move != "FB":
-                solved, string = self.turn_B2().recursive_solving(depth, "B"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "B2"+string
-                self.turn_B2()
-
-            if prev_move[0] != "R" and prev_move != "LR":
-                solved, string = self.turn_R2().recursive_solving(depth, "R"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "R2"+string
-                self.turn_R2()
-
-            if prev_move[0] != "L" and prev_move != "RL":
-                solved, string = self.turn_L2().recursive_solving(depth, "L"+prev_move[0])
-                if solved and (found == -1 or found > len(string)):
-                    found = len(string)
-                    foundstring = "L2"+string
-                self.turn_L2()
-
-            if found != -1:
-                return True, foundstring
+                A boolean indicating if a solution has been found
+                A string containing the moves of the shortest solution / An empty string if there is no solution (always the case if the first step is not completed) or if the cube is already solved"""
+        import search # imported here, as search.py imports this file
+
+        step2_coordinates = search.step2_coordinates(self.get_cube_state())
+        if step2_coordinates is None:
             return False, ""
-        return False, ""
+        if workers is None:
+            solution = search.step2_search(*step2_coordinates, depth, prev_move, nodes_per_depth, transposition_table, stats)
+        else:
+            import parallel
+
+            solution = parallel.parallel_search("step2", step2_coordinates, depth, prev_move, nodes_per_depth, workers, split_depth)
+        if solution is None:
+            return False, ""
+        return True, "".join(MOVES[move] for move in solution)
+
+    def solve(self, target_length=TARGET_LENGTH, time_budget=TIME_BUDGET, optimal=False, stats=None):
+        """Solves the whole cube with the two-phase algorithm (see solver.py).
+
+        Args:
+            target_length: An integer with the number of moves at which a solution is good enough to stop searching
+            time_budget: A float with the number of seconds after which the best solution found so far is returned
+            optimal: A boolean indicating if a shortest solution is searched with pattern databases instead (see optimal.py, ignores target_length and time_budget and can take very long)
+            stats: A SearchStats object (see search_stats.py) counting the nodes, checks, moves and cuts of the search (optional, only used by the optimal solver)
+
+        Returns:
+            A string containing the moves of the shortest solution found"""
+        if optimal:
+            import optimal as optimal_solver # imported here, as optimal.py imports this file
+
+            return "".join(MOVES[move] for move in optimal_solver.solve(self.get_cube_state(), stats=stats))
+        import solver # imported here, as solver.py imports this file
+
+        return "".join(MOVES[move] for move in solver.solve(self.get_cube_state(), target_length, time_budget))
 
     def step1_cube(self):
         self.get_cube_state()
@@ -2480,6 +2011,75 @@ class CubeStep2():
         return step1_cube
 
 
+def generate_move_tables():
+    """Derives the permutation and orientation tables of all 18 moves from the turn methods of CubeStep2.
+
+    Every turn method is executed once on a solved cube. As a solved cube has cubie i with rotation 0 in position i, the resulting state directly shows from which position every cubie came and by how much it was rotated.
+
+    Returns:
+        A tuple containing two lists with one entry per move (in the order of MOVES):
+            A list with the position (0-7 corners, 8-19 edges) every position receives its cubie from
+            A list with the rotation added to the cubie arriving in every position
+    """
+    permutations = []
+    orientations = []
+    for method in MOVE_METHODS:
+        cube = CubeStep2(solved=False, scramble=SOLVED_STATE_CUBIE_LINEAR.copy())
+        getattr(cube, method)()
+        permutations.append([cube.cube_cubies[2*i] for i in range(8)] + [cube.cube_cubies[2*i]+8 for i in range(8, 20)])
+        orientations.append(cube.cube_cubies[1::2])
+    return permutations, orientations
+
+MOVE_PERMUTATIONS, MOVE_ORIENTATIONS = generate_move_tables()
+
+
+def build_move_engine(step1=False):
+    """Builds the lookup data the generic move routine apply_move() needs.
+
+    Args:
+        step1: A boolean indicating if the engine is built for the 20 values of CubeStep1 (rotation of every cubie, +2 for the edges of the middle layer) or for the 40 values of the linear cubie method
+
+    Returns:
+        A list with one list per move (in the order of MOVES) containing a tuple (index, source index, rotation) for every value changed by the move, where "rotation" is a tuple with the new value for every old value
+    """
+    engine = []
+    for permutation, orientation in zip(MOVE_PERMUTATIONS, MOVE_ORIENTATIONS):
+        changes = []
+        for position in range(20):
+            if permutation[position] == position and not orientation[position]:
+                continue
+            if position < 8:
+                rotation = tuple((value+orientation[position])%3 for value in range(3))
+            else:
+                rotation = tuple(value^orientation[position] for value in range(4)) # flipping an edge keeps the +2 of CubeStep1
+            if step1:
+                changes.append((position, permutation[position], rotation))
+            else:
+                changes.append((2*position, 2*permutation[position], tuple(range(12))))
+                changes.append((2*position+1, 2*permutation[position]+1, rotation))
+        engine.append(changes)
+    return engine
+
+MOVE_ENGINE = build_move_engine()
+STEP1_MOVE_ENGINE = build_move_engine(step1=True)
+
+
+def apply_move(state, move, move_engine=MOVE_ENGINE):
+    """Executes a move on a cube state with one generic routine instead of the hand-written turn methods.
+
+    Args:
+        state: A list containing the cube in the linear cubie method (or the 20 values of CubeStep1)
+        move: An integer with the index of the move in MOVES
+        move_engine: The engine built by build_move_engine() matching the type of "state"
+
+    Returns:
+        A new list containing the state after the move (the list "state" is not changed)
+    """
+    new_state = state.copy()
+    for index, source, rotation in move_engine[move]:
+        new_state[index] = rotation[state[source]]
+    return new_state
+
 def generate_cube(solved=True, scramble=None):
     """Generates a new cube according to the parameters
 
@@ -2495,6 +2095,8 @@ def generate_cube(solved=True, scramble=None):
     return cube
 
 if __name__ == "__main__":
+    import transposition
+
     scramble = "R'U2F_D_L_U2R2"
 
     cube = generate_cube()
@@ -2503,28 +2105,27 @@ if __name__ == "__main__":
     cube_step1 = CubeStep1(solved=False,scramble=cube.step1_cube())
 
     step1_starttime = time.time()
-
-    depth = -1
-    step1_found = False
-    while not step1_found:
-        depth += 1
-        step1_found, solution_1 = cube_step1.recursive_solving(depth)
+    step1_nodes = {}
+    step1_found, solution_1 = cube_step1.recursive_solving(MAX_DEPTH_STEP1, nodes_per_depth=step1_nodes)
     step1_time = time.time() - step1_starttime
-    print(f"Solution of step 1 with depth {depth}: {solution_1} (Time used: {step1_time} seconds)")
+    print(f"Solution of step 1 with depth {len(solution_1)//2}: {solution_1} (Time used: {step1_time} seconds)")
+    print(f"Nodes expanded per depth: {step1_nodes}")
 
+    cube.turn(solution_1)
     step2_starttime = time.time()
-
-    depth = -1
-    step2_found = False
-    while not step2_found:
-        depth += 1
-        step2_found, solution_2 = cube.recursive_solving(depth)
+    step2_nodes = {}
+    step2_table = transposition.TranspositionTable()
+    step2_found, solution_2 = cube.recursive_solving(MAX_DEPTH_STEP2, nodes_per_depth=step2_nodes, transposition_table=step2_table)
     step2_time = time.time() - step2_starttime
-    print(f"Solution of step 2 with depth {depth}: {solution_2} (Time used: {step2_time} seconds)")
+    print(f"Solution of step 2 with depth {len(solution_2)//2}: {solution_2} (Time used: {step2_time} seconds)")
+    print(f"Nodes expanded per depth: {step2_nodes}")
+    print(f"Transposition table: {step2_table.statistics()}")
 
     total_time = time.time() - totalstarttime
     print(f"Total solution found: {solution_1+solution_2} (Time used: {total_time} seconds)")
 
-
-
-    
+    cube = generate_cube()
+    cube.turn(scramble)
+    starttime = time.time()
+    solution = cube.solve()
+    print(f"Two-phase solution with {len(solution)//2} moves: {solution} (Time used: {time.time()-starttime} seconds)")